@@ -1,42 +1,42 @@
-import json
-from groq import AsyncGroq
 import sys
 import os
+import logging
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.file_manager import FileManager
+from utils.file_manager import get_file_manager
+from utils.intents import has_closing_word, is_plain_closing
+from utils.prompt_builder import ChatPrompt, build_chat_prompt, attach_sections
+from utils.qna_index import get_index
+from utils.llm_gateway import LLMGateway
+from utils.metrics import AGENT_FALLBACKS, AGENT_LOCAL_REPLIES
+from utils.logging_setup import payload
 
-file_manager = FileManager(base_dir=os.getenv("DATA_PATH", "../../GENAR"))
+logger = logging.getLogger(__name__)
 
-async def ending_agent(client: AsyncGroq, conversation_history: str, user_message: str, candidate_id: str):
-    """
-    Post-Interview Q&A Agent
-    - candidate_id ile Q&A verisini kendi çeker
-    - Adayın sorularını yanıtlar
-    - Mülakat sonlandırma sinyali gönderir
-    """
-    
-    # Veriyi FileManager ile çek
+OPENING_MESSAGE = "Tebrikler, mülakatın temel aşamalarını tamamladınız! Şimdi pozisyon, şirket veya süreç hakkında sorularınız varsa yanıtlamaktan memnuniyet duyarım. Size nasıl yardımcı olabilirim?"
+CLOSING_MESSAGE = "Teşekkür ederim! Mülakat sürecimiz tamamlandı. Değerlendirme sonuçları en kısa sürede size iletilecektir. İyi günler! POST_INTERVIEW_COMPLETE"
+
+async def _load_qna_index(candidate_id: str):
+    """Adayın ilanının Q&A indeksini döndürür (ilan ya da Q&A bulunamazsa boş indeks)"""
+    job_id = None
     try:
-        job_id = '-'.join(candidate_id.split('-')[:2])
-        qna_data = file_manager.get_qna_data(job_id)
+        reader = get_file_manager().async_reader
+        job_id = await reader.resolve_candidate(candidate_id)
+        qna_data = await reader.get_qna_data(job_id) if job_id else None
         
         if not qna_data:
-            print(f"⚠️ Ending Agent: {job_id} için qna_data bulunamadı.")
+            logger.warning("⚠️ Ending Agent: %s için qna_data bulunamadı.", job_id or candidate_id)
             qna_data = {}
     except Exception as e:
-        print(f"❌ Ending Agent - Dosya Çekme Hatası: {e}")
+        logger.error("❌ Ending Agent - Dosya Çekme Hatası: %s", e)
         qna_data = {}
-    
-    # İlk açılış mesajı (user_message boşsa)
-    if not user_message:
-        return "Tebrikler, mülakatın temel aşamalarını tamamladınız! Şimdi pozisyon, şirket veya süreç hakkında sorularınız varsa yanıtlamaktan memnuniyet duyarım. Size nasıl yardımcı olabilirim?"
-    
-    prompt = f"""You are a Post-Interview Answering Agent — a professional HR representative who takes over after the main interview is completed. Your name is Alex.
+    return get_index(job_id, qna_data)
+
+ENDING_RULES = """You are a Post-Interview Answering Agent — a professional HR representative who takes over after the main interview is completed. Your name is Alex.
 
 Your tasks and flow:
 1.  *Initiation*: You have already initiated the conversation. Your task is to continue the Q&A.
-2.  *Answering Candidate Questions*: Check <Q&A.json> for the relevant answer. Reply *only* using the information inside <Q&A.json>. If the answer is not found, respond politely that you’ll forward their question to the HR team.
+2.  *Answering Candidate Questions*: Check <Q&A.json> (the entries most relevant to the question are attached to the candidate's latest message) for the relevant answer. Reply *only* using the information inside <Q&A.json>. If the answer is not found, respond politely that you’ll forward their question to the HR team.
     - Example if not found: "Bu çok iyi bir soru — İK ekibimizle paylaşacağım ve toplantı sonrası size cevap verilmesini sağlayacağım."
 3.  *Final Candidate Input*: After all their questions are answered (e.g., they say "hayır", "yok", "teşekkürler"), ask if they would like to add anything else.
     - Example: "Başka sorunuz yoksa, eklemek istediğiniz herhangi bir şey var mı?"
@@ -50,37 +50,112 @@ BEHAVIORAL RULES:
 
 CRITICAL CLOSING RULE:
 - If the candidate indicates they have no more questions AND nothing else to add, your final message MUST be EXACTLY: "Teşekkür ederim! Mülakat sürecimiz tamamlandı. Değerlendirme sonuçları en kısa sürede size iletilecektir. İyi günler! POST_INTERVIEW_COMPLETE"
-- **CRITICAL**: You MUST add "POST_INTERVIEW_COMPLETE" to your very last message to trigger the end of the entire process.
+- **CRITICAL**: You MUST add "POST_INTERVIEW_COMPLETE" to your very last message to trigger the end of the entire process."""
 
-Q&A VERİSİ:
-{json.dumps(qna_data, ensure_ascii=False, indent=2)}
-
-CONVERSATION HISTORY (only this Q&A part):
-{conversation_history}
+def _build_prompt(qna_entries: list, conversation_history: list, user_message: str) -> ChatPrompt:
+    """
+    Kurallar sabit system mesajında; geçmiş ayrı turlar olarak gider.
+    Sadece soruyla ilgili Q&A girdileri son aday mesajına eklenir, böylece prompt Q&A boyutuyla büyümez.
+    """
+    return build_chat_prompt(ENDING_RULES, [], conversation_history, attach_sections(user_message, [("Q&A.json", qna_entries)]))
 
-CANDIDATE'S LAST MESSAGE: "{user_message}"
+def _exact_answer(entry: dict) -> str:
+    return f"{entry['cevap']} Başka bir sorunuz var mı?"
 
-Now, respond in Turkish based on the rules and flow:"""
+async def ending_agent(llm: LLMGateway, conversation_history: list, user_message: str, candidate_id: str):
+    """
+    Post-Interview Q&A Agent
+    - candidate_id ile Q&A verisini kendi çeker
+    - Adayın sorularını yanıtlar
+    - Mülakat sonlandırma sinyali gönderir
+    """
+    
+    # Q&A indeksini FileManager verisiyle al
+    qna_index = await _load_qna_index(candidate_id)
+    
+    # İlk açılış mesajı (user_message boşsa)
+    if not user_message:
+        return OPENING_MESSAGE
+    
+    # Sadece kapanış ifadesi ("yok, teşekkürler") - LLM'e gerek yok
+    if is_plain_closing(user_message):
+        logger.debug("⚡ Ending Agent: Kapanış mesajı yerelde yanıtlandı")
+        AGENT_LOCAL_REPLIES.inc(agent="ending", kind="closing")
+        return CLOSING_MESSAGE
+    
+    # Q&A'daki bir soru aynen sorulduysa cevap doğrudan verilir
+    entry = qna_index.exact_match(user_message)
+    if entry:
+        logger.debug("⚡ Ending Agent: Q&A tam eşleşmesi yerelde yanıtlandı")
+        AGENT_LOCAL_REPLIES.inc(agent="ending", kind="qna_exact")
+        return _exact_answer(entry)
+    
+    qna_entries = qna_index.search(user_message)
+    logger.debug("🔎 Ending Agent: %d/%d Q&A girdisi gönderiliyor", len(qna_entries), len(qna_index))
+    prompt = _build_prompt(qna_entries, conversation_history, user_message)
+    logger.debug("📐 Ending Agent Prompt: %s", prompt.describe())
 
     try:
-        print(f"🟣 Ending Agent: API çağrısı yapılıyor...")
-        chat_completion = await client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            model="openai/gpt-oss-120b",
+        logger.debug("🟣 Ending Agent: API çağrısı yapılıyor...")
+        chat_completion = await llm.complete(
+            prompt.messages,
+            agent="ending",
             temperature=0.3,
             max_tokens=1024
         )
         
         response = chat_completion.choices[0].message.content
-        print(f"🟣 Ending Agent Raw Response: '{response}'")
+        logger.debug("🟣 Ending Agent Raw Response: '%s'", payload(response))
         
         # Eğer "yok", "hayır", "teşekkürler" gibi kapanış ifadeleri varsa zorla POST_INTERVIEW_COMPLETE ekle
-        closing_words = ["yok", "hayır", "teşekkürler", "tamamdır", "bitsin"]
-        if any(word in user_message.lower() for word in closing_words) and "POST_INTERVIEW_COMPLETE" not in response:
+        if has_closing_word(user_message) and "POST_INTERVIEW_COMPLETE" not in response:
             response += " POST_INTERVIEW_COMPLETE"
-            print("✅ Ending Agent: Zorla POST_INTERVIEW_COMPLETE eklendi")
+            logger.debug("✅ Ending Agent: Zorla POST_INTERVIEW_COMPLETE eklendi")
         
         return response
     except Exception as e:
-        print(f"❌ Ending Agent Error: {e}")
-        return f"Teşekkür ederim! Mülakat sürecimiz tamamlandı. Değerlendirme sonuçları en kısa sürede size iletilecektir. İyi günler! POST_INTERVIEW_COMPLETE"
\ No newline at end of file
+        logger.error("❌ Ending Agent Error: %s", e)
+        AGENT_FALLBACKS.inc(agent="ending", reason="error")
+        return CLOSING_MESSAGE
+
+async def ending_agent_stream(llm: LLMGateway, conversation_history: list, user_message: str, candidate_id: str):
+    """ending_agent'ın stream eden versiyonu - ham metin parçaları üretir"""
+    qna_index = await _load_qna_index(candidate_id)
+    
+    if not user_message:
+        yield OPENING_MESSAGE
+        return
+    
+    if is_plain_closing(user_message):
+        logger.debug("⚡ Ending Agent: Kapanış mesajı yerelde yanıtlandı")
+        AGENT_LOCAL_REPLIES.inc(agent="ending", kind="closing")
+        yield CLOSING_MESSAGE
+        return
+    
+    entry = qna_index.exact_match(user_message)
+    if entry:
+        logger.debug("⚡ Ending Agent: Q&A tam eşleşmesi yerelde yanıtlandı")
+        AGENT_LOCAL_REPLIES.inc(agent="ending", kind="qna_exact")
+        yield _exact_answer(entry)
+        return
+    
+    qna_entries = qna_index.search(user_message)
+    logger.debug("🔎 Ending Agent: %d/%d Q&A girdisi gönderiliyor", len(qna_entries), len(qna_index))
+    prompt = _build_prompt(qna_entries, conversation_history, user_message)
+    logger.debug("📐 Ending Agent Prompt: %s", prompt.describe())
+    received = []
+    try:
+        logger.debug("🟣 Ending Agent: Stream API çağrısı yapılıyor...")
+        async for delta in llm.stream(prompt.messages, agent="ending", temperature=0.3, max_tokens=1024):
+            received.append(delta)
+            yield delta
+    except Exception as e:
+        logger.error("❌ Ending Agent Stream Error: %s", e)
+        if not received:
+            AGENT_FALLBACKS.inc(agent="ending", reason="error")
+            yield CLOSING_MESSAGE
+            return
+    
+    if has_closing_word(user_message) and "POST_INTERVIEW_COMPLETE" not in "".join(received):
+        logger.debug("✅ Ending Agent: Zorla POST_INTERVIEW_COMPLETE eklendi")
+        yield " POST_INTERVIEW_COMPLETE"
\ No newline at end of file
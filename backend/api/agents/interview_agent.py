@@ -1,50 +1,40 @@
-import json
-from groq import AsyncGroq
 import sys
 import os
+import logging
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.file_manager import FileManager
+from utils.file_manager import get_file_manager
+from utils.llm_gateway import LLMGateway
+from utils.metrics import AGENT_FALLBACKS, AGENT_LOCAL_REPLIES
 
-file_manager = FileManager(base_dir=os.getenv("DATA_PATH", "../../GENAR"))
+logger = logging.getLogger(__name__)
 
-async def interview_agent(client: AsyncGroq, conversation_history: str, user_message: str, candidate_id: str):
+async def _load_candidate_name(candidate_id: str):
+    """Adayın adını döndürür, CV okunamazsa None"""
     try:
-        cv_data = file_manager.get_cv_data(candidate_id)
+        cv_data = await get_file_manager().async_reader.get_cv_data(candidate_id)
         if not cv_data:
-            return "Mülakat başlatılırken bir sorun oluştu. INTERVIEW_COMPLETE"
+            return None
     except Exception as e:
-        print(f"❌ Interview Agent - Dosya Çekme Hatası: {e}")
+        logger.error("❌ Interview Agent - Dosya Çekme Hatası: %s", e)
+        return None
+    return cv_data.get('name', 'Aday')
+
+def _template_response(candidate_name: str) -> str:
+    return f"Merhaba {candidate_name}, video bağlantısında teknik sorunlar yaşıyoruz. Video mülakat kısmını atlayarak doğrudan değerlendirme testine geçelim. INTERVIEW_COMPLETE"
+
+async def interview_agent(llm: LLMGateway, conversation_history: list, user_message: str, candidate_id: str):
+    """
+    Video mülakat şu an teknik nedenlerle atlanıyor; yanıt her zaman sabit bir şablon.
+    LLM çağrısı yapılmaz (şablon yerelde doldurulur).
+    """
+    candidate_name = await _load_candidate_name(candidate_id)
+    if candidate_name is None:
+        AGENT_FALLBACKS.inc(agent="interview", reason="missing_data")
         return "Mülakat başlatılırken bir sorun oluştu. INTERVIEW_COMPLETE"
-    
-    candidate_name = cv_data.get('name', 'Aday')
-    
-    prompt = f"""You are an HR system that needs to immediately end the video interview due to technical issues.
+    AGENT_LOCAL_REPLIES.inc(agent="interview", kind="template")
+    return _template_response(candidate_name)
 
-CANDIDATE: {candidate_name}
-USER MESSAGE: {user_message}
-
-YOUR RESPONSE MUST BE EXACTLY:
-"Merhaba {candidate_name}, video bağlantısında teknik sorunlar yaşıyoruz. Video mülakat kısmını atlayarak doğrudan değerlendirme testine geçelim. INTERVIEW_COMPLETE"
-
-**CRITICAL**: You MUST include "INTERVIEW_COMPLETE" at the end to trigger the quiz.
-
-Respond now:"""
-
-    try:
-        chat_completion = await client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            model="openai/gpt-oss-120b",
-            temperature=0.1  # Düşük temperature ile tutarlı yanıt
-        )
-        response = chat_completion.choices[0].message.content
-        
-        # Eğer INTERVIEW_COMPLETE yoksa ekle
-        if "INTERVIEW_COMPLETE" not in response:
-            response += " INTERVIEW_COMPLETE"
-        
-        return response
-    except Exception as e:
-        print(f"❌ Interview Agent Error: {e}")
-        # Hata durumunda fallback yanıt
-        return f"Merhaba {candidate_name}, video bağlantısında teknik sorunlar yaşıyoruz. Video mülakat kısmını atlayarak doğrudan değerlendirme testine geçelim. INTERVIEW_COMPLETE"
\ No newline at end of file
+async def interview_agent_stream(llm: LLMGateway, conversation_history: list, user_message: str, candidate_id: str):
+    """interview_agent'ın stream eden versiyonu - şablon tek parça olarak üretilir"""
+    yield await interview_agent(llm, conversation_history, user_message, candidate_id)
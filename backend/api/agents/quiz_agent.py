@@ -1,8 +1,21 @@
-import json
-from groq import AsyncGroq
+import sys
+import os
+import logging
 
-async def quiz_agent(client: AsyncGroq, qna_data: dict, job_ad_data: dict):
-    prompt = f"""You are a world-class HR hiring expert specialized in interview questions.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.prompt_builder import build_chat_prompt
+from utils.llm_gateway import LLMGateway, PRIORITY_BACKGROUND
+from utils.json_stream import JsonArrayItems
+from utils.quiz_pool import validate_question, QUIZ_QUESTION_COUNT
+from utils.metrics import QUIZ_INVALID_QUESTIONS
+from utils.logging_setup import payload
+
+logger = logging.getLogger(__name__)
+
+# Quiz çıktısı uzun olduğundan sohbet turlarından daha uzun zaman aşımı kullanılır
+QUIZ_TIMEOUT_SECONDS = float(os.getenv("QUIZ_TIMEOUT_SECONDS", "90"))
+
+QUIZ_RULES = """You are a world-class HR hiring expert specialized in interview questions.
 
 Your task is to create a personality quiz for a job candidate.
 Read the provided <q&a.json> to identify 5 key skills required for the role. For each skill, prepare two multiple-choice questions based on the "Big Five Personality Traits" that are also RELEVANT to the <JobAD.json>. This will result in a total of 10 questions.
@@ -12,38 +25,70 @@ RULES:
 2.  Each question must have 4 options (A, B, C, D). The answer choices should be close to each other, making it challenging to pick the correct one.
 3.  The output must be a valid JSON object with a single key "questions".
 4.  Each question object in the list must have: "question", "options" (a list of 4 strings), "correct_answer" (the letter A, B, C, or D), and "time" (always 60 seconds).
-5.  IMPORTANT: All content (questions, options) must be in Turkish.
+5.  IMPORTANT: All content (questions, options) must be in Turkish."""
 
-<q&a.json>: {json.dumps(qna_data, ensure_ascii=False)}
+def format_question(raw):
+    """LLM'in soru nesnesini frontend formatına çevirir; eksik/geçersizse None"""
+    if not isinstance(raw, dict):
+        return None
+    correct_answer = str(raw.get('correct_answer', '')).upper().strip()
+    if correct_answer not in ('A', 'B', 'C', 'D'):
+        return None
+    question = {
+        "question": raw.get('question'),
+        "options": raw.get('options'),
+        "correctAnswerIndex": ['A', 'B', 'C', 'D'].index(correct_answer),
+        "time": raw.get('time', 60)
+    }
+    return question if validate_question(question) else None
 
-<JobAD.json>: {json.dumps(job_ad_data, ensure_ascii=False)}
+async def quiz_agent_stream(llm: LLMGateway, qna_data: dict, job_ad_data: dict, priority: int = PRIORITY_BACKGROUND):
+    """
+    Quiz'i stream eder: her soru nesnesi kapanır kapanmaz doğrulanır ve geçerliyse frontend formatında üretilir.
+    Geçersiz/parse edilemeyen sorular atlanır; eksikler quiz_repair ile tamamlanır.
+    """
+    # Aynı ilan için üretilen tüm varyantlar aynı system prefix'i paylaşır
+    prompt = build_chat_prompt(QUIZ_RULES, [("q&a.json", qna_data), ("JobAD.json", job_ad_data)], [], "Generate the quiz:")
+    logger.debug("📐 Quiz Agent Prompt: %s", prompt.describe())
 
-Generate the quiz:"""
+    # Havuz dolumu arka plan şeridinde çalışır; aday bekliyorsa çağıran PRIORITY_CHAT verir
+    items = JsonArrayItems("questions")
+    skipped = 0
+    async for chunk in llm.stream(prompt.messages, agent="quiz", priority=priority, timeout=QUIZ_TIMEOUT_SECONDS):
+        for raw in items.feed(chunk):
+            question = format_question(raw)
+            if question:
+                yield question
+            else:
+                skipped += 1
+                logger.warning("⚠️ Quiz Agent: Geçersiz soru atlandı: %s", payload(raw))
+    skipped += items.invalid
+    if skipped:
+        QUIZ_INVALID_QUESTIONS.inc(skipped)
 
-    chat_completion = await client.chat.completions.create(
-        messages=[{"role": "user", "content": prompt}],
-        model="openai/gpt-oss-120b",
+async def quiz_repair(llm: LLMGateway, qna_data: dict, job_ad_data: dict, count: int, existing: list,
+                      priority: int = PRIORITY_BACKGROUND):
+    """Eksik kalan `count` soru için yeni sorular üretir (JSON mode, stream'siz); sadece geçerli olanları döndürür"""
+    existing_questions = "\n".join(f"- {q['question']}" for q in existing)
+    instruction = (
+        f"Generate exactly {count} additional question(s) in the same JSON format (ignore the 10-question rule). "
+        f"They must be different from these existing questions:\n{existing_questions}"
     )
-    response_text = chat_completion.choices[0].message.content
-    clean_response = response_text.replace("```json", "").replace("```", "").strip()
-    parsed = json.loads(clean_response)
-
-    if 'questions' in parsed:
-        # API'den gelen formatı frontend'in beklediği formata çevir
-        formatted_questions = []
-        for q in parsed['questions']:
-            correct_answer = q.get('correct_answer', 'A').upper().strip()
-            try:
-                correct_index = ['A', 'B', 'C', 'D'].index(correct_answer)
-            except ValueError:
-                correct_index = 0
-            formatted_questions.append({
-                "question": q.get('question'),
-                "options": q.get('options'),
-                "correctAnswerIndex": correct_index,
-                "time": q.get('time', 60)
-            })
-        return formatted_questions
-    
-    # Fallback in case of parsing error
-    return []
\ No newline at end of file
+    # System prefix quiz üretimiyle aynı; sadece son mesaj farklı
+    prompt = build_chat_prompt(QUIZ_RULES, [("q&a.json", qna_data), ("JobAD.json", job_ad_data)], [], instruction)
+    chat_completion = await llm.complete(
+        prompt.messages, agent="quiz", priority=priority, timeout=QUIZ_TIMEOUT_SECONDS,
+        response_format={"type": "json_object"}
+    )
+    items = JsonArrayItems("questions")
+    questions = [q for q in (format_question(raw) for raw in items.feed(chat_completion.choices[0].message.content or "")) if q]
+    return questions[:count]
+
+async def quiz_agent(llm: LLMGateway, qna_data: dict, job_ad_data: dict, priority: int = PRIORITY_BACKGROUND):
+    """Tam quiz (havuz dolumu için): stream edilen geçerli sorular + eksikler için tek onarım çağrısı"""
+    questions = [q async for q in quiz_agent_stream(llm, qna_data, job_ad_data, priority)]
+    missing = QUIZ_QUESTION_COUNT - len(questions)
+    if missing > 0:
+        logger.info("🩹 Quiz Agent: %d eksik soru onarılıyor", missing)
+        questions += await quiz_repair(llm, qna_data, job_ad_data, missing, questions, priority)
+    return questions
@@ -1,82 +1,68 @@
-import json
-import asyncio
-from groq import Groq
 import sys
 import os
+import hashlib
+import logging
+from datetime import datetime
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.file_manager import FileManager
+from utils.file_manager import get_file_manager
+from utils.intents import is_plain_ready
+from utils.prompt_builder import ChatPrompt, build_chat_prompt, cached_tokens
+from utils.prompt_digest import cv_digest, job_digest
+from utils.llm_gateway import LLMGateway, PRIORITY_BACKGROUND
+from utils.metrics import AGENT_FALLBACKS, AGENT_LOCAL_REPLIES, CACHE_REQUESTS
+from utils.logging_setup import payload
 
-file_manager = FileManager(base_dir=os.getenv("DATA_PATH", "../../GENAR"))
+logger = logging.getLogger(__name__)
 
-async def starting_agent(client: Groq, conversation_history: str, user_message: str, candidate_id: str) -> dict:
+TRANSITION_MESSAGE = "Harika! Verdiğiniz bilgiler için teşekkürler. O zaman mülakatın bir sonraki bölümüne geçelim."
+
+def _is_ready_turn(conversation_history: list, user_message: str) -> bool:
+    """Sohbet başlamışsa ve aday sadece hazır olduğunu söylüyorsa geçiş mesajı yerelde verilir"""
+    return bool(conversation_history) and user_message != "FIRST_MESSAGE" and is_plain_ready(user_message)
+
+async def _load_context(candidate_id: str):
     """
-    Bu ajan, candidate_id ile veriyi kendi çeker.
-    Döndürdüğü: {"response": str, "is_complete": bool}
+    Adayın ilanını katalogdan bulur, CV ve ilan verisini çeker.
+    Döndürdüğü: (job_id, cv_data, job_ad_data, error_result) - hata yoksa error_result None
     """
-    # Veriyi FileManager ile çek
     try:
-        cv_data = file_manager.get_cv_data(candidate_id)
-        job_id = '-'.join(candidate_id.split('-')[:2])
-        job_ad_data = file_manager.get_job_ad_data(job_id)
+        reader = get_file_manager().async_reader
+        job_id = await reader.resolve_candidate(candidate_id)
+        cv_data = await reader.get_cv_data(candidate_id)
+        job_ad_data = await reader.get_job_ad_data(job_id) if job_id else None
         
         if not cv_data:
-            print(f"⚠️ Starting Agent: {candidate_id} için cv_data bulunamadı.")
-            return {"response": "Mülakat başlatılırken bir sorun oluştu (CV verisi eksik).", "is_complete": True}
+            logger.warning("⚠️ Starting Agent: %s için cv_data bulunamadı.", candidate_id)
+            AGENT_FALLBACKS.inc(agent="starting", reason="missing_data")
+            return None, None, None, {"response": "Mülakat başlatılırken bir sorun oluştu (CV verisi eksik).", "is_complete": True}
         if not job_ad_data:
-            print(f"⚠️ Starting Agent: {candidate_id} için job_ad_data bulunamadı.")
-            return {"response": "Mülakat başlatılırken bir sorun oluştu (İlan verisi eksik).", "is_complete": True}
+            logger.warning("⚠️ Starting Agent: %s için job_ad_data bulunamadı.", candidate_id)
+            AGENT_FALLBACKS.inc(agent="starting", reason="missing_data")
+            return None, None, None, {"response": "Mülakat başlatılırken bir sorun oluştu (İlan verisi eksik).", "is_complete": True}
             
     except Exception as e:
-        print(f"❌ Starting Agent - Dosya Çekme Hatası: {e}")
-        return {"response": f"Sistem hatası: {e}", "is_complete": True}
-    
-    # Debug
-    print(f"🔍 Starting Agent Conversation History: '{conversation_history}'")
-    print(f"🔍 Starting Agent User Message: '{user_message}'")
-    print(f"🔍 CV Name: {cv_data.get('name', 'Unknown')}")
-    print(f"🔍 Job Position: {job_ad_data.get('position', 'Unknown')}")
-    
-    if not conversation_history.strip() and not user_message.strip():
-        user_message = "FIRST_MESSAGE"
-
-    # İlk mesaj mı kontrol et
-    is_first_message = user_message == "FIRST_MESSAGE"
+        logger.error("❌ Starting Agent - Dosya Çekme Hatası: %s", e)
+        AGENT_FALLBACKS.inc(agent="starting", reason="missing_data")
+        return None, None, None, {"response": f"Sistem hatası: {e}", "is_complete": True}
     
-    if is_first_message:
-        prompt = f"""You are a Warm-up Interview Agent — a friendly and professional HR representative from the company conducting the interview. Your name is Alex.
+    return job_id, cv_data, job_ad_data, None
 
-This is the FIRST MESSAGE to the candidate. Create a personalized greeting based on:
-- Candidate's name from CV: {cv_data.get('name', 'Aday')}
-- Company context
+async def _load_digests(job_id: str, candidate_id: str, cv_data: dict, job_ad_data: dict):
+    """Prompt'a giren kompakt CV ve ilan metinleri (kaynak değişmedikçe saklanan digest kullanılır)"""
+    file_manager = get_file_manager()
+    return await cv_digest(file_manager, job_id, candidate_id, cv_data), await job_digest(file_manager, job_id, job_ad_data)
 
-Your greeting should:
-1. Welcome the candidate warmly by name
-2. Briefly explain this is a warm-up chat before the main interview
-3. Set a comfortable, professional tone
-4. Invite them to start when ready
-
-BEHAVIORAL RULES:
-- Speak ONLY in Turkish
-- Be warm, professional, and welcoming
-- Make it personal to the candidate and position
-- Keep it concise but friendly
-
-CV DATA: {json.dumps(cv_data, ensure_ascii=False)}
-JOB AD DATA: {json.dumps(job_ad_data, ensure_ascii=False)}
-
-Create a personalized first greeting in Turkish:"""
-    else:
-        prompt = f"""You are a Warm-up Interview Agent — a friendly and professional HR representative from the company conducting the interview. Your name is Alex.
+STARTING_RULES = """You are a Warm-up Interview Agent — a friendly and professional HR representative from the company conducting the interview. Your name is Alex.
 
 Your goal is to make the candidate comfortable and establish a natural flow before the main part of the interview begins.
 
-You have access to two JSON files:
+You have access to two JSON files (at the end of this message):
 - <JobAD.json>: Information about the job position.
 - <CV.json>: The candidate’s professional background.
 
 INTERVIEW FLOW:
-1.  *Greeting & Context Setting*: You have already greeted the candidate. Your task is to continue the warm-up.
+1.  *Greeting & Context Setting*: If you are asked for the FIRST MESSAGE, welcome the candidate warmly by name, briefly explain this is a warm-up chat before the main interview and invite them to start when ready. Otherwise you have already greeted the candidate; continue the warm-up.
 2.  *Personalized Warm-up Questions*: Ask 4-6 short, open-ended questions based on the candidate's background from <CV.json> and the role from <JobAD.json>. Keep a natural, warm, and engaging tone.
     - Example questions: "CV'nizde Python ile çalıştığınızı gördüm; en çok ne tür projelerden keyif aldınız?", "Bu pozisyonda sizi en çok ne cezbetti?", "İdeal çalışma ortamınızı nasıl tanımlarsınız?"
 3.  *Engagement Management*: Adapt to the candidate’s responses. If an answer is too brief, ask a short follow-up for more detail. Avoid technical or evaluative questions.
@@ -91,8 +77,8 @@ BEHAVIORAL RULES:
 - Use only information available in the provided JSON data.
 
 CRITICAL DATA VERIFICATION:
-- ALWAYS use the EXACT candidate name from CV DATA: {cv_data.get('name', 'Unknown')}
-- ALWAYS use the EXACT job position from JOB AD DATA: {job_ad_data.get('position', 'Unknown')}
+- ALWAYS use the EXACT candidate name from the "name" field of <CV.json>
+- ALWAYS use the EXACT job position from the "position" field of <JobAD.json>
 - NEVER mix up candidate information or job positions
 
 CRITICAL TRANSITION RULE:
@@ -100,42 +86,130 @@ CRITICAL TRANSITION RULE:
 - When the warm-up is complete (after 4+ questions) or the candidate states they are ready, your final message MUST be: "Harika! Verdiğiniz bilgiler için teşekkürler. O zaman mülakatın bir sonraki bölümüne geçelim. START_INTERVIEW"
 - **CRITICAL**: You MUST add "START_INTERVIEW" to your very last message to trigger the next phase. Do not use it before.
 - **IMPORTANT**: Look at the conversation history - if there are already 4+ exchanges, END WITH START_INTERVIEW NOW.
+- Long histories start with a "[Önceki konuşma özeti: ...]" message; include the assistant message count it reports when counting."""
+
+FIRST_MESSAGE_INSTRUCTION = """FIRST MESSAGE: Create a personalized first greeting in Turkish for the candidate in <CV.json>.
+Welcome them warmly by name, briefly explain this is a warm-up chat before the main interview, set a comfortable, professional tone and invite them to start when ready. Keep it concise but friendly."""
 
-CV DATA: {json.dumps(cv_data, ensure_ascii=False)}
-JOB AD DATA: {json.dumps(job_ad_data, ensure_ascii=False)}
+def _build_prompt(cv, job, conversation_history: list, user_message: str) -> ChatPrompt:
+    """
+    Starting agent mesajlarını oluşturur (user_message FIRST_MESSAGE olabilir).
+    Kurallar, ilan ve CV digest'leri sabit system mesajında; geçmiş ve son mesaj ayrı turlar olarak gider.
+    """
+    if user_message == "FIRST_MESSAGE":
+        user_message = FIRST_MESSAGE_INSTRUCTION
+    return build_chat_prompt(
+        STARTING_RULES,
+        [("JobAD.json", job.text), ("CV.json", cv.text)],
+        conversation_history,
+        user_message
+    )
+
+def _source_hash(cv, job) -> str:
+    """Karşılamanın üretildiği CV + ilan verisinin özeti; veri değişince saklanan karşılama geçersiz olur"""
+    return hashlib.sha1(f"{cv.source_hash}:{job.source_hash}".encode("utf-8")).hexdigest()
+
+async def _stored_greeting(candidate_id: str, cv, job):
+    """Aday klasöründeki önceden üretilmiş karşılama (güncel değilse None)"""
+    stored = await get_file_manager().async_reader.get_candidate_data(candidate_id, "greeting.json")
+    if stored and stored.get("source_hash") == _source_hash(cv, job):
+        CACHE_REQUESTS.inc(cache="greeting", result="hit")
+        return stored.get("greeting")
+    CACHE_REQUESTS.inc(cache="greeting", result="miss")
+    return None
+
+async def prewarm_greeting(llm: LLMGateway, candidate_id: str) -> bool:
+    """
+    Adayın ilk karşılama mesajını arka plan önceliğiyle üretip aday klasörüne (greeting.json) kaydeder.
+    Güncel bir karşılama zaten varsa LLM çağrılmaz. Karşılama hazırsa True döner.
+    """
+    job_id, cv_data, job_ad_data, error_result = await _load_context(candidate_id)
+    if error_result:
+        return False
+    cv, job = await _load_digests(job_id, candidate_id, cv_data, job_ad_data)
+    if await _stored_greeting(candidate_id, cv, job):
+        return True
+
+    prompt = _build_prompt(cv, job, [], "FIRST_MESSAGE")
+    chat_completion = await llm.complete(prompt.messages, agent="starting", priority=PRIORITY_BACKGROUND, temperature=0.7, max_tokens=1024)
+    greeting = (chat_completion.choices[0].message.content or "").replace("START_INTERVIEW", "").strip()
+    if not greeting:
+        return False
 
-CONVERSATION HISTORY:
-{conversation_history}
+    await get_file_manager().async_writer.save_candidate_data(job_id, candidate_id, "greeting", {
+        "greeting": greeting,
+        "source_hash": _source_hash(cv, job),
+        "created_at": datetime.now().isoformat()
+    })
+    logger.info("🌅 Starting Agent: %s için karşılama önceden üretildi", candidate_id)
+    return True
 
-CANDIDATE'S LAST MESSAGE: "{user_message}"
+def _fallback_response(cv_data: dict, user_message: str) -> str:
+    """Tüm denemeler başarısız olduğunda kullanılan yanıt"""
+    if user_message == "FIRST_MESSAGE":
+        return f"Merhaba {cv_data.get('name', 'Aday')}! Mülakatınıza hoş geldiniz. Asıl mülakata geçmeden önce sizi tanımak için kısa bir sohbet yapalım. Hazır olduğunuzda başlayabiliriz."
+    return f"Anladım, teşekkürler {cv_data.get('name', 'Aday')}! Kendinizden biraz bahseder misiniz?"
 
-Respond in Turkish with appropriate warm-up conversation:"""
+def _log_context(cv_data: dict, job_ad_data: dict, conversation_history: list, user_message: str):
+    logger.debug(
+        "🔍 Starting Agent: %d mesajlık geçmiş, aday: %s, pozisyon: %s, mesaj: '%s'",
+        len(conversation_history), cv_data.get('name', 'Unknown'), job_ad_data.get('position', 'Unknown'), payload(user_message)
+    )
 
-    # Retry mekanizması - 2 kez dene
+async def starting_agent(llm: LLMGateway, conversation_history: list, user_message: str, candidate_id: str) -> dict:
+    """
+    Bu ajan, candidate_id ile veriyi kendi çeker.
+    Döndürdüğü: {"response": str, "is_complete": bool}
+    """
+    # Veriyi FileManager ile çek
+    job_id, cv_data, job_ad_data, error_result = await _load_context(candidate_id)
+    if error_result:
+        return error_result
+    
+    _log_context(cv_data, job_ad_data, conversation_history, user_message)
+    
+    if not conversation_history and not user_message.strip():
+        user_message = "FIRST_MESSAGE"
+
+    if _is_ready_turn(conversation_history, user_message):
+        logger.debug("⚡ Starting Agent: Geçiş mesajı yerelde yanıtlandı")
+        AGENT_LOCAL_REPLIES.inc(agent="starting", kind="transition")
+        return {"response": TRANSITION_MESSAGE, "is_complete": True}
+
+    cv, job = await _load_digests(job_id, candidate_id, cv_data, job_ad_data)
+    if user_message == "FIRST_MESSAGE":
+        greeting = await _stored_greeting(candidate_id, cv, job)
+        if greeting:
+            logger.debug("⚡ Starting Agent: Önceden üretilmiş karşılama kullanıldı")
+            return {"response": greeting, "is_complete": False}
+
+    prompt = _build_prompt(cv, job, conversation_history, user_message)
+    logger.debug("📐 Starting Agent Prompt: %s", prompt.describe())
+
+    # Hata tekrarlarını gateway yapar; burada sadece boş yanıt bir kez daha denenir
+    fallback_reason = "empty_response"
     for attempt in range(2):
         try:
-            print(f"📤 Starting Agent: API çağrısı yapılıyor... (Deneme {attempt + 1})")
-            chat_completion = await client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}],
-                model="openai/gpt-oss-120b",
+            logger.debug("📤 Starting Agent: API çağrısı yapılıyor... (Deneme %d)", attempt + 1)
+            chat_completion = await llm.complete(
+                prompt.messages,
+                agent="starting",
                 temperature=0.7,
                 max_tokens=1024
             )
-            # Detaylı loglama
-            print(f"🔍 Finish Reason: {chat_completion.choices[0].finish_reason}")
-            print(f"🔍 Usage: {chat_completion.usage}")
-            
             response_text = chat_completion.choices[0].message.content
-            print(f"📥 Starting Agent: API yanıtı alındı: '{response_text}'")
-            print(f"🔍 Content Length: {len(response_text or '')}")
+            logger.debug(
+                "📥 Starting Agent: API yanıtı alındı (finish_reason: %s, usage: %s, cache: %d token): '%s'",
+                chat_completion.choices[0].finish_reason, chat_completion.usage,
+                cached_tokens(chat_completion.usage), payload(response_text or "")
+            )
             
             # Token limiti kontrolü
             if chat_completion.choices[0].finish_reason == "length":
-                print("⚠️ Token limiti aşıldı!")
+                logger.warning("⚠️ Starting Agent: Token limiti aşıldı!")
             
             # Boş yanıt kontrolü - boş değilse başarılı
             if response_text and response_text.strip():
-                print(f"🟢 Starting Agent Raw Response: {response_text}")
                 is_complete = "START_INTERVIEW" in response_text
                 cleaned_response = response_text.replace("START_INTERVIEW", "").strip()
                 return {
@@ -143,21 +217,16 @@ Respond in Turkish with appropriate warm-up conversation:"""
                     "is_complete": is_complete
                 }
             else:
-                print(f"⚠️ Starting Agent: Boş yanıt (Deneme {attempt + 1})")
-                if attempt == 0:  # İlk deneme başarısız, kısa bekle
-                    await asyncio.sleep(0.3)
+                logger.warning("⚠️ Starting Agent: Boş yanıt (Deneme %d)", attempt + 1)
         except Exception as e:
-            print(f"❌ Starting Agent Error (Deneme {attempt + 1}): {e}")
-            if attempt == 0:  # İlk deneme başarısız, kısa bekle
-                await asyncio.sleep(0.3)
+            logger.error("❌ Starting Agent Error (Deneme %d): %s", attempt + 1, e)
+            fallback_reason = "error"
+            break
     
     # Tüm denemeler başarısız - fallback
-    print("⚠️ Starting Agent: Tüm denemeler başarısız, fallback kullanılıyor")
-    if user_message == "FIRST_MESSAGE":
-        response_text = f"Merhaba {cv_data.get('name', 'Aday')}! Mülakatınıza hoş geldiniz. Asıl mülakata geçmeden önce sizi tanımak için kısa bir sohbet yapalım. Hazır olduğunuzda başlayabiliriz."
-    else:
-        response_text = f"Anladım, teşekkürler {cv_data.get('name', 'Aday')}! Kendinizden biraz bahseder misiniz?"
-    print(f"🟢 Starting Agent Raw Response: {response_text}")
+    logger.warning("⚠️ Starting Agent: Tüm denemeler başarısız, fallback kullanılıyor")
+    AGENT_FALLBACKS.inc(agent="starting", reason=fallback_reason)
+    response_text = _fallback_response(cv_data, user_message)
 
     is_complete = "START_INTERVIEW" in response_text
     cleaned_response = response_text.replace("START_INTERVIEW", "").strip()
@@ -165,4 +234,59 @@ Respond in Turkish with appropriate warm-up conversation:"""
     return {
         "response": cleaned_response,
         "is_complete": is_complete
-    }
\ No newline at end of file
+    }
+
+async def starting_agent_stream(llm: LLMGateway, conversation_history: list, user_message: str, candidate_id: str):
+    """
+    starting_agent'ın stream eden versiyonu.
+    Ham metin parçalarını (START_INTERVIEW işareti dahil) üretir; işaretleri çağıran taraf ayıklar.
+    """
+    job_id, cv_data, job_ad_data, error_result = await _load_context(candidate_id)
+    if error_result:
+        yield error_result["response"] + (" START_INTERVIEW" if error_result["is_complete"] else "")
+        return
+    
+    _log_context(cv_data, job_ad_data, conversation_history, user_message)
+    
+    if not conversation_history and not user_message.strip():
+        user_message = "FIRST_MESSAGE"
+
+    if _is_ready_turn(conversation_history, user_message):
+        logger.debug("⚡ Starting Agent: Geçiş mesajı yerelde yanıtlandı")
+        AGENT_LOCAL_REPLIES.inc(agent="starting", kind="transition")
+        yield f"{TRANSITION_MESSAGE} START_INTERVIEW"
+        return
+
+    cv, job = await _load_digests(job_id, candidate_id, cv_data, job_ad_data)
+    if user_message == "FIRST_MESSAGE":
+        greeting = await _stored_greeting(candidate_id, cv, job)
+        if greeting:
+            logger.debug("⚡ Starting Agent: Önceden üretilmiş karşılama kullanıldı")
+            yield greeting
+            return
+
+    prompt = _build_prompt(cv, job, conversation_history, user_message)
+    logger.debug("📐 Starting Agent Prompt: %s", prompt.describe())
+
+    # Hata tekrarlarını (ilk token gelmeden önce) gateway yapar; boş stream bir kez daha denenir
+    fallback_reason = "empty_response"
+    for attempt in range(2):
+        has_output = False
+        try:
+            logger.debug("📤 Starting Agent: Stream API çağrısı yapılıyor... (Deneme %d)", attempt + 1)
+            async for delta in llm.stream(prompt.messages, agent="starting", temperature=0.7, max_tokens=1024):
+                has_output = True
+                yield delta
+            if has_output:
+                return
+            logger.warning("⚠️ Starting Agent: Boş stream yanıtı (Deneme %d)", attempt + 1)
+        except Exception as e:
+            logger.error("❌ Starting Agent Stream Error (Deneme %d): %s", attempt + 1, e)
+            if has_output:
+                return
+            fallback_reason = "error"
+            break
+    
+    logger.warning("⚠️ Starting Agent: Tüm denemeler başarısız, fallback kullanılıyor")
+    AGENT_FALLBACKS.inc(agent="starting", reason=fallback_reason)
+    yield _fallback_response(cv_data, user_message)
\ No newline at end of file
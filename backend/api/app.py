@@ -1,21 +1,46 @@
+import re
 import json
 import os
+import time
+import asyncio
+import logging
 from datetime import datetime
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse, PlainTextResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Dict, Any
-from groq import AsyncGroq
+from pydantic import BaseModel, ValidationError
+from typing import Dict, Any, Optional
 from dotenv import load_dotenv
-from agents.starting_agent import starting_agent
-from agents.interview_agent import interview_agent
-from agents.quiz_agent import quiz_agent
-from agents.ending_agent import ending_agent
-from utils.file_manager import FileManager
+from agents.starting_agent import starting_agent, starting_agent_stream, prewarm_greeting, TRANSITION_MESSAGE
+from agents.interview_agent import interview_agent, interview_agent_stream
+from agents.quiz_agent import quiz_agent, quiz_agent_stream, quiz_repair
+from agents.ending_agent import ending_agent, ending_agent_stream, CLOSING_MESSAGE
+from utils.file_manager import get_file_manager
+from utils.session_store import create_session_store
+from utils.conversation_buffer import ConversationBuffers
+from utils.marker_filter import MarkerFilter
+from utils.quiz_pool import QuizPool
+from utils.quiz_analytics import QuizAnalytics
+from utils.candidate_ranking import CandidateRanking, RANKING_TOP_N
+from utils.llm_gateway import LLMGateway, create_client
+from utils.greeting_scheduler import GreetingScheduler, GREETING_PREWARM
+from utils.candidate_ingest import CandidateIngestor, INGEST_BATCH_SIZE
+from utils.admission import AdmissionController, MeetingTimes, ADMISSION_POLL_SECONDS
+from utils.token_budget import metered, account_session, budget_exhausted, SESSION_TOKEN_CEILING
+from utils.transcript_journal import message_record, stage_record, restore_session
+from utils.metrics import (
+    registry as metrics_registry, ACTIVE_SESSIONS, ADMISSION_CAPACITY, ADMISSION_SESSIONS, AGENT_LOCAL_REPLIES, CACHE_REQUESTS,
+    CHAT_TURN_SECONDS, LLM_SLOTS_ACTIVE, LLM_SLOTS_WAITING, LOG_RECORDS_DROPPED
+)
+from utils.logging_setup import setup_logging, bind_context, payload, dropped_records
 
 base_dir = os.path.dirname(os.path.abspath(__file__))
 load_dotenv(os.path.join(base_dir, '.env'))
 
+# Loglar kuyruk üzerinden arka plan thread'inde yazılır (LOG_LEVEL, LOG_LEVELS, LOG_FORMAT)
+setup_logging()
+logger = logging.getLogger("app")
+
 app = FastAPI()
 
 app.add_middleware(
@@ -29,65 +54,156 @@ groq_api_key = os.getenv("GROQ_API_KEY")
 if not groq_api_key:
     raise ValueError("GROQ_API_KEY bulunamadı")
 
-client = AsyncGroq(api_key=groq_api_key)
+# Tüm agent'lar LLM'e gateway üzerinden erişir (eşzamanlılık sınırı, öncelik şeritleri, 429 bekleme)
+# GROQ_BASE_URL ile OpenAI/Groq uyumlu başka bir sunucuya (örn. backend/bench/mock_groq.py) yönlendirilebilir
+llm = LLMGateway(create_client(groq_api_key, base_url=os.getenv("GROQ_BASE_URL")))
 
 DATA_PATH = os.getenv("DATA_PATH", "../../GENAR")
-file_manager = FileManager(base_dir=DATA_PATH)
+# STORAGE_BACKEND=sqlite ile GENAR ağacı yerine tek SQLite veritabanı kullanılır
+# Agent'lar da aynı örneği (get_file_manager) ve dolayısıyla aynı kataloğu kullanır
+file_manager = get_file_manager(DATA_PATH)
+
+# İlan başına önceden üretilmiş quiz havuzu (Quiz.json'da saklanır)
+# Havuz boşsa quiz stream edilerek üretilir, geçersiz/eksik sorular onarım çağrısıyla tamamlanır
+quiz_pool = QuizPool(
+    file_manager,
+    generate=lambda qna_data, job_ad_data, priority: quiz_agent(llm, qna_data, job_ad_data, priority),
+    generate_stream=lambda qna_data, job_ad_data, priority: quiz_agent_stream(llm, qna_data, job_ad_data, priority),
+    repair=lambda qna_data, job_ad_data, count, existing, priority: quiz_repair(llm, qna_data, job_ad_data, count, existing, priority)
+)
+
+# İlan başına quiz agregaları; sonuç kaydedildikçe artımlı güncellenir
+quiz_analytics = QuizAnalytics(file_manager)
+
+# CV'lerin ilana uygunluk sıralaması (TF-IDF matrisi, yeni adaylar eklendikçe güncellenir)
+candidate_ranking = CandidateRanking(file_manager)
+
+# Yaklaşan toplantıların karşılama mesajları arka planda önceden üretilir
+greeting_scheduler = GreetingScheduler(file_manager, prewarm=lambda candidate_id: prewarm_greeting(llm, candidate_id))
+
+# Starting aşamasına aynı anda girebilecek session sayısı LLM kapasitesine göre sınırlanır; fazlası bekleme odasında sıraya girer
+admission = AdmissionController(slots=llm.stats()["max_concurrency"])
+meeting_times = MeetingTimes(file_manager)
+
+@app.on_event("startup")
+async def start_background_tasks():
+    # Katalog arka planda bir kez taranır; hazır olana kadar /api/ready 503 döner, aramalar diske bakar
+    asyncio.create_task(warm_catalog())
+    if GREETING_PREWARM:
+        greeting_scheduler.start()
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    await greeting_scheduler.stop()
+
+async def warm_catalog():
+    try:
+        await file_manager.run_io(file_manager.manager.warm_catalog)
+    except Exception as e:
+        logger.error("❌ Katalog taranamadı: %s", e)
 
 class ChatRequest(BaseModel):
     sessionId: str
     userMessage: str
+    # İstemcinin elindeki son mesajın sıra numarası; gönderilirse yanıtta sadece yeni mesajlar döner
+    lastSeq: Optional[int] = None
+
+# SESSION_STORE=sqlite ile birden fazla worker aynı session'lara erişebilir
+session_store = create_session_store()
 
-sessions: Dict[str, Dict[str, Any]] = {}
+# Konuşma geçmişi artımlı render edilir; agent'lara token bütçesine sığan pencere gönderilir
+conversation_buffers = ConversationBuffers(max_sessions=int(os.getenv("MAX_SESSIONS", "10000")))
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "2000"))
 
-def get_session(session_id: str):
+def history_window(session_id: str, key: str, *parts) -> list:
+    """Session geçmişinin token bütçesine sığan kısmını döndürür"""
+    return conversation_buffers.get(session_id, key, *parts).window(HISTORY_TOKEN_BUDGET)
+
+async def resolve_session(session_id: str) -> str:
     """
-    Session ID'nin kendisi candidate_id'dir.
-    Bu ID'den job_id'yi çıkarırız.
+    Session ID'nin kendisi candidate_id'dir; adayın ilanını katalogdan döndürür.
+    Biçimi geçersiz ya da bilinmeyen ID'ler session oluşturulmadan, LLM çağrısı yapılmadan 404 ile reddedilir.
     """
-    if session_id not in sessions:
-        candidate_id = session_id  # örn: "Genar-00001-00001"
-        
-        # Aday ID'sinden Job ID'yi çıkar
-        parts = candidate_id.split("-")
-        if len(parts) < 3:
-            print(f"HATA: Geçersiz session_id formatı: {session_id}")
-            job_id = "Genar-00001"
-            candidate_id = "Genar-00001-00001"
-        else:
-            job_id = f"{parts[0]}-{parts[1]}"  # örn: "Genar-00001"
-        
-        sessions[session_id] = {
-            "stage": "starting",
-            "job_id": job_id,
-            "candidate_id": candidate_id,
-            "full_conversation": [],
-            "starting_conversation": [],
-            "ending_conversation": []
-        }
-    return sessions[session_id]
+    job_id = await file_manager.async_reader.resolve_candidate(session_id)
+    if job_id is None:
+        logger.warning("⚠️ Bilinmeyen session_id reddedildi: %s", payload(session_id))
+        raise HTTPException(status_code=404, detail="Unknown session")
+    return job_id
+
+async def new_session(session_id: str) -> Dict[str, Any]:
+    """
+    Session ID'nin kendisi candidate_id'dir (örn: "Genar-00001-00001").
+    Bilinmeyen ID'ler resolve_session'da reddedilir.
+    """
+    candidate_id = session_id
+    job_id = await resolve_session(session_id)  # örn: "Genar-00001"
+    
+    session = {
+        "stage": "starting",
+        "job_id": job_id,
+        "candidate_id": candidate_id,
+        "full_conversation": [],
+        "starting_conversation": [],
+        "ending_conversation": [],
+        "seq": 0
+    }
+    # Yeniden başlatma sonrası mülakat adayın transcript journal'ından kaldığı yerden devam eder
+    records = await file_manager.async_reader.get_transcript_records(candidate_id)
+    if records:
+        restore_session(session, records)
+        logger.info("♻️ Session transcript journal'dan geri yüklendi: %s (%s)", session_id, session["stage"])
+    return session
+
+async def get_session(session_id: str):
+    """Session'ı store'dan getirir, yoksa oluşturup kaydeder"""
+    session = session_store.get(session_id)
+    if session is None:
+        created = await new_session(session_id)
+        # Journal okunurken aynı session'ın başka bir isteği session'ı oluşturmuş olabilir
+        session = session_store.get(session_id)
+        if session is None:
+            session = created
+            session_store.save(session_id, session)
+    bind_context(session_id=session_id, candidate_id=session["candidate_id"])
+    return session
 
 @app.get('/api/health')
 async def health_check():
     return {"status": "ok"}
 
+@app.get('/api/ready')
+async def readiness_check():
+    """Katalog taraması bittiyse 200, sürüyorsa 503 (load balancer trafiği hazır olunca yönlendirir)"""
+    stats = file_manager.catalog.stats()
+    if not stats["ready"]:
+        return JSONResponse(status_code=503, content={"status": "warming", "catalog": stats})
+    return {"status": "ready", "catalog": stats}
+
+@app.get('/api/sessions/stats')
+async def session_stats():
+    """Canlı session sayısı ve eviction metrikleri"""
+    return session_store.stats()
+
 @app.delete('/api/session/{session_id}')
 async def clear_session(session_id: str):
     """Session'ı temizle"""
-    if session_id in sessions:
-        del sessions[session_id]
+    conversation_buffers.drop(session_id)
+    admission.release(session_id, completed=False)
+    if session_store.delete(session_id):
         return {"status": "success", "message": f"Session {session_id} cleared"}
     return {"status": "not_found", "message": f"Session {session_id} not found"}
 
 @app.get('/api/debug/{session_id}')
 async def debug_session(session_id: str):
     """Session bilgilerini debug et"""
-    session = get_session(session_id)
+    # Debug isteği session oluşturmaz
+    stored_session = session_store.get(session_id)
+    session = stored_session or await new_session(session_id)
     job_id = session.get('job_id')
     candidate_id = session.get('candidate_id')
     
-    candidate_cv = file_manager.reader.get_cv_data(candidate_id)
-    job_data = file_manager.reader.get_job_ad_data(job_id)
+    candidate_cv = await file_manager.async_reader.get_cv_data(candidate_id)
+    job_data = await file_manager.async_reader.get_job_ad_data(job_id)
     
     return {
         "session_id": session_id,
@@ -97,131 +213,546 @@ async def debug_session(session_id: str):
         "cv_name": candidate_cv.get('name', 'CV bulunamadı'),
         "job_found": bool(job_data),
         "job_position": job_data.get('position', 'İş ilanı bulunamadı'),
-        "stage": session.get('stage')
+        "session_exists": stored_session is not None,
+        "stage": session.get('stage'),
+        "tokens": session.get('tokens'),
+        "token_ceiling": SESSION_TOKEN_CEILING
     }
 
+async def admission_status(session_id: str, session: Dict[str, Any]) -> dict:
+    """Bekleme odası durumu; session kuyrukta değilse toplantı saatine göre sıraya girer"""
+    meeting_at = await meeting_times.get(session["job_id"], session["candidate_id"])
+    return admission.join(session_id, meeting_at)
+
+async def admit_turn(session_id: str, session: Dict[str, Any]):
+    """
+    Starting aşamasındaki turlar sadece kabul edilmiş session'lara açıktır.
+    Kapasite doluysa LLM çağrılmadan 429 döner; gövdede kuyruk sırası ve tahmini bekleme süresi bulunur.
+    """
+    if session["stage"] != "starting":
+        return
+    if not admission.is_admitted(session_id):
+        status = await admission_status(session_id, session)
+        if not status["admitted"]:
+            raise HTTPException(status_code=429, detail={"message": "Waiting room", **status},
+                                headers={"Retry-After": str(ADMISSION_POLL_SECONDS)})
+    admission.turn_started(session_id)
+
+def observe_turn(stage: str, meter, seconds: float):
+    """LLM çağrısı yapılan starting turlarının süresi kapasite modeline yazılır"""
+    if stage == "starting" and meter.calls:
+        admission.observe_call(seconds)
+
 @app.post('/api/chat')
 async def handle_chat(request: ChatRequest):
-    session = get_session(request.sessionId)
+    session = await get_session(request.sessionId)
+    await admit_turn(request.sessionId, session)
+    stage = session["stage"]
+    started = time.perf_counter()
+    with CHAT_TURN_SECONDS.time(endpoint="chat", stage=stage), metered() as meter:
+        result = await chat_turn(request, session)
+    observe_turn(stage, meter, time.perf_counter() - started)
+    return result
+
+def token_ceiling_reply(session: Dict[str, Any], stage: str):
+    """
+    Session token tavanına ulaştıysa aşamayı LLM çağırmadan kapatan yanıt (kontrol işaretiyle); ulaşmadıysa None.
+    Isınma sohbeti mülakata geçer, soru-cevap bölümü kapanır.
+    """
+    if stage not in ("starting", "ending") or not budget_exhausted(session):
+        return None
+    logger.warning("🪙 Token tavanı doldu (%s): %s aşaması yerelde kapatılıyor", session.get("tokens"), stage)
+    AGENT_LOCAL_REPLIES.inc(agent=stage, kind="token_ceiling")
+    return f"{TRANSITION_MESSAGE} START_INTERVIEW" if stage == "starting" else CLOSING_MESSAGE
+
+async def chat_turn(request: ChatRequest, session: Dict[str, Any]):
+    """Tek sohbet turu: mesajı aşamanın agent'ına yönlendirir, session'ı günceller ve kaydeder"""
     stage = session["stage"]
     user_message = request.userMessage
 
     if not user_message:
-        conversation_to_send = session["starting_conversation"] + session["ending_conversation"] if stage == "ending" else session["full_conversation"]
-        return {"response": "", "action": None, "conversation_history": conversation_to_send}
+        if stage == "starting" and not session["full_conversation"]:
+            return await send_greeting(request, session)
+        return turn_response(request, session, stage, "", None)
 
-    history_str = "\n".join([f"{'Aday' if msg['sender']=='user' else 'Asistan'}: {msg['text']}" for msg in session["full_conversation"]])
     response_text = ""
     action = None
+    records = []
 
     if user_message == "INTERVIEW_STARTED":
         session["stage"] = "interview"
         response_text = "Teknik nedenlerle video mülakatı atlanıyor. Şimdi kişilik değerlendirmesi bölümüne geçiyoruz."
         action = "START_QUIZ"
         session["stage"] = "quiz"
-        return {"response": response_text, "action": action, "conversation_history": session["full_conversation"]}
+        await save_turn(request.sessionId, session, stage, records)
+        return turn_response(request, session, stage, response_text, action)
     elif user_message == "QUIZ_COMPLETED":
         session["stage"] = "ending"
-        starting_history_str = "\n".join([f"{'Aday' if msg['sender']=='user' else 'Asistan'}: {msg['text']}" for msg in session["starting_conversation"]])
+        starting_history = history_window(request.sessionId, "starting", session["starting_conversation"])
         candidate_id = session["candidate_id"]
-        response_text = await ending_agent(client, starting_history_str, "", candidate_id)
+        response_text = await ending_agent(llm, starting_history, "", candidate_id)
         if response_text:
-            session["ending_conversation"].append({"sender": "assistant", "text": response_text})
+            records.append(add_message(session, "ending", "assistant", response_text, "ending_conversation"))
     elif stage == "starting":
         candidate_id = session["candidate_id"]
-        agent_result = await starting_agent(client, history_str, user_message, candidate_id)
+        history = history_window(request.sessionId, "full", session["full_conversation"])
+        ceiling_reply = token_ceiling_reply(session, stage)
+        if ceiling_reply:
+            agent_result = {"response": ceiling_reply.replace("START_INTERVIEW", "").strip(), "is_complete": True}
+        else:
+            agent_result = await starting_agent(llm, history, user_message, candidate_id)
         response_text = agent_result.get("response", "")
         if agent_result.get("is_complete"):
             action = "START_INTERVIEW"
             session["stage"] = "interview"
     elif stage == "interview":
         candidate_id = session["candidate_id"]
-        response_text = await interview_agent(client, history_str, user_message, candidate_id)
+        history = history_window(request.sessionId, "full", session["full_conversation"])
+        response_text = await interview_agent(llm, history, user_message, candidate_id)
         if "INTERVIEW_COMPLETE" in response_text:
             response_text = response_text.replace("INTERVIEW_COMPLETE", "").strip()
             action = "START_QUIZ"
             session["stage"] = "quiz"
     elif stage == "ending":
-        combined_history = session["starting_conversation"] + session["ending_conversation"]
-        ending_history_str = "\n".join([f"{'Aday' if msg['sender']=='user' else 'Asistan'}: {msg['text']}" for msg in combined_history])
+        ending_history = history_window(request.sessionId, "ending", session["starting_conversation"], session["ending_conversation"])
         candidate_id = session["candidate_id"]
-        response_text = await ending_agent(client, ending_history_str, user_message, candidate_id)
+        response_text = token_ceiling_reply(session, stage) or await ending_agent(llm, ending_history, user_message, candidate_id)
         if "POST_INTERVIEW_COMPLETE" in response_text:
             response_text = response_text.replace("POST_INTERVIEW_COMPLETE", "").strip()
             action = "FINISH_INTERVIEW"
 
-    if user_message not in ["QUIZ_COMPLETED", "INTERVIEW_STARTED"]:
-        if stage == "starting":
-            session["starting_conversation"].append({"sender": "user", "text": user_message})
-        elif stage == "ending":
-            session["ending_conversation"].append({"sender": "user", "text": user_message})
-        session["full_conversation"].append({"sender": "user", "text": user_message})
+    records += record_turn(session, stage, user_message, response_text)
+    await save_turn(request.sessionId, session, stage, records)
 
-    if response_text and user_message not in ["QUIZ_COMPLETED", "INTERVIEW_STARTED"]:
+    return turn_response(request, session, stage, response_text, action)
+
+async def send_greeting(request: ChatRequest, session: Dict[str, Any]):
+    """İlk tur: kişiselleştirilmiş karşılama (önceden üretildiyse LLM çağrısı yapılmaz)"""
+    agent_result = await starting_agent(llm, [], "", session["candidate_id"])
+    response_text = agent_result.get("response", "")
+    action = None
+    if agent_result.get("is_complete"):
+        action = "START_INTERVIEW"
+        session["stage"] = "interview"
+    records = []
+    if response_text:
+        records.append(add_message(session, "starting", "assistant", response_text, "starting_conversation", "full_conversation"))
+    await save_turn(request.sessionId, session, "starting", records)
+    return turn_response(request, session, "starting", response_text, action)
+
+def add_message(session: Dict[str, Any], stage: str, sender: str, text: str, *conversations) -> dict:
+    """Mesaja session içinde artan sıra numarasını verip verilen konuşma listelerine ekler; journal kaydını döndürür"""
+    session["seq"] = session.get("seq", 0) + 1
+    message = {"sender": sender, "text": text, "seq": session["seq"]}
+    for conversation in conversations:
+        session[conversation].append(message)
+    return message_record(stage, sender, text, seq=session["seq"])
+
+def record_turn(session: Dict[str, Any], stage: str, user_message: str, response_text: str):
+    """Aday mesajını ve asistan yanıtını ilgili konuşma listelerine ekler; transcript journal kayıtlarını döndürür"""
+    if user_message in ["QUIZ_COMPLETED", "INTERVIEW_STARTED"]:
+        return []
+    conversations = [f"{stage}_conversation", "full_conversation"] if stage in ("starting", "ending") else ["full_conversation"]
+    records = [add_message(session, stage, "user", user_message, *conversations)]
+    if response_text:
+        records.append(add_message(session, stage, "assistant", response_text, *conversations))
+    return records
+
+async def save_turn(session_id: str, session: Dict[str, Any], stage: str, records: list):
+    """Session'ı kaydeder; turun mesajlarını ve aşama değişikliğini adayın transcript journal'ına ekler"""
+    if session["stage"] != stage:
+        records = records + [stage_record(session["stage"])]
         if stage == "starting":
-            session["starting_conversation"].append({"sender": "assistant", "text": response_text})
-        elif stage == "ending":
-            session["ending_conversation"].append({"sender": "assistant", "text": response_text})
-        session["full_conversation"].append({"sender": "assistant", "text": response_text})
+            admission.release(session_id)
+    account_session(session)
+    session_store.save(session_id, session)
+    if records:
+        await file_manager.async_writer.append_transcript(session["job_id"], session["candidate_id"], records)
+
+def conversation_views(session: Dict[str, Any], stage: str, user_message: str) -> list:
+    """İstemcinin gördüğü konuşma: soru-cevap bölümünde ısınma + soru-cevap, diğer aşamalarda tüm konuşma"""
+    if stage == "ending" or user_message == "QUIZ_COMPLETED":
+        return [session["starting_conversation"], session["ending_conversation"]]
+    return [session["full_conversation"]]
+
+def conversation_to_send(session: Dict[str, Any], stage: str, user_message: str):
+    return [message for conversation in conversation_views(session, stage, user_message) for message in conversation]
+
+def messages_since(session: Dict[str, Any], stage: str, user_message: str, last_seq: int) -> list:
+    """Görünümdeki sıra numarası last_seq'ten büyük mesajlar; listeler sondan taranır (tur başına sabit iş)"""
+    new_messages = []
+    for conversation in reversed(conversation_views(session, stage, user_message)):
+        for message in reversed(conversation):
+            if message.get("seq", 0) <= last_seq:
+                new_messages.reverse()
+                return new_messages
+            new_messages.append(message)
+    new_messages.reverse()
+    return new_messages
+
+def turn_response(request: ChatRequest, session: Dict[str, Any], stage: str, response_text: str, action):
+    """
+    Tur yanıtı. lastSeq gönderen istemciye sadece yeni mesajlar (messages) ve son sıra numarası (seq) döner;
+    lastSeq göndermeyen eski istemciler tüm geçmişi conversation_history olarak almaya devam eder.
+    """
+    body = {"response": response_text, "action": action, "seq": session.get("seq", 0)}
+    if request.lastSeq is None:
+        body["conversation_history"] = conversation_to_send(session, stage, request.userMessage)
+    else:
+        body["messages"] = messages_since(session, stage, request.userMessage, request.lastSeq)
+    return body
+
+# Stage -> (agent'ın koyduğu işaret, frontend'e gönderilecek action, sonraki stage)
+STAGE_TRANSITIONS = {
+    "starting": ("START_INTERVIEW", "START_INTERVIEW", "interview"),
+    "interview": ("INTERVIEW_COMPLETE", "START_QUIZ", "quiz"),
+    "ending": ("POST_INTERVIEW_COMPLETE", "FINISH_INTERVIEW", None),
+}
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+async def local_stream(text: str):
+    """LLM çağrılmadan verilen yanıtı agent stream'i gibi tek parça halinde üretir"""
+    yield text
+
+async def chat_events(request: ChatRequest, session: Dict[str, Any], endpoint: str):
+    """
+    Stream eden sohbet turu; (olay, gövde) çiftleri üretir (SSE ve WebSocket kanalları ortak kullanır).
+    Yanıt parçaları "token" olayı ile gelir, kontrol işaretleri ayıklanır.
+    Son olarak "done" olayı /api/chat ile aynı gövdeyi (response, action, seq ve messages ya da conversation_history) taşır.
+    """
+    stage = session["stage"]
+    user_message = request.userMessage
+    candidate_id = session["candidate_id"]
+    started = time.perf_counter()
+
+    if user_message == "QUIZ_COMPLETED":
+        session["stage"] = "ending"
+        starting_history = history_window(request.sessionId, "starting", session["starting_conversation"])
+        agent_stream = ending_agent_stream(llm, starting_history, "", candidate_id)
+    elif not user_message or user_message == "INTERVIEW_STARTED" or stage not in STAGE_TRANSITIONS:
+        # LLM çağrısı gerektirmeyen mesajlar tek olayla yanıtlanır
+        with CHAT_TURN_SECONDS.time(endpoint=endpoint, stage=stage), metered() as meter:
+            result = await chat_turn(request, session)
+        observe_turn(stage, meter, time.perf_counter() - started)
+        if result["response"]:
+            yield "token", {"text": result["response"]}
+        yield "done", result
+        return
+    elif stage in ("starting", "ending") and budget_exhausted(session):
+        agent_stream = local_stream(token_ceiling_reply(session, stage))
+    elif stage == "starting":
+        history = history_window(request.sessionId, "full", session["full_conversation"])
+        agent_stream = starting_agent_stream(llm, history, user_message, candidate_id)
+    elif stage == "interview":
+        history = history_window(request.sessionId, "full", session["full_conversation"])
+        agent_stream = interview_agent_stream(llm, history, user_message, candidate_id)
+    else:
+        ending_history = history_window(request.sessionId, "ending", session["starting_conversation"], session["ending_conversation"])
+        agent_stream = ending_agent_stream(llm, ending_history, user_message, candidate_id)
+
+    marker_filter = MarkerFilter()
+    with metered() as meter:
+        async for chunk in agent_stream:
+            text = marker_filter.feed(chunk)
+            if text:
+                yield "token", {"text": text}
+        text = marker_filter.flush()
+        if text:
+            yield "token", {"text": text}
+
+        response_text = marker_filter.text
+        action = None
+        records = []
+        if user_message == "QUIZ_COMPLETED":
+            if response_text:
+                records.append(add_message(session, "ending", "assistant", response_text, "ending_conversation"))
+        else:
+            marker, stage_action, next_stage = STAGE_TRANSITIONS[stage]
+            if marker in marker_filter.found:
+                action = stage_action
+                if next_stage:
+                    session["stage"] = next_stage
+
+        records += record_turn(session, stage, user_message, response_text)
+        await save_turn(request.sessionId, session, stage, records)
+    CHAT_TURN_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint, stage=stage)
+    observe_turn(stage, meter, time.perf_counter() - started)
+    yield "done", turn_response(request, session, stage, response_text, action)
+
+@app.post('/api/chat/stream')
+async def handle_chat_stream(request: ChatRequest):
+    """/api/chat'in Server-Sent Events versiyonu (olaylar için chat_events)"""
+    session = await get_session(request.sessionId)
+    await admit_turn(request.sessionId, session)
+
+    async def event_stream():
+        try:
+            async for event, data in chat_events(request, session, "stream"):
+                yield sse_event(event, data)
+        except Exception as e:
+            # Yanıt başlıkları gönderildiği için hata durum koduyla değil olay olarak iletilir
+            logger.exception("❌ SSE sohbet turu başarısız: %s", request.sessionId)
+            yield sse_event("error", {"status": 500, "detail": str(e)})
 
-    conversation_to_send = session["starting_conversation"] + session["ending_conversation"] if stage == "ending" or user_message == "QUIZ_COMPLETED" else session["full_conversation"]
-    return {"response": response_text, "action": action, "conversation_history": conversation_to_send}
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.websocket('/api/chat/ws/{session_id}')
+async def chat_socket(websocket: WebSocket, session_id: str):
+    """
+    Tur başına POST yerine mülakat boyunca açık kalan kanal.
+    İstemci her tur için {"userMessage", "lastSeq"} gönderir; sunucu chat_events olaylarını
+    {"event": "token" | "done" | "error", ...} mesajları olarak iletir. Turlar bağlantı başına sırayla işlenir.
+    """
+    try:
+        await resolve_session(session_id)
+    except HTTPException:
+        await websocket.close(code=4404)
+        return
+    await websocket.accept()
+    try:
+        while True:
+            frame = await websocket.receive_text()
+            try:
+                message = json.loads(frame)
+                request = ChatRequest(sessionId=session_id, userMessage=message.get("userMessage", ""), lastSeq=message.get("lastSeq"))
+            except (ValueError, ValidationError, AttributeError) as e:
+                await websocket.send_json({"event": "error", "detail": f"Geçersiz mesaj: {e}"})
+                continue
+            session = await get_session(session_id)
+            try:
+                await admit_turn(session_id, session)
+            except HTTPException as e:
+                await websocket.send_json({"event": "error", "status": e.status_code, "detail": e.detail})
+                continue
+            try:
+                async for event, data in chat_events(request, session, "ws"):
+                    await websocket.send_json({"event": event, **data})
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                # Agent/depolama hatası sadece bu turu düşürür; bağlantı sonraki tur için açık kalır
+                logger.exception("❌ WebSocket sohbet turu başarısız: %s", session_id)
+                await websocket.send_json({"event": "error", "status": 500, "detail": str(e)})
+    except WebSocketDisconnect:
+        logger.debug("🔌 Sohbet WebSocket bağlantısı kapandı: %s", session_id)
 
 @app.post('/api/save-transcript')
 async def save_transcript(request: ChatRequest):
-    session = sessions.get(request.sessionId)
+    """
+    Mülakatı kapatır. Turlar zaten journal'a yazıldığı için burada sadece arşivlenir;
+    interview_transcript görünümü okunurken journal/arşivden üretilir.
+    """
+    session = session_store.get(request.sessionId)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
+    bind_context(session_id=request.sessionId, candidate_id=session.get('candidate_id'))
     
     candidate_id = session.get('candidate_id')
     job_id = session.get('job_id')
     
-    transcript_data = {
-        "session_id": request.sessionId,
-        "timestamp": datetime.now().isoformat(),
-        "starting_conversation": session.get("starting_conversation", []),
-        "ending_conversation": session.get("ending_conversation", []),
-        "full_conversation": session.get("full_conversation", [])
-    }
-    
-    file_manager.writer.save_candidate_data(job_id, candidate_id, "interview_transcript", transcript_data)
+    await file_manager.async_writer.archive_transcript(job_id, candidate_id)
     
-    del sessions[request.sessionId]
+    session_store.delete(request.sessionId)
+    conversation_buffers.drop(request.sessionId)
     return {"status": "success"}
 
 @app.post('/api/agents/quiz')
 async def handle_quiz_agent_route(request: ChatRequest):
-    session = get_session(request.sessionId)
+    session = await get_session(request.sessionId)
     job_id = session.get('job_id')
     
-    print(f"🔍 Quiz istendi - SessionId: {request.sessionId}, JobId: {job_id}")
+    logger.debug("🔍 Quiz istendi - JobId: %s", job_id)
     
-    # Her seferinde yeni quiz oluştur (cache'i kaldır)
-    qna_data = file_manager.reader.get_qna_data(job_id)
-    job_data = file_manager.reader.get_job_ad_data(job_id)
+    # Aynı session'a (App.tsx ön yüklemesi + Quiz.tsx) hep aynı quiz verilir
+    if session.get("quiz"):
+        return session["quiz"]
     
-    print(f"💼 İş ilanı: {job_data.get('position', 'Bilinmiyor')}")
-    print(f"📝 Q&A veri sayısı: {len(qna_data) if isinstance(qna_data, list) else 'Dict'}")
+    try:
+        quiz_data = await quiz_pool.get_for_session(request.sessionId, job_id)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     
-    quiz_data = await quiz_agent(client, qna_data, job_data)
+    session["quiz"] = quiz_data
+    session_store.save(request.sessionId, session)
     
-    print(f"✅ Quiz oluşturuldu - İlk soru: {quiz_data[0].get('question', 'Soru yok') if quiz_data else 'Quiz boş'}")
+    logger.debug("✅ Quiz atandı - İlk soru: %s", payload(quiz_data[0].get('question', 'Soru yok') if quiz_data else 'Quiz boş'))
     
     return quiz_data
 
+@app.post('/api/agents/quiz/stream')
+async def handle_quiz_stream(request: ChatRequest):
+    """
+    /api/agents/quiz'in Server-Sent Events versiyonu.
+    Her geçerli soru hazır olur olmaz "question" olayı ({index, question}) ile gönderilir;
+    quiz tamamlanınca "done" ({total}), üretilemezse "error" ({detail}) gelir.
+    Aynı session'ın eşzamanlı istekleri (ön yükleme + Quiz.tsx) aynı soruları alır.
+    """
+    session = await get_session(request.sessionId)
+    job_id = session.get('job_id')
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+    if session.get("quiz"):
+        quiz_data = session["quiz"]
+        async def assigned():
+            for index, question in enumerate(quiz_data):
+                yield sse_event("question", {"index": index, "question": question})
+            yield sse_event("done", {"total": len(quiz_data)})
+        return StreamingResponse(assigned(), media_type="text/event-stream", headers=headers)
+
+    delivery = quiz_pool.deliver(request.sessionId, job_id)
+
+    async def event_stream():
+        index = 0
+        try:
+            async for question in delivery.follow():
+                yield sse_event("question", {"index": index, "question": question})
+                index += 1
+        except RuntimeError as e:
+            yield sse_event("error", {"detail": str(e)})
+            return
+        # Aynı teslimatı izleyen diğer istek session'ı zaten kaydetmiş olabilir
+        current = await get_session(request.sessionId)
+        if not current.get("quiz"):
+            current["quiz"] = list(delivery.questions)
+            session_store.save(request.sessionId, current)
+        yield sse_event("done", {"total": index})
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=headers)
+
+# Toplu yükleme checkpoint'leri (GENAR dışında tutulur, ilan klasörü sanılmasın)
+INGEST_STATE_DIR = os.getenv("INGEST_STATE_DIR", "ingest_state")
+_INGEST_ID = re.compile(r"^[A-Za-z0-9_.-]{1,64}$")
+
+@app.post('/api/candidates/bulk')
+async def bulk_ingest_candidates(request: Request, ingest_id: str, job_id: str = None, batch_size: int = INGEST_BATCH_SIZE):
+    """
+    JSONL/NDJSON gövdesindeki CV'lerden toplu aday oluşturur; gövde stream olarak okunur.
+    ingest_id istemci tarafından verilir (zorunlu): bağlantı yarıda koparsa istemci aynı ingest_id ile
+    aynı dosyayı tekrar göndererek kaldığı yerden devam ettirir.
+    """
+    if not _INGEST_ID.match(ingest_id):
+        raise HTTPException(status_code=400, detail="Geçersiz ingest_id")
+    os.makedirs(INGEST_STATE_DIR, exist_ok=True)
+    try:
+        ingestor = CandidateIngestor(
+            file_manager, ingest_id, os.path.join(INGEST_STATE_DIR, f"{ingest_id}.checkpoint.json"),
+            default_job_id=job_id, batch_size=batch_size
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        complete, newline, buffer = buffer.rpartition(b"\n")
+        if newline:
+            # Yazmalar thread'de yapılır; event loop canlı sohbetlere hizmet etmeye devam eder
+            await asyncio.to_thread(ingestor.feed_many, complete.decode("utf-8", errors="replace").split("\n"))
+    if buffer:
+        await asyncio.to_thread(ingestor.feed, buffer.decode("utf-8", errors="replace"))
+    return await asyncio.to_thread(ingestor.finish)
+
+@app.post('/api/admission/{session_id}')
+async def admission_check(session_id: str):
+    """
+    Bekleme odasının periyodik sorgusu (poll_seconds aralıkla): session sıraya girer ya da yerini korur.
+    Yanıt: admitted, position (1 = sıradaki), eta_seconds, ayrıca aktif/kuyruk/kapasite sayıları.
+    Starting aşamasını geçmiş session'lar her zaman kabul edilmiş sayılır.
+    """
+    session = await get_session(session_id)
+    if session["stage"] != "starting":
+        return {"admitted": True, "position": 0, "eta_seconds": 0, "stage": session["stage"]}
+    return {**await admission_status(session_id, session), "stage": session["stage"]}
+
+@app.get('/api/admission/stats')
+async def admission_stats():
+    """Kapasite modeli (ölçülen çağrı ve turlar arası süreler) ve kuyruk sayaçları"""
+    return admission.stats()
+
+@app.get('/api/greetings/stats')
+async def greeting_stats():
+    """Karşılama ön üretim zamanlayıcısının sayaçları"""
+    return greeting_scheduler.stats()
+
+@metrics_registry.on_collect
+def collect_runtime_metrics():
+    """Diğer bileşenlerin kendi tuttuğu sayaçları scrape anında metriklere yansıtır"""
+    ACTIVE_SESSIONS.clear()
+    for stage, count in session_store.stage_counts().items():
+        ACTIVE_SESSIONS.set(count, stage=stage)
+
+    cache_stats = file_manager.get_cache_stats()
+    CACHE_REQUESTS.set_total(cache_stats["hits"], cache="json_file", result="hit")
+    CACHE_REQUESTS.set_total(cache_stats["misses"], cache="json_file", result="miss")
+    pool_stats = quiz_pool.stats()
+    CACHE_REQUESTS.set_total(pool_stats["served_from_pool"], cache="quiz_pool", result="hit")
+    CACHE_REQUESTS.set_total(pool_stats["generated_on_demand"], cache="quiz_pool", result="miss")
+
+    LOG_RECORDS_DROPPED.set_total(dropped_records())
+
+    queue_stats = admission.stats()
+    ADMISSION_SESSIONS.set(queue_stats["active"], state="active")
+    ADMISSION_SESSIONS.set(queue_stats["queued"], state="queued")
+    ADMISSION_CAPACITY.set(queue_stats["capacity"])
+
+    gateway_stats = llm.stats()
+    for priority in ("chat", "background"):
+        LLM_SLOTS_ACTIVE.set(gateway_stats["active"][priority], priority=priority)
+        LLM_SLOTS_WAITING.set(gateway_stats["waiting"][priority], priority=priority)
+
+@app.get('/api/metrics')
+async def metrics():
+    """Prometheus text formatında gecikme, token, cache ve session metrikleri"""
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get('/api/llm/stats')
+async def llm_stats():
+    """LLM gateway'in slot, kuyruk ve tekrar deneme sayaçları"""
+    return llm.stats()
+
+@app.get('/api/quiz-pool/stats')
+async def quiz_pool_stats():
+    """Quiz havuzlarının doluluk ve üretim sayaçları"""
+    return quiz_pool.stats()
+
+@app.post('/api/quiz-pool/{job_id}/refill')
+async def refill_quiz_pool(job_id: str):
+    """İlanın quiz havuzunu arka planda hedef derinliğe tamamlar"""
+    if not file_manager.job_exists(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    quiz_pool.schedule_refill(job_id)
+    return {"status": "scheduled", "job_id": job_id}
+
 class QuizResultsRequest(BaseModel):
     sessionId: str
     score: int
     totalQuestions: int
     results: list
 
+@app.get('/api/analytics/quiz/{job_id}')
+async def quiz_analytics_summary(job_id: str):
+    """İlanın skor dağılımı ve soru bazında doğru oranları (agregadan, aday sayısından bağımsız)"""
+    if not file_manager.job_exists(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return await quiz_analytics.summary(job_id)
+
+@app.get('/api/jobs/{job_id}/ranking')
+async def job_ranking(job_id: str, top: int = RANKING_TOP_N):
+    """İlanın adaylarını CV-ilan uygunluğuna göre sıralar, ilk `top` adayı döndürür"""
+    if not file_manager.job_exists(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return await file_manager.run_io(candidate_ranking.top, job_id, max(1, min(top, 1000)))
+
 @app.post('/api/save-quiz-results')
 async def save_quiz_results(request: QuizResultsRequest):
     try:
-        session = sessions.get(request.sessionId)
+        session = session_store.get(request.sessionId)
         if session:
             candidate_id = session.get('candidate_id')
             job_id = session.get('job_id')
+            bind_context(session_id=request.sessionId, candidate_id=candidate_id)
             
             quiz_data = {
                 "session_id": request.sessionId,
@@ -232,7 +763,8 @@ async def save_quiz_results(request: QuizResultsRequest):
                 "results": request.results
             }
             
-            file_manager.writer.save_candidate_data(job_id, candidate_id, "quiz_results", quiz_data)
+            # Sonuç kaydı ve agrega güncellemesi ilanın kilidi altında (tekrar gönderimde eski katkı çıkarılır)
+            await quiz_analytics.record(job_id, candidate_id, quiz_data)
         
         return {"status": "success"}
     except Exception as e:
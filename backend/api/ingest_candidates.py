@@ -0,0 +1,51 @@
+"""
+JSONL/NDJSON CV dosyasından toplu aday oluşturur.
+
+Her satır doğrudan bir CV (cv_extraction.json formatında, ilan --job-id ile verilir)
+veya {"job_id": "Genar-00001", "cv": {...}} olabilir.
+
+Çalıştırma:
+    python ingest_candidates.py basvurular.jsonl --job-id Genar-00001
+Yarıda kalırsa aynı komut tekrar çalıştırılır; <dosya>.checkpoint.json'daki satırdan devam edilir.
+"""
+import os
+import json
+import time
+import argparse
+
+from dotenv import load_dotenv
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+load_dotenv(os.path.join(base_dir, '.env'))
+
+from utils.file_manager import create_file_manager
+from utils.candidate_ingest import ingest_file, INGEST_BATCH_SIZE
+from utils.logging_setup import setup_logging
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSONL CV dosyasından toplu aday oluşturur")
+    parser.add_argument("path", help="JSONL/NDJSON dosyası")
+    parser.add_argument("--job-id", help="Satırda job_id yoksa kullanılacak ilan (örn. Genar-00001)")
+    parser.add_argument("--data-path", default=os.getenv("DATA_PATH", "../../GENAR"))
+    parser.add_argument("--ingest-id", help="Yükleme kimliği; aday ID'leri bundan türetilir (varsayılan: dosya adı)")
+    parser.add_argument("--checkpoint", help="Checkpoint dosyası (varsayılan: <dosya>.checkpoint.json)")
+    parser.add_argument("--batch-size", type=int, default=INGEST_BATCH_SIZE)
+    args = parser.parse_args()
+
+    setup_logging()
+    started = time.perf_counter()
+    summary = ingest_file(
+        create_file_manager(args.data_path), args.path,
+        ingest_id=args.ingest_id, default_job_id=args.job_id,
+        checkpoint_path=args.checkpoint, batch_size=args.batch_size
+    )
+    elapsed = time.perf_counter() - started
+    processed = summary["lines"] - summary["resumed_from"]
+    summary["seconds"] = round(elapsed, 2)
+    summary["lines_per_second"] = round(processed / elapsed, 1) if elapsed else None
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
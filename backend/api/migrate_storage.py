@@ -0,0 +1,143 @@
+"""
+GENAR klasör ağacı ile SQLite depolama arasında veri taşır.
+
+Çalıştırma:
+    python migrate_storage.py import --data-path ../../GENAR --db genar.db
+    python migrate_storage.py export --db genar.db --data-path ../../GENAR_export
+
+Import, Interview_list journal'ını birleşik haliyle alır. Export, her ilanın Interview_list.json'unu
+tek dosya olarak yazar (hedefte eski bir journal varsa silinir).
+"""
+import os
+import json
+import time
+import argparse
+
+from dotenv import load_dotenv
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+load_dotenv(os.path.join(base_dir, '.env'))
+
+from utils.file_manager import FileManager
+from utils.sqlite_storage import SQLiteFileManager, INTERVIEW_LIST
+from utils.candidate_journal import JOURNAL_FILE
+from utils.transcript_journal import TRANSCRIPT_JOURNAL_FILE
+
+
+def _json_files(folder: str):
+    """Klasördeki (gizli olmayan) .json dosyalarının adları, uzantısız"""
+    return sorted(
+        name[:-5] for name in os.listdir(folder)
+        if name.endswith(".json") and not name.startswith(".") and os.path.isfile(os.path.join(folder, name))
+    )
+
+
+def _load(path: str):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def import_tree(data_path: str, db_path: str):
+    """DATA_PATH ağacını SQLite'a aktarır; aynı dokümanlar tekrar aktarılırsa üzerine yazılır"""
+    files = FileManager(base_dir=data_path)
+    db = SQLiteFileManager(db_path, base_dir=data_path)
+    counts = {"root": 0, "job": 0, "candidate": 0, "candidates_indexed": 0, "transcripts": 0, "skipped": 0}
+
+    for data_type in _json_files(data_path):
+        db.save_root_data(data_type, _load(os.path.join(data_path, f"{data_type}.json")))
+        counts["root"] += 1
+
+    for job_id in files.list_job_ids():
+        job_folder = os.path.join(data_path, job_id)
+        for data_type in _json_files(job_folder):
+            if data_type == INTERVIEW_LIST:
+                continue
+            db.save_job_data(job_id, data_type, _load(os.path.join(job_folder, f"{data_type}.json")))
+            counts["job"] += 1
+
+        # Interview_list base dosyası + journal birleşik olarak aktarılır
+        interview_list = files.get_interview_list_data(job_id)
+        db.save_job_data(job_id, INTERVIEW_LIST, interview_list)
+        counts["candidates_indexed"] += len(interview_list.get("candidates", []))
+
+        for candidate_id in sorted(os.listdir(job_folder)):
+            candidate_folder = os.path.join(job_folder, candidate_id)
+            if candidate_id.startswith(".") or not os.path.isdir(candidate_folder):
+                continue
+            for data_type in _json_files(candidate_folder):
+                try:
+                    data = _load(os.path.join(candidate_folder, f"{data_type}.json"))
+                except json.JSONDecodeError as e:
+                    print(f"⚠️ Atlandı (bozuk JSON): {candidate_id}/{data_type}.json - {e}")
+                    counts["skipped"] += 1
+                    continue
+                db.save_candidate_data(job_id, candidate_id, data_type, data)
+                counts["candidate"] += 1
+            _copy_transcript(files, db, job_id, candidate_id,
+                             still_open=os.path.exists(os.path.join(candidate_folder, TRANSCRIPT_JOURNAL_FILE)), counts=counts)
+    return counts
+
+
+def _copy_transcript(source, target, job_id: str, candidate_id: str, still_open: bool, counts: dict):
+    """Transcript kayıtlarını taşır; kaynakta mülakat kapanmışsa hedefte de arşivlenir"""
+    records = source.get_transcript_records(candidate_id)
+    if not records:
+        return
+    target.append_transcript(job_id, candidate_id, records)
+    if not still_open:
+        target.archive_transcript(job_id, candidate_id)
+    counts["transcripts"] += 1
+
+
+def export_tree(db_path: str, data_path: str):
+    """SQLite'taki tüm dokümanları DATA_PATH ağacına yazar"""
+    db = SQLiteFileManager(db_path, base_dir=data_path)
+    files = FileManager(base_dir=data_path)
+    counts = {"root": 0, "job": 0, "candidate": 0, "transcripts": 0}
+
+    for job_id, candidate_id, data_type, data in db.iter_documents():
+        if not job_id:
+            files.save_root_data(data_type, data)
+            counts["root"] += 1
+        elif candidate_id:
+            files.save_candidate_data(job_id, candidate_id, data_type, data)
+            counts["candidate"] += 1
+        elif data_type != INTERVIEW_LIST:
+            files.save_job_data(job_id, data_type, data)
+            counts["job"] += 1
+
+    for job_id, candidate_id, still_open in db.transcript_candidate_ids():
+        candidate_folder = os.path.join(data_path, job_id, candidate_id)
+        # Hedefteki eski journal/arşiv üzerine eklenmesin
+        for name in os.listdir(candidate_folder) if os.path.isdir(candidate_folder) else ():
+            if name.startswith("transcript."):
+                os.remove(os.path.join(candidate_folder, name))
+        _copy_transcript(db, files, job_id, candidate_id, still_open, counts)
+
+    for job_id in db.list_job_ids():
+        journal_path = os.path.join(data_path, job_id, JOURNAL_FILE)
+        if os.path.exists(journal_path):
+            os.remove(journal_path)
+        files.save_job_data(job_id, INTERVIEW_LIST, db.get_interview_list_data(job_id))
+        counts["job"] += 1
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GENAR klasör ağacı <-> SQLite depolama")
+    parser.add_argument("direction", choices=["import", "export"])
+    parser.add_argument("--data-path", default=os.getenv("DATA_PATH", "../../GENAR"))
+    parser.add_argument("--db", default=os.getenv("STORAGE_DB_PATH", "genar.db"))
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.direction == "import":
+        counts = import_tree(args.data_path, args.db)
+    else:
+        counts = export_tree(args.db, args.data_path)
+    counts["seconds"] = round(time.perf_counter() - started, 2)
+    print(json.dumps(counts, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
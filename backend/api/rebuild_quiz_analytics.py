@@ -0,0 +1,45 @@
+"""
+İlanların quiz analitiğini (Quiz_analytics) adayların quiz_results kayıtlarından baştan oluşturur.
+Analitik eklenmeden önce kaydedilmiş sonuçlar için (backfill) ya da agrega bozulduğunda kullanılır.
+
+Çalıştırma:
+    python rebuild_quiz_analytics.py                 # tüm ilanlar
+    python rebuild_quiz_analytics.py --job-id Genar-00001
+"""
+import os
+import json
+import time
+import argparse
+
+from dotenv import load_dotenv
+
+base_dir = os.path.dirname(os.path.abspath(__file__))
+load_dotenv(os.path.join(base_dir, '.env'))
+
+from utils.file_manager import create_file_manager
+from utils.quiz_analytics import QuizAnalytics
+from utils.logging_setup import setup_logging
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quiz analitiğini quiz_results kayıtlarından yeniden oluşturur")
+    parser.add_argument("--job-id", help="Sadece bu ilan (varsayılan: tüm ilanlar)")
+    parser.add_argument("--data-path", default=os.getenv("DATA_PATH", "../../GENAR"))
+    args = parser.parse_args()
+
+    setup_logging()
+    file_manager = create_file_manager(args.data_path)
+    analytics = QuizAnalytics(file_manager)
+    job_ids = [args.job_id] if args.job_id else file_manager.list_job_ids()
+
+    started = time.perf_counter()
+    report = {}
+    for job_id in job_ids:
+        summary = analytics.rebuild(job_id)
+        report[job_id] = {"candidates": summary["candidates"], "mean_percentage": summary["mean_percentage"]}
+    report["seconds"] = round(time.perf_counter() - started, 2)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
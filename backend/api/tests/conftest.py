@@ -0,0 +1,86 @@
+import os
+import sys
+import json
+import types
+import shutil
+import asyncio
+import itertools
+
+import pytest
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GENAR_DIR = os.path.join(API_DIR, "..", "..", "GENAR")
+sys.path.insert(0, API_DIR)
+
+# Testler gerçek Groq'a gitmez; app modülü import edilirken anahtar zorunlu
+os.environ.setdefault("GROQ_API_KEY", "test")
+
+# Örnek verideki adaydan kopyalanan test adayları (her test yeni bir session alır)
+TEMPLATE_CANDIDATE = "Genar-00001-00001"
+TEST_CANDIDATES = 20
+
+
+class FakeCompletions:
+    """Groq chat.completions yerine geçer; yanıt metni ve gecikme testten ayarlanır"""
+
+    def __init__(self):
+        self.text = "Harika! O zaman mülakatın bir sonraki bölümüne geçelim. START_INTERVIEW"
+        self.delay = 0.02
+        self.calls = []
+
+    async def create(self, messages, stream=False, **params):
+        self.calls.append(messages)
+        await asyncio.sleep(self.delay)
+        text = self.text
+        if "personality quiz" in str(messages):
+            text = json.dumps({"questions": [
+                {"question": f"Soru {i}", "options": ["a", "b", "c", "d"], "correct_answer": "B", "time": 60}
+                for i in range(10)
+            ]})
+        if stream:
+            return self._stream(text)
+        message = types.SimpleNamespace(content=text)
+        usage = types.SimpleNamespace(prompt_tokens=100, completion_tokens=20, total_tokens=120)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message, finish_reason="stop")], usage=usage)
+
+    async def _stream(self, text):
+        for start in range(0, len(text), 8):
+            delta = types.SimpleNamespace(content=text[start:start + 8])
+            yield types.SimpleNamespace(choices=[types.SimpleNamespace(delta=delta, finish_reason=None)])
+
+
+@pytest.fixture(scope="session")
+def data_dir(tmp_path_factory):
+    """Örnek GENAR verisinin kopyası; testler repodaki dosyalara yazmaz"""
+    root = tmp_path_factory.mktemp("data") / "GENAR"
+    shutil.copytree(GENAR_DIR, root)
+    job_dir = root / "Genar-00001"
+    for index in range(TEST_CANDIDATES):
+        shutil.copytree(job_dir / TEMPLATE_CANDIDATE, job_dir / f"Genar-00001-{index + 100:05d}")
+    return root
+
+
+@pytest.fixture(scope="session")
+def api(data_dir):
+    """app modülü sahte LLM istemcisiyle"""
+    os.environ["DATA_PATH"] = str(data_dir)
+    import app
+    app.llm.client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=FakeCompletions()))
+    return app
+
+
+@pytest.fixture(scope="session")
+def client(api):
+    from fastapi.testclient import TestClient
+    return TestClient(api.app)
+
+
+_candidates = itertools.count(100)
+
+
+@pytest.fixture
+def candidate_id(api):
+    """Bu test için kullanılmamış bir aday (session) ID'si"""
+    index = next(_candidates)
+    assert index < 100 + TEST_CANDIDATES, "TEST_CANDIDATES artırılmalı"
+    return f"Genar-00001-{index:05d}"
@@ -0,0 +1,157 @@
+import types
+import asyncio
+
+import pytest
+
+from utils import admission as admission_module
+from utils.admission import AdmissionController, MeetingTimes, ADMISSION_CALL_SECONDS, ADMISSION_QUEUE_TTL
+
+
+class _Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(admission_module.time, "time", clock)
+    return clock
+
+
+def test_capacity_follows_measured_call_and_gap_times():
+    controller = AdmissionController(slots=4, max_active=0, utilization=0.5)
+    controller.call_seconds.observe(2.0)
+    controller.turn_gap.observe(20.0)
+    assert controller.capacity() == 20  # 4 * 0.5 * 20 / 2
+
+    controller.call_seconds.observe(12.0)
+    assert controller.capacity() == 10  # ortalama 2 + 0.2 * 10 = 4 sn -> 4 * 0.5 * 20 / 4
+    assert AdmissionController(slots=4, max_active=3).capacity() == 3
+
+
+def test_queue_is_ordered_by_meeting_time_then_arrival(clock):
+    controller = AdmissionController(slots=1, max_active=1)
+    assert controller.join("a")["admitted"]
+
+    controller.join("late-meeting", meeting_at=clock.now + 600)
+    controller.join("no-meeting")
+    clock.now += 1
+    controller.join("second-arrival")
+    controller.join("past-meeting", meeting_at=clock.now - 3600)
+
+    positions = {sid: controller.join(sid)["position"] for sid in
+                 ("no-meeting", "second-arrival", "past-meeting", "late-meeting")}
+    # Randevusu geçmiş aday geliş anıyla sıralanır, erken gelen aday randevusundan önce öne geçemez
+    assert positions == {"no-meeting": 1, "second-arrival": 2, "past-meeting": 3, "late-meeting": 4}
+
+
+def test_release_admits_next_in_line(clock):
+    controller = AdmissionController(slots=1, max_active=1)
+    controller.join("a")
+    controller.join("b")
+    controller.join("c")
+
+    clock.now += 10
+    controller.release("a")
+
+    assert controller.is_admitted("b")
+    assert controller.join("c")["position"] == 1
+    assert controller.stats()["avg_wait_seconds"] == pytest.approx(0.2 * 10, abs=0.1)
+
+
+def test_queued_session_that_stops_polling_expires(clock, monkeypatch):
+    monkeypatch.setattr(admission_module, "ADMISSION_CLAIM_SECONDS", 3600)
+    controller = AdmissionController(slots=1, max_active=1)
+    controller.join("a")
+    controller.join("left")
+    controller.join("waiting")
+
+    clock.now += ADMISSION_QUEUE_TTL / 2
+    controller.join("waiting")
+    clock.now += ADMISSION_QUEUE_TTL / 2 + 1
+    status = controller.join("waiting")
+
+    assert status["position"] == 1
+    assert status["queued"] == 1
+    assert controller.stats()["expired"] == 1
+
+
+def test_admitted_session_that_never_starts_loses_its_slot(clock, monkeypatch):
+    monkeypatch.setattr(admission_module, "ADMISSION_CLAIM_SECONDS", 30)
+    monkeypatch.setattr(admission_module, "ADMISSION_IDLE_SECONDS", 300)
+    controller = AdmissionController(slots=1, max_active=2)
+    controller.join("idle")
+    controller.join("active")
+    controller.turn_started("active")
+    controller.join("waiting")
+
+    clock.now += 31
+    controller.turn_started("active")
+    status = controller.join("waiting")
+
+    assert status["admitted"]
+    assert not controller.is_admitted("idle")
+    assert controller.is_admitted("active")
+
+
+def test_turn_gaps_are_measured_between_turns(clock):
+    controller = AdmissionController(slots=1)
+    controller.join("a")
+    controller.turn_started("a")
+    clock.now += 12
+    controller.turn_started("a")
+
+    assert controller.turn_gap.value == 12
+    controller.turn_started("not-admitted")
+    assert controller.turn_gap.samples == 1
+
+
+def test_starting_turn_with_llm_call_updates_call_seconds(api, client, candidate_id):
+    samples = api.admission.call_seconds.samples
+    assert client.post(f"/api/admission/{candidate_id}").json()["admitted"]
+
+    response = client.post("/api/chat", json={"sessionId": candidate_id, "userMessage": "Hazırım, başlayalım"})
+
+    assert response.status_code == 200
+    assert api.admission.call_seconds.samples == samples + 1
+    assert client.get("/api/admission/stats").json()["call_seconds"] != ADMISSION_CALL_SECONDS
+
+
+def test_streamed_starting_turn_updates_call_seconds(api, client, candidate_id):
+    samples = api.admission.call_seconds.samples
+    assert client.post(f"/api/admission/{candidate_id}").json()["admitted"]
+
+    with client.stream("POST", "/api/chat/stream", json={"sessionId": candidate_id, "userMessage": "Hazırım"}) as response:
+        assert response.status_code == 200
+        body = "".join(response.iter_text())
+
+    assert "event: done" in body
+    assert api.admission.call_seconds.samples == samples + 1
+
+
+class _EntryReader:
+    """Sadece aday kaydı okumasını destekler; tüm listeyi okumaya çalışan kod AttributeError alır"""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.reads = 0
+
+    async def get_interview_entry(self, job_id, candidate_id):
+        self.reads += 1
+        return self.entries.get(candidate_id, {})
+
+
+def test_meeting_times_reads_only_the_candidate_entry():
+    reader = _EntryReader({"Genar-00001-00001": {"meeting_scheduled": "2024-11-14T10:00:00.000Z"}})
+    meeting_times = MeetingTimes(types.SimpleNamespace(async_reader=reader))
+
+    assert asyncio.run(meeting_times.get("Genar-00001", "Genar-00001-00001")) == 1731578400.0
+    assert asyncio.run(meeting_times.get("Genar-00001", "Genar-00001-00002")) is None
+
+    reader.entries["Genar-00001-00001"]["meeting_scheduled"] = "2024-11-14T11:00:00.000Z"
+    assert asyncio.run(meeting_times.get("Genar-00001", "Genar-00001-00001")) == 1731582000.0
+    assert reader.reads == 3
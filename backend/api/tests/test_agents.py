@@ -0,0 +1,60 @@
+import types
+import asyncio
+
+from agents import starting_agent, ending_agent
+
+
+class _Reader:
+    """Adayı ID önekinden farklı bir ilana bağlayan katalog"""
+
+    def __init__(self, jobs):
+        self.jobs = jobs
+        self.requested_jobs = []
+
+    async def resolve_candidate(self, candidate_id):
+        return self.jobs.get(candidate_id)
+
+    async def get_cv_data(self, candidate_id):
+        return {"name": "Ayşe"}
+
+    async def get_job_ad_data(self, job_id):
+        self.requested_jobs.append(job_id)
+        return {"position": "Analist"}
+
+    async def get_qna_data(self, job_id):
+        self.requested_jobs.append(job_id)
+        return [{"soru": "Maaş aralığı nedir?", "cevap": "40.000 TL"}]
+
+
+def _file_manager(reader):
+    return types.SimpleNamespace(async_reader=reader)
+
+
+def test_starting_agent_uses_the_catalog_job(monkeypatch):
+    reader = _Reader({"Genar-00001-00042": "Genar-00002"})
+    monkeypatch.setattr(starting_agent, "get_file_manager", lambda: _file_manager(reader))
+
+    job_id, cv_data, job_ad_data, error = asyncio.run(starting_agent._load_context("Genar-00001-00042"))
+
+    assert (job_id, error) == ("Genar-00002", None)
+    assert reader.requested_jobs == ["Genar-00002"]
+
+
+def test_starting_agent_reports_unknown_candidate(monkeypatch):
+    reader = _Reader({})
+    monkeypatch.setattr(starting_agent, "get_file_manager", lambda: _file_manager(reader))
+
+    *_, error = asyncio.run(starting_agent._load_context("Genar-00001-00042"))
+
+    assert error["is_complete"]
+    assert reader.requested_jobs == []
+
+
+def test_ending_agent_indexes_the_catalog_job(monkeypatch):
+    reader = _Reader({"Genar-00001-00042": "Genar-00002"})
+    monkeypatch.setattr(ending_agent, "get_file_manager", lambda: _file_manager(reader))
+
+    index = asyncio.run(ending_agent._load_qna_index("Genar-00001-00042"))
+
+    assert reader.requested_jobs == ["Genar-00002"]
+    assert index.search("maaş")[0]["cevap"] == "40.000 TL"
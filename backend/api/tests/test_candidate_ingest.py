@@ -0,0 +1,101 @@
+import json
+import shutil
+
+import pytest
+
+from utils.candidate_ingest import CandidateIngestor, ingest_candidate_id, parse_record
+from utils.catalog import is_job_id
+from utils.file_manager import FileManager
+from utils.json_cache import JsonCache
+
+JOB_ID = "Genar-00001"
+
+
+def _line(name: str, job_id: str = JOB_ID) -> str:
+    return json.dumps({"job_id": job_id, "cv": {"name": name, "personal_info": {"email": f"{name}@example.com"}}})
+
+
+LINES = [
+    _line("aday1"),
+    _line("aday2"),
+    "{bozuk",
+    _line("aday4"),
+    _line("aday5", job_id="../x-y"),
+    _line("aday6"),
+    _line("aday7"),
+    _line("aday8", job_id="Genar-09999"),
+]
+VALID_LINES = [1, 2, 4, 6, 7]
+
+
+@pytest.mark.parametrize("job_id,valid", [
+    ("Genar-00001", True),
+    ("../x-y", False),
+    ("Genar-00001/..", False),
+    ("Genar-00001-00001", False),
+    ("Genar", False),
+    (None, False),
+])
+def test_is_job_id(job_id, valid):
+    assert is_job_id(job_id) is valid
+
+
+def test_parse_record_rejects_path_like_job_id():
+    with pytest.raises(ValueError, match="Geçersiz job_id"):
+        parse_record(_line("aday", job_id="../x-y"))
+
+
+def test_resume_after_crash_mid_batch_does_not_duplicate_candidates(tmp_path, data_dir):
+    root = tmp_path / "GENAR"
+    shutil.copytree(data_dir / JOB_ID, root / JOB_ID, ignore=shutil.ignore_patterns("Genar-00001-001*"))
+    checkpoint = str(tmp_path / "state" / "kampanya.checkpoint.json")
+    (tmp_path / "state").mkdir()
+    before = len(FileManager(base_dir=str(root), cache=JsonCache()).get_interview_list_data(JOB_ID)["candidates"])
+
+    # İlk çalıştırma: ikinci partinin CV'leri ve journal kaydı yazıldıktan sonra, checkpoint'ten önce çöker
+    crashing = FileManager(base_dir=str(root), cache=JsonCache())
+    create = crashing.create_candidate_folders
+    calls = []
+
+    def create_then_crash(job_id, candidates, executor=None):
+        calls.append([candidate_id for candidate_id, _ in candidates])
+        added = create(job_id, candidates, executor)
+        if len(calls) == 2:
+            raise RuntimeError("çökme")
+        return added
+
+    crashing.create_candidate_folders = create_then_crash
+    ingestor = CandidateIngestor(crashing, "kampanya", checkpoint, batch_size=3)
+    with pytest.raises(RuntimeError):
+        ingestor.feed_many(LINES)
+    with open(checkpoint, encoding="utf-8") as f:
+        assert json.load(f)["line"] == 3
+
+    # Devam: aynı ingest_id ile dosyanın tamamı yeniden gönderilir
+    fm = FileManager(base_dir=str(root), cache=JsonCache())
+    resumed = CandidateIngestor(fm, "kampanya", checkpoint, batch_size=3)
+    resumed.feed_many(LINES)
+    summary = resumed.finish()
+
+    expected_ids = [ingest_candidate_id(JOB_ID, "kampanya", line) for line in VALID_LINES]
+    assert summary["resumed_from"] == 3
+    assert summary["ingested"] + summary["existing"] == len(VALID_LINES)
+    # Çökmeden önce journal'a eklenen 2. parti tekrar eklenmez
+    assert summary["existing"] == len(calls[1])
+    assert summary["rejected"] == 3
+
+    with open(root / JOB_ID / "Interview_list.json", encoding="utf-8") as f:
+        stored = [entry["candidate_id"] for entry in json.load(f)["candidates"]]
+    assert len(stored) == len(set(stored)) == before + len(VALID_LINES)
+    assert [candidate_id for candidate_id in stored if candidate_id in expected_ids] == expected_ids
+    assert fm.get_cv_data(expected_ids[-1])["name"] == "aday7"
+
+    with open(resumed.rejected_path, encoding="utf-8") as f:
+        rejected = [json.loads(line) for line in f]
+    assert [r["line"] for r in rejected] == [3, 5, 8]
+
+
+def test_bulk_endpoint_requires_client_chosen_ingest_id(client):
+    response = client.post(f"/api/candidates/bulk?job_id={JOB_ID}", content=_line("aday"))
+
+    assert response.status_code == 422
@@ -0,0 +1,112 @@
+import json
+
+import pytest
+
+from utils import candidate_journal
+from utils.candidate_journal import CandidateJournal, INTERVIEW_LIST_FILE, JOURNAL_FILE
+
+
+def _write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def _entry(index: int, status: str = "pending") -> dict:
+    return {"candidate_id": f"Genar-00001-{index:05d}", "name": f"Aday {index}", "status": status}
+
+
+@pytest.fixture
+def job_folder(tmp_path):
+    _write_json(tmp_path / INTERVIEW_LIST_FILE, {"meeting_link": "https://meet", "candidates": [_entry(1)]})
+    return tmp_path
+
+
+def test_appends_are_merged_with_base_list(job_folder):
+    journal = CandidateJournal(str(job_folder), _write_json)
+    journal.add(_entry(2))
+    journal.update("Genar-00001-00001", {"status": "interviewed"})
+
+    snapshot = journal.snapshot()
+    assert snapshot["meeting_link"] == "https://meet"
+    assert [e["candidate_id"] for e in snapshot["candidates"]] == ["Genar-00001-00001", "Genar-00001-00002"]
+    assert journal.get_entry("Genar-00001-00001")["status"] == "interviewed"
+    assert journal.get_candidate_ids_by_status("pending") == ["Genar-00001-00002"]
+    # Base dosya compaction'a kadar değişmez
+    with open(job_folder / INTERVIEW_LIST_FILE, encoding="utf-8") as f:
+        assert len(json.load(f)["candidates"]) == 1
+
+
+def test_add_many_skips_existing_candidates(job_folder):
+    journal = CandidateJournal(str(job_folder), _write_json)
+
+    assert journal.add_many([_entry(1), _entry(2), _entry(3)], skip_existing=True) == 2
+    assert journal.count() == 3
+
+
+def test_update_of_unknown_candidate_is_ignored(job_folder):
+    journal = CandidateJournal(str(job_folder), _write_json)
+    journal.update("Genar-00001-09999", {"status": "interviewed"})
+
+    assert journal.get_entry("Genar-00001-09999") is None
+    assert journal.count() == 1
+
+
+def test_other_process_appends_are_replayed_from_offset(job_folder):
+    reader = CandidateJournal(str(job_folder), _write_json)
+    assert reader.count() == 1
+
+    writer = CandidateJournal(str(job_folder), _write_json)
+    writer.add(_entry(2))
+    writer.update("Genar-00001-00002", {"status": "interviewed"})
+
+    assert reader.count() == 2
+    assert reader.get_entry("Genar-00001-00002")["status"] == "interviewed"
+
+
+def test_half_written_line_is_applied_once_complete(job_folder):
+    journal = CandidateJournal(str(job_folder), _write_json)
+    line = json.dumps({"op": "add", "entry": _entry(2)})
+    with open(job_folder / JOURNAL_FILE, "a", encoding="utf-8") as f:
+        f.write(line[:10])
+    assert journal.count() == 1
+
+    with open(job_folder / JOURNAL_FILE, "a", encoding="utf-8") as f:
+        f.write(line[10:] + "\n")
+    assert journal.count() == 2
+
+
+def test_compaction_writes_base_and_empties_journal(job_folder):
+    journal = CandidateJournal(str(job_folder), _write_json)
+    journal.add(_entry(2))
+    journal.update("Genar-00001-00001", {"status": "interviewed"})
+    journal.compact()
+
+    with open(job_folder / INTERVIEW_LIST_FILE, encoding="utf-8") as f:
+        base = json.load(f)
+    assert base["meeting_link"] == "https://meet"
+    assert [e["status"] for e in base["candidates"]] == ["interviewed", "pending"]
+    assert (job_folder / JOURNAL_FILE).read_text() == ""
+    assert CandidateJournal(str(job_folder), _write_json).snapshot()["candidates"] == base["candidates"]
+
+
+def test_other_process_compaction_is_detected(job_folder):
+    reader = CandidateJournal(str(job_folder), _write_json)
+    writer = CandidateJournal(str(job_folder), _write_json)
+    writer.add(_entry(2))
+    assert reader.count() == 2
+
+    writer.compact()
+    writer.add(_entry(3))
+
+    assert [e["candidate_id"] for e in reader.snapshot()["candidates"]][-1] == "Genar-00001-00003"
+    assert reader.count() == 3
+
+
+def test_journal_compacts_itself_when_it_outgrows_base(job_folder, monkeypatch):
+    monkeypatch.setattr(candidate_journal, "COMPACT_MIN_RECORDS", 3)
+    journal = CandidateJournal(str(job_folder), _write_json)
+    journal.add_many([_entry(i) for i in range(2, 5)])
+
+    assert (job_folder / JOURNAL_FILE).read_text() == ""
+    with open(job_folder / INTERVIEW_LIST_FILE, encoding="utf-8") as f:
+        assert len(json.load(f)["candidates"]) == 4
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from utils.candidate_ranking import CandidateRanking, JobMatrix, experience_years, required_years
+
+PYTHON_CV = {"name": "Ayşe", "position": "Backend geliştirici", "skills": ["python", "django", "postgresql"],
+             "experience": [{"period": "2018 - 2022", "role": "Python geliştirici"}]}
+ADS_CV = {"name": "Mehmet", "position": "Dijital pazarlama", "skills": ["google ads", "seo"],
+          "experience": [{"period": "2023–Günümüz", "role": "Pazarlama uzmanı"}]}
+DESIGN_CV = {"name": "Zeynep", "position": "Grafik tasarımcı", "skills": ["figma", "photoshop"]}
+JOB_AD = {"position": "Python backend geliştirici", "requirements": "Django ve PostgreSQL ile en az 3 yıl deneyim"}
+
+
+def test_experience_and_required_years():
+    assert experience_years(PYTHON_CV) == 4
+    assert experience_years({"experience": ["metin", {"period": "belirsiz"}]}) == 0
+    assert required_years(JOB_AD, [{"cevap": "Minimum 5 sene tercih sebebi"}]) == 5
+    assert required_years({"position": "Stajyer"}, None) == 0
+
+
+def test_re_added_candidate_keeps_df_and_scores_consistent():
+    job = JobMatrix()
+    job.add("Genar-00001-00001", PYTHON_CV)
+    job.add("Genar-00001-00002", DESIGN_CV)
+    job.add("Genar-00001-00001", ADS_CV)  # CV güncellendi
+
+    fresh = JobMatrix()
+    fresh.add("Genar-00001-00002", DESIGN_CV)
+    fresh.add("Genar-00001-00001", ADS_CV)
+
+    assert len(job) == 2
+    assert np.array_equal(job.df, fresh.df)
+    query = ["google", "ads", "seo"]
+    scores, _, _, alive = job.score(query, 0)
+    expected, _, _, _ = fresh.score(query, 0)
+    assert alive.tolist() == [False, True, True]
+    assert scores[0] == -np.inf
+    assert scores[1:].tolist() == pytest.approx(expected.tolist())
+
+
+def test_matrix_grows_past_initial_buffers():
+    job = JobMatrix()
+    for i in range(100):
+        job.add(f"Genar-00001-{i:05d}", {"skills": [f"beceri{j}" for j in range(i % 30)] + ["python"]})
+
+    scores, _, _, alive = job.score(["python"], 0)
+    assert len(job) == 100 and alive.all()
+    assert np.isfinite(scores).all()
+
+
+class _Storage:
+    def __init__(self, cvs: dict):
+        self.cvs = cvs
+        self.listeners = []
+
+    def add_candidate_listener(self, callback):
+        self.listeners.append(callback)
+
+    def get_job_ad_data(self, job_id):
+        return JOB_AD
+
+    def get_qna_data(self, job_id):
+        return []
+
+    def count_candidates(self, job_id):
+        return len(self.cvs)
+
+    def find_candidates(self, job_id=None):
+        return [{"candidate_id": candidate_id} for candidate_id in self.cvs]
+
+    def get_cv_data(self, candidate_id):
+        return self.cvs[candidate_id]
+
+    def add(self, candidate_id, cv_data):
+        self.cvs[candidate_id] = cv_data
+        for callback in self.listeners:
+            callback("Genar-00001", [(candidate_id, cv_data)])
+
+
+def test_top_ranks_matching_cv_first_and_picks_up_new_candidates():
+    storage = _Storage({"Genar-00001-00001": ADS_CV, "Genar-00001-00002": PYTHON_CV})
+    ranking = CandidateRanking(storage)
+
+    first = ranking.top("Genar-00001", n=5)
+    storage.add("Genar-00001-00003", DESIGN_CV)
+    second = ranking.top("Genar-00001", n=5)
+
+    assert first["required_years"] == 3
+    assert [r["candidate_id"] for r in first["ranking"]] == ["Genar-00001-00002", "Genar-00001-00001"]
+    assert first["ranking"][0]["experience_years"] == 4
+    assert second["candidates"] == 3
+    assert second["ranking"][0]["candidate_id"] == "Genar-00001-00002"
+    assert ranking.top("Genar-00001", n=1)["ranking"][0]["rank"] == 1
@@ -0,0 +1,55 @@
+def test_invalid_frames_are_reported_and_socket_stays_open(client, candidate_id):
+    assert client.post(f"/api/admission/{candidate_id}").json()["admitted"]
+
+    with client.websocket_connect(f"/api/chat/ws/{candidate_id}") as ws:
+        ws.send_text("not json")
+        assert ws.receive_json()["event"] == "error"
+        ws.send_text("[1, 2]")
+        assert ws.receive_json()["event"] == "error"
+
+        ws.send_json({"userMessage": "", "lastSeq": 0})
+        events = [ws.receive_json()]
+        while events[-1]["event"] != "done":
+            events.append(ws.receive_json())
+
+    assert events[-1]["messages"]
+
+
+def test_turn_errors_are_reported_and_socket_stays_open(api, client, candidate_id, monkeypatch):
+    assert client.post(f"/api/admission/{candidate_id}").json()["admitted"]
+    original = api.chat_events
+    failures = []
+
+    async def failing_once(request, session, endpoint):
+        if not failures:
+            failures.append(request.userMessage)
+            raise OSError("disk dolu")
+        async for item in original(request, session, endpoint):
+            yield item
+
+    monkeypatch.setattr(api, "chat_events", failing_once)
+    with client.websocket_connect(f"/api/chat/ws/{candidate_id}") as ws:
+        ws.send_json({"userMessage": "", "lastSeq": 0})
+        error = ws.receive_json()
+        assert error == {"event": "error", "status": 500, "detail": "disk dolu"}
+
+        ws.send_json({"userMessage": "", "lastSeq": 0})
+        event = ws.receive_json()
+        while event["event"] == "token":
+            event = ws.receive_json()
+
+    assert event["event"] == "done"
+
+
+def test_sse_turn_errors_are_sent_as_error_event(api, client, candidate_id, monkeypatch):
+    assert client.post(f"/api/admission/{candidate_id}").json()["admitted"]
+
+    async def failing(request, session, endpoint):
+        yield "token", {"text": "Mer"}
+        raise OSError("disk dolu")
+
+    monkeypatch.setattr(api, "chat_events", failing)
+    response = client.post("/api/chat/stream", json={"sessionId": candidate_id, "userMessage": "", "lastSeq": 0})
+
+    assert response.status_code == 200
+    assert response.text.endswith('event: error\ndata: {"status": 500, "detail": "disk dolu"}\n\n')
@@ -0,0 +1,58 @@
+from utils.conversation_buffer import ConversationBuffer, ConversationBuffers, estimate_tokens
+
+
+def _messages(count: int, size: int = 40) -> list:
+    return [
+        {"sender": "user" if i % 2 else "assistant", "text": f"{i:03d} " + "x" * size}
+        for i in range(count)
+    ]
+
+
+def test_window_returns_everything_within_budget():
+    messages = _messages(4)
+    buffer = ConversationBuffer().sync(messages)
+
+    assert buffer.window(10_000) == messages
+
+
+def test_window_summarises_older_messages_over_budget():
+    messages = _messages(40)
+    buffer = ConversationBuffer().sync(messages)
+
+    window = buffer.window(200)
+
+    summary, recent = window[0], window[1:]
+    assert summary["sender"] == "summary"
+    assert summary["text"].startswith(f"[Önceki konuşma özeti: {40 - len(recent)} mesaj")
+    assert recent == messages[-len(recent):]
+    # Özet en yeni eski mesajlardan geriye doğru dolar
+    assert summary["text"].splitlines()[-1].endswith(messages[-len(recent) - 1]["text"])
+    assert sum(estimate_tokens(m["text"]) for m in window) <= 200 + len(window)
+
+
+def test_window_always_keeps_last_message():
+    messages = _messages(3, size=2000)
+    buffer = ConversationBuffer().sync(messages)
+
+    assert buffer.window(50)[-1] == messages[-1]
+
+
+def test_sync_appends_new_messages_and_rebuilds_changed_history():
+    messages = _messages(5)
+    buffer = ConversationBuffer().sync(messages[:3])
+    buffer.sync(messages[:2], messages[2:])
+    assert len(buffer) == 5
+
+    edited = messages[:4] + [{"sender": "user", "text": "değişti"}]
+    assert buffer.sync(edited).window(10_000) == edited
+
+
+def test_buffers_evict_least_recently_used_session():
+    buffers = ConversationBuffers(max_sessions=2)
+    first = buffers.get("a", "full", _messages(2))
+    buffers.get("b", "full", _messages(2))
+    buffers.get("a", "full", _messages(2))
+    buffers.get("c", "full", _messages(2))
+
+    assert buffers.get("a", "full", _messages(2)) is first
+    assert len(buffers.get("b", "full")) == 0
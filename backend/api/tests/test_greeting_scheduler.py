@@ -0,0 +1,68 @@
+import asyncio
+from datetime import datetime, timezone
+
+from utils.greeting_scheduler import GreetingScheduler, parse_meeting_time
+
+NOW = datetime(2024, 11, 14, 9, 0, tzinfo=timezone.utc)
+
+
+class _Storage:
+    """Sadece scheduler'ın kullandığı okumalar"""
+
+    def __init__(self, jobs: dict):
+        self.jobs = jobs
+
+    def list_job_ids(self):
+        return sorted(self.jobs)
+
+    def get_interview_list_data(self, job_id: str):
+        return {"candidates": [
+            {"candidate_id": candidate_id, "meeting_scheduled": meeting}
+            for candidate_id, meeting in self.jobs[job_id].items()
+        ]}
+
+    async def run_io(self, func, *args):
+        return func(*args)
+
+
+def test_parse_meeting_time():
+    assert parse_meeting_time("2024-11-14T10:00:00.000Z") == datetime(2024, 11, 14, 10, 0, tzinfo=timezone.utc)
+    assert parse_meeting_time("2024-11-14T13:00:00+03:00") == datetime(2024, 11, 14, 10, 0, tzinfo=timezone.utc)
+    assert parse_meeting_time("2024-11-14T10:00:00").tzinfo is not None
+    assert parse_meeting_time("yarın") is None
+    assert parse_meeting_time("") is None
+    assert parse_meeting_time(None) is None
+
+
+def test_upcoming_candidates_covers_grace_and_lead_window():
+    storage = _Storage({
+        "Genar-00001": {
+            "Genar-00001-00001": "2024-11-14T07:30:00Z",  # 1.5 saat önce: hâlâ girilebilir
+            "Genar-00001-00002": "2024-11-14T06:00:00Z",  # 3 saat önce
+            "Genar-00001-00003": "2024-11-15T08:00:00Z",  # 23 saat sonra
+            "Genar-00001-00004": "",
+        },
+        "Genar-00002": {
+            "Genar-00002-00001": "2024-11-15T10:00:00Z",  # 25 saat sonra
+            "Genar-00002-00002": "2024-11-14T09:00:00Z",
+        },
+    })
+    scheduler = GreetingScheduler(storage, prewarm=None, lead_hours=24)
+
+    assert scheduler.upcoming_candidates(now=NOW) == ["Genar-00001-00001", "Genar-00001-00003", "Genar-00002-00002"]
+
+
+def test_scan_counts_ready_and_failed_greetings():
+    soon = datetime.now(timezone.utc).isoformat()
+    storage = _Storage({"Genar-00001": {f"Genar-00001-0000{i}": soon for i in range(1, 4)}})
+
+    async def prewarm(candidate_id):
+        if candidate_id.endswith("2"):
+            raise RuntimeError("LLM hatası")
+        return candidate_id.endswith("1")
+
+    scheduler = GreetingScheduler(storage, prewarm)
+    scanned = asyncio.run(scheduler.scan())
+
+    assert scanned == ["Genar-00001-00001", "Genar-00001-00002", "Genar-00001-00003"]
+    assert scheduler.stats() == {"running": False, "scans": 1, "ready": 1, "failures": 1}
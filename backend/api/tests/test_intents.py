@@ -0,0 +1,38 @@
+import pytest
+
+from utils.intents import has_closing_word, is_plain_closing, is_plain_ready, is_question, tokenize, tr_lower
+
+
+def test_tr_lower_uses_turkish_dotted_and_dotless_i():
+    assert tr_lower("IŞIK İZMİR") == "ışık izmir"
+    assert tokenize("HAYIR, Sağ Olun!") == ["hayır", "sağolun"]
+
+
+@pytest.mark.parametrize("text", ["Yok, teşekkürler", "HAYIR", "Sağ olun", "başka sorum yok, iyi günler"])
+def test_closing_words_match_as_whole_words(text):
+    assert has_closing_word(text)
+
+
+@pytest.mark.parametrize("text", ["Yoksa başka bir aşama var", "Hayırlı olsun", "Teşekkürlerimi iletin", "Yokluk"])
+def test_closing_words_do_not_match_inside_longer_words(text):
+    assert not has_closing_word(text)
+
+
+@pytest.mark.parametrize("text", ["Başka soru yok mu", "Maaş ne kadar?", "Uzaktan çalışabilir miyim"])
+def test_questions_are_detected_by_mark_or_particle(text):
+    assert is_question(text)
+    assert not is_plain_closing(text)
+
+
+def test_plain_closing_allows_only_fillers_around_the_keyword():
+    assert is_plain_closing("Şimdilik başka sorum yok, çok teşekkür ederim")
+    assert not is_plain_closing("Yok ama maaşı öğrenmek isterim")
+    assert not is_plain_closing("Başka sorum")
+
+
+def test_plain_ready_requires_a_ready_keyword():
+    assert is_plain_ready("Evet, hazırım")
+    assert is_plain_ready("TAMAM O ZAMAN BAŞLAYALIM")
+    assert not is_plain_ready("Evet tamam")
+    assert not is_plain_ready("Hazırım ama önce bir sorum var")
+    assert not is_plain_ready("Başlayabilir miyiz")
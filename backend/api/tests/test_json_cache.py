@@ -0,0 +1,84 @@
+import os
+import json
+
+import pytest
+
+from utils.json_cache import JsonCache
+
+
+def _write(path, data, mtime_ns: int = None):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_repeated_load_is_served_from_cache(tmp_path):
+    path = tmp_path / "JobAd.json"
+    _write(path, {"position": "Analist"})
+    cache = JsonCache()
+
+    first = cache.load(str(path))
+    second = cache.load(str(path))
+
+    assert second is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_changed_mtime_or_size_reloads_file(tmp_path):
+    path = tmp_path / "JobAd.json"
+    _write(path, {"position": "Analist"}, mtime_ns=1_000_000_000)
+    cache = JsonCache()
+    cache.load(str(path))
+
+    # Aynı boyut, farklı mtime
+    _write(path, {"position": "Mimar  "}, mtime_ns=2_000_000_000)
+    assert cache.load(str(path)) == {"position": "Mimar  "}
+    # Aynı mtime, farklı boyut
+    _write(path, {"position": "Yazılımcı"}, mtime_ns=2_000_000_000)
+    assert cache.load(str(path)) == {"position": "Yazılımcı"}
+    assert cache.misses == 3
+
+
+def test_invalidate_drops_entry(tmp_path):
+    path = tmp_path / "Quiz.json"
+    _write(path, {"variants": []})
+    cache = JsonCache()
+    cache.load(str(path))
+
+    cache.invalidate(str(path))
+    cache.invalidate(str(path))
+    cache.load(str(path))
+
+    assert cache.invalidations == 1
+    assert cache.misses == 2
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = JsonCache(max_entries=2)
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.json"
+        _write(path, {"name": name})
+        paths.append(str(path))
+
+    cache.load(paths[0])
+    cache.load(paths[1])
+    cache.load(paths[0])  # a en son kullanılan olur, b çıkarılır
+    cache.load(paths[2])
+    cache.load(paths[0])
+
+    assert cache.evictions == 1
+    assert cache.stats()["entries"] == 2
+    assert (cache.hits, cache.misses) == (2, 3)
+
+
+def test_missing_and_corrupt_files_raise_like_json_load(tmp_path):
+    cache = JsonCache()
+    with pytest.raises(FileNotFoundError):
+        cache.load(str(tmp_path / "yok.json"))
+
+    path = tmp_path / "bozuk.json"
+    path.write_text("{bozuk", encoding="utf-8")
+    with pytest.raises(json.JSONDecodeError):
+        cache.load(str(path))
+    assert cache.stats()["entries"] == 0
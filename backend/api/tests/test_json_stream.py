@@ -0,0 +1,56 @@
+import json
+
+from utils.json_stream import JsonArrayItems
+
+QUESTIONS = [
+    {"question": "Süslü {parantez} ve \"tırnak\" içeren soru?", "options": ["a", "b"], "correct_answer": "A"},
+    {"question": "Kaçışlı ters bölü \\ ile", "options": ["c", "d"], "correct_answer": "B"},
+    {"question": "İç içe", "meta": {"level": {"value": 2}}, "correct_answer": "C"},
+]
+
+
+def _chunks(text: str, size: int):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_items_are_returned_as_soon_as_they_close():
+    text = "Elbette, işte quiz:\n```json\n" + json.dumps({"questions": QUESTIONS}, ensure_ascii=False) + "\n```"
+    parser = JsonArrayItems()
+    received = []
+    for chunk in _chunks(text, 7):
+        received.append(parser.feed(chunk))
+
+    items = [item for batch in received for item in batch]
+    assert items == QUESTIONS
+    # Her eleman kendi parçasında döner, hepsi sonda birden değil
+    assert sum(1 for batch in received if batch) == len(QUESTIONS)
+    assert parser.done
+
+
+def test_bare_array_in_code_block():
+    parser = JsonArrayItems()
+    items = parser.feed("```json\n" + json.dumps(QUESTIONS[:2]) + "\n```")
+
+    assert items == QUESTIONS[:2]
+
+
+def test_single_character_chunks():
+    parser = JsonArrayItems()
+    items = [item for char in json.dumps({"questions": QUESTIONS}) for item in parser.feed(char)]
+
+    assert items == QUESTIONS
+
+
+def test_invalid_item_is_skipped_and_counted():
+    parser = JsonArrayItems()
+    items = parser.feed('{"questions": [{"question": "ok"}, {"question": bozuk}, {"question": "sonraki"}]}')
+
+    assert items == [{"question": "ok"}, {"question": "sonraki"}]
+    assert parser.invalid == 1
+
+
+def test_text_after_array_end_is_ignored():
+    parser = JsonArrayItems()
+    assert parser.feed('{"questions": [{"a": 1}]') == [{"a": 1}]
+    assert parser.feed(', "extra": [{"b": 2}]}') == []
+    assert parser.done
@@ -0,0 +1,161 @@
+import time
+import types
+import asyncio
+
+import httpx
+import pytest
+from groq import APIConnectionError, RateLimitError
+
+from utils import llm_gateway
+from utils.llm_gateway import PRIORITY_BACKGROUND, PRIORITY_CHAT, LLMGateway, _PrioritySlots
+
+REQUEST = httpx.Request("POST", "https://api.groq.test/openai/v1/chat/completions")
+
+
+def _rate_limited(retry_after: str) -> RateLimitError:
+    response = httpx.Response(429, headers={"retry-after": retry_after}, request=REQUEST)
+    return RateLimitError("rate limited", response=response, body=None)
+
+
+def _chunk(text: str):
+    delta = types.SimpleNamespace(content=text)
+    return types.SimpleNamespace(choices=[types.SimpleNamespace(delta=delta, finish_reason=None)])
+
+
+class ScriptedCompletions:
+    """Her çağrıda sıradaki adımı uygular: hata fırlatır ya da (stream) parçaları üretir"""
+
+    def __init__(self, steps=()):
+        self.steps = list(steps)
+        self.started = []
+
+    async def create(self, messages, stream=False, **params):
+        self.started.append(time.monotonic())
+        step = self.steps.pop(0) if self.steps else ["tamam"]
+        if isinstance(step, Exception):
+            raise step
+        if stream:
+            return self._stream(step)
+        message = types.SimpleNamespace(content="".join(p for p in step if isinstance(p, str)))
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message, finish_reason="stop")], usage=None)
+
+    async def _stream(self, parts):
+        for part in parts:
+            if isinstance(part, Exception):
+                raise part
+            yield _chunk(part)
+
+
+def _gateway(completions, **kwargs) -> LLMGateway:
+    client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=completions))
+    return LLMGateway(client, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(llm_gateway, "LLM_BACKOFF_BASE", 0.001)
+
+
+def test_chat_waiter_overtakes_earlier_background_waiter():
+    async def scenario():
+        slots = _PrioritySlots(limit=1, reserved=0)
+        await slots.acquire(PRIORITY_CHAT)
+        order = []
+
+        async def wait(priority, name):
+            await slots.acquire(priority)
+            order.append(name)
+            slots.release(priority)
+
+        background = asyncio.create_task(wait(PRIORITY_BACKGROUND, "background"))
+        await asyncio.sleep(0)
+        chat = asyncio.create_task(wait(PRIORITY_CHAT, "chat"))
+        await asyncio.sleep(0)
+        slots.release(PRIORITY_CHAT)
+        await asyncio.gather(background, chat)
+        return order
+
+    assert asyncio.run(scenario()) == ["chat", "background"]
+
+
+def test_background_work_cannot_use_reserved_chat_slots():
+    async def scenario():
+        slots = _PrioritySlots(limit=3, reserved=2)
+        await slots.acquire(PRIORITY_BACKGROUND)
+        second = asyncio.create_task(slots.acquire(PRIORITY_BACKGROUND))
+        await asyncio.sleep(0)
+        blocked = not second.done()
+        # Ayrılmış slotlar sohbet turlarına hemen verilir
+        await asyncio.wait_for(slots.acquire(PRIORITY_CHAT), 0.1)
+        await asyncio.wait_for(slots.acquire(PRIORITY_CHAT), 0.1)
+        slots.release(PRIORITY_BACKGROUND)
+        await asyncio.wait_for(second, 0.1)
+        return blocked, dict(slots.active)
+
+    blocked, active = asyncio.run(scenario())
+    assert blocked
+    assert active == {PRIORITY_CHAT: 2, PRIORITY_BACKGROUND: 1}
+
+
+def test_slot_granted_to_cancelled_waiter_is_released():
+    async def scenario():
+        slots = _PrioritySlots(limit=1, reserved=0)
+        await slots.acquire(PRIORITY_CHAT)
+        waiter = asyncio.create_task(slots.acquire(PRIORITY_CHAT))
+        await asyncio.sleep(0)
+        # Slot bekleyene verilir, bekleyen görev çalışmadan iptal edilir
+        slots.release(PRIORITY_CHAT)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.wait_for(slots.acquire(PRIORITY_BACKGROUND), 0.1)
+        return dict(slots.active), slots.waiting(PRIORITY_CHAT)
+
+    assert asyncio.run(scenario()) == ({PRIORITY_CHAT: 0, PRIORITY_BACKGROUND: 1}, 0)
+
+
+def test_rate_limit_cooldown_is_waited_without_holding_a_slot():
+    async def scenario():
+        completions = ScriptedCompletions(steps=[_rate_limited("0.3")])
+        gateway = _gateway(completions, max_concurrency=1, chat_reserved=0)
+        first = asyncio.create_task(gateway.complete([{"role": "user", "content": "a"}], agent="test"))
+        while not completions.started:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        cooldown_until = gateway._cooldown_until
+        second = asyncio.create_task(gateway.complete([{"role": "user", "content": "b"}], agent="test"))
+        await asyncio.sleep(0.05)
+        during_cooldown = gateway.stats()
+        await asyncio.gather(first, second)
+        return completions.started, cooldown_until, during_cooldown, gateway.stats()
+
+    started, cooldown_until, during_cooldown, stats = asyncio.run(scenario())
+    assert during_cooldown["cooldown_remaining"] > 0
+    assert during_cooldown["active"] == {"chat": 0, "background": 0}
+    assert len(started) == 3
+    assert all(at >= cooldown_until for at in started[1:])
+    assert (stats["rate_limited"], stats["retries"], stats["calls"]) == (1, 1, 3)
+
+
+def test_stream_retries_only_before_first_token():
+    async def collect(gateway):
+        return [part async for part in gateway.stream([{"role": "user", "content": "a"}], agent="test")]
+
+    connection_error = APIConnectionError(request=REQUEST)
+    retried = ScriptedCompletions(steps=[[connection_error], ["Mer", "haba"]])
+    assert asyncio.run(collect(_gateway(retried))) == ["Mer", "haba"]
+    assert len(retried.started) == 2
+
+    interrupted = ScriptedCompletions(steps=[["Mer", connection_error], ["Merhaba"]])
+    gateway = _gateway(interrupted)
+    parts = []
+
+    async def consume():
+        async for part in gateway.stream([{"role": "user", "content": "a"}], agent="test"):
+            parts.append(part)
+
+    with pytest.raises(APIConnectionError):
+        asyncio.run(consume())
+    assert parts == ["Mer"]
+    assert len(interrupted.started) == 1
+    assert (gateway.retries, gateway.failures) == (0, 1)
@@ -0,0 +1,69 @@
+import json
+import queue
+import logging
+import contextvars
+
+from utils import logging_setup
+from utils.logging_setup import ContextFilter, JsonFormatter, _DroppingQueueHandler, bind_context, parse_levels, payload
+
+
+def _record(msg: str = "mesaj", *args) -> logging.LogRecord:
+    return logging.LogRecord("agents.test", logging.INFO, __file__, 1, msg, args, None)
+
+
+def test_parse_levels_ignores_malformed_items():
+    spec = " agents.starting_agent=debug, utils.llm_gateway = WARNING ,bozuk,=INFO"
+
+    assert parse_levels(spec) == {"agents.starting_agent": "DEBUG", "utils.llm_gateway": "WARNING"}
+    assert parse_levels("") == {}
+
+
+def test_payload_is_truncated_only_when_formatted(monkeypatch):
+    monkeypatch.setattr(logging_setup, "_payload_chars", 5)
+    monkeypatch.setattr(logging_setup, "_payload_sample_rate", 1.0)
+    value = payload("merhaba dünya")
+
+    assert value.value == "merhaba dünya"
+    assert str(value) == "merha… (+8 karakter)"
+    assert str(payload("kısa")) == "kısa"
+
+
+def test_unsampled_payload_logs_only_its_length(monkeypatch):
+    monkeypatch.setattr(logging_setup, "_payload_sample_rate", 0.0)
+
+    assert str(payload({"a": 1})) == "<8 karakter>"
+
+
+def test_context_is_bound_per_task_context():
+    def in_request():
+        bind_context(session_id="Genar-00001-00001", candidate_id="Genar-00001-00001")
+        record = _record()
+        ContextFilter().filter(record)
+        return record
+
+    record = contextvars.copy_context().run(in_request)
+    outside = _record()
+    ContextFilter().filter(outside)
+
+    assert (record.session_id, record.candidate_id) == ("Genar-00001-00001", "Genar-00001-00001")
+    assert (outside.session_id, outside.candidate_id) == ("-", "-")
+
+
+def test_json_formatter_writes_one_object_per_record():
+    record = _record("%s turu %d ms", "starting", 120)
+    ContextFilter().filter(record)
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["msg"] == "starting turu 120 ms"
+    assert (entry["level"], entry["logger"], entry["session_id"]) == ("INFO", "agents.test", "-")
+    assert entry["ts"].endswith("+00:00")
+
+
+def test_full_queue_drops_records_without_blocking():
+    handler = _DroppingQueueHandler(queue.Queue(maxsize=2))
+    for i in range(5):
+        handler.handle(_record(f"kayıt {i}"))
+
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
@@ -0,0 +1,50 @@
+from utils.marker_filter import MarkerFilter
+
+
+def _run(chunks):
+    marker_filter = MarkerFilter()
+    sent = [marker_filter.feed(chunk) for chunk in chunks] + [marker_filter.flush()]
+    return marker_filter, "".join(sent)
+
+
+def test_marker_split_across_chunks_is_removed():
+    marker_filter, sent = _run(["Harika! Geçelim. START_", "INTER", "VIEW"])
+
+    assert sent == "Harika! Geçelim."
+    assert marker_filter.found == {"START_INTERVIEW"}
+    assert marker_filter.text == sent
+
+
+def test_marker_prefix_is_not_leaked_before_next_chunk():
+    marker_filter = MarkerFilter()
+
+    assert marker_filter.feed("Teşekkürler. INTERVIEW_COM") == "Teşekkürler."
+    assert marker_filter.feed("PLETE") == ""
+    assert marker_filter.found == {"INTERVIEW_COMPLETE"}
+
+
+def test_longest_marker_wins():
+    marker_filter, sent = _run(["Görüşmek üzere. POST_INTERVIEW", "_COMPLETE"])
+
+    assert sent == "Görüşmek üzere."
+    assert marker_filter.found == {"POST_INTERVIEW_COMPLETE"}
+
+
+def test_held_text_that_is_not_a_marker_is_flushed():
+    marker_filter, sent = _run(["Sonraki adım: START", " tarihi yarın"])
+
+    assert sent == "Sonraki adım: START tarihi yarın"
+    assert marker_filter.found == set()
+
+
+def test_leading_and_trailing_whitespace_is_trimmed():
+    marker_filter, sent = _run(["  ", "\nMerhaba", " dünya ", " "])
+
+    assert sent == "Merhaba dünya"
+    assert marker_filter.text == "Merhaba dünya"
+
+
+def test_marker_in_the_middle_keeps_surrounding_text():
+    _, sent = _run(["Bir START_INTERVIEW", " iki"])
+
+    assert sent == "Bir  iki"
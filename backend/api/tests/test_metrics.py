@@ -0,0 +1,62 @@
+import pytest
+
+from utils.metrics import MetricsRegistry
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("test_seconds", "Süre", ("stage",), buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value, stage="quiz")
+
+    lines = registry.render().splitlines()
+
+    assert lines[:2] == ["# HELP test_seconds Süre", "# TYPE test_seconds histogram"]
+    assert lines[2:] == [
+        'test_seconds_bucket{stage="quiz",le="0.1"} 2',
+        'test_seconds_bucket{stage="quiz",le="1"} 3',
+        'test_seconds_bucket{stage="quiz",le="+Inf"} 4',
+        'test_seconds_sum{stage="quiz"} 3.65',
+        'test_seconds_count{stage="quiz"} 4',
+    ]
+
+
+def test_histogram_time_records_even_when_block_raises():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("test_block_seconds", "Süre")
+
+    with pytest.raises(RuntimeError):
+        with histogram.time():
+            raise RuntimeError
+
+    assert "test_block_seconds_count 1" in registry.render()
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    counter = registry.counter("test_total", "Sayaç", ("reason",))
+    counter.inc(reason='a"b\\c\nd')
+
+    assert 'test_total{reason="a\\"b\\\\c\\nd"} 1' in registry.render()
+
+
+def test_labels_must_match_and_names_are_unique():
+    registry = MetricsRegistry()
+    gauge = registry.gauge("test_gauge", "Anlık", ("state",))
+
+    with pytest.raises(ValueError):
+        gauge.set(1, stage="active")
+    with pytest.raises(ValueError):
+        registry.counter("test_gauge", "Tekrar")
+
+
+def test_collectors_run_before_render_and_errors_are_contained():
+    registry = MetricsRegistry()
+    gauge = registry.gauge("test_sessions", "Session sayısı")
+    registry.on_collect(lambda: gauge.set(7))
+
+    @registry.on_collect
+    def broken():
+        raise RuntimeError("okunamadı")
+
+    assert "test_sessions 7" in registry.render()
@@ -0,0 +1,60 @@
+import types
+
+from utils.prompt_builder import (
+    attach_sections, build_chat_prompt, build_system_prefix, cached_tokens, history_messages, stable_json
+)
+
+RULES = "  Sen bir mülakat asistanısın.  "
+
+
+def test_stable_json_ignores_key_order():
+    assert stable_json({"b": 1, "a": "ş"}) == stable_json({"a": "ş", "b": 1}) == '{"a":"ş","b":1}'
+
+
+def test_system_prefix_is_rules_then_tagged_sections():
+    prefix = build_system_prefix(RULES, [("JOB_AD", {"position": "Analist"}), ("NOTES", "serbest metin")])
+
+    assert prefix == (
+        "Sen bir mülakat asistanısın.\n\n"
+        "<JOB_AD>\n{\"position\":\"Analist\"}\n</JOB_AD>\n\n"
+        "<NOTES>\nserbest metin\n</NOTES>"
+    )
+
+
+def test_prefix_does_not_change_as_the_conversation_grows():
+    sections = [("CV", {"skills": ["python", "sql"], "name": "Aday"})]
+    history = [{"sender": "assistant", "text": "Merhaba"}]
+    first = build_chat_prompt(RULES, sections, history, "Selam")
+    history += [{"sender": "user", "text": "Selam"}, {"sender": "assistant", "text": "Başlayalım"}]
+    later = build_chat_prompt(RULES, [("CV", {"name": "Aday", "skills": ["python", "sql"]})], history, "Tamam")
+
+    assert later.messages[0] == first.messages[0]
+    assert later.prefix_hash == first.prefix_hash
+    assert len(later.messages) == len(first.messages) + 2
+    assert later.messages[-1] == {"role": "user", "content": "Tamam"}
+
+
+def test_history_roles_and_summary_as_system_message():
+    history = [
+        {"sender": "summary", "text": "[Önceki konuşma özeti]"},
+        {"sender": "user", "text": "Merhaba"},
+        {"sender": "assistant", "text": "Hoş geldiniz"},
+        {"sender": "system", "text": "bilinmeyen"},
+    ]
+
+    assert [m["role"] for m in history_messages(history)] == ["system", "user", "assistant", "assistant"]
+
+
+def test_attach_sections_puts_turn_data_before_last_message():
+    message = attach_sections("Maaş aralığı nedir?", [("QNA", [{"q": "Maaş", "a": "Görüşmede"}])])
+
+    assert message.startswith("<QNA>\n")
+    assert message.endswith("CANDIDATE'S LAST MESSAGE: Maaş aralığı nedir?")
+
+
+def test_cached_tokens_defaults_to_zero():
+    usage = types.SimpleNamespace(prompt_tokens_details=types.SimpleNamespace(cached_tokens=512))
+
+    assert cached_tokens(usage) == 512
+    assert cached_tokens(types.SimpleNamespace(prompt_tokens_details=None)) == 0
+    assert cached_tokens(None) == 0
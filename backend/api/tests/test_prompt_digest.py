@@ -0,0 +1,82 @@
+import json
+import types
+import asyncio
+from collections import OrderedDict
+
+from utils import prompt_digest
+from utils.conversation_buffer import estimate_tokens
+from utils.prompt_digest import build_cv_digest, build_job_digest, cv_digest
+
+CV = {
+    "name": "Ayşe Yılmaz",
+    "position": "Backend geliştirici",
+    "summary": "Ölçeklenebilir servisler geliştiren yazılımcı. " * 10,
+    "personal_info": {"email": "ayse@example.com", "phone": "+90 555 000 00 00", "location": "İzmir"},
+    "skills": [f"beceri {i}" for i in range(20)],
+    "experience": [
+        {"position": f"Geliştirici {i}", "company": f"Şirket {i}", "period": f"{2010 + i} - {2011 + i}",
+         "responsibilities": ["API tasarımı ve bakım işleri " * 4] * 6}
+        for i in range(6)
+    ],
+}
+
+
+def test_cv_digest_drops_contact_details_and_fits_budget():
+    text = build_cv_digest(CV, budget=400)
+    digest = json.loads(text)
+
+    assert estimate_tokens(text) <= 400
+    assert digest["location"] == "İzmir"
+    assert "ayse@example.com" not in text and "555" not in text
+    # Bütçeye sığması için daha az ayrıntılı seviyeye inilir
+    assert len(digest["experience"]) < 4
+
+
+def test_job_digest_keeps_short_fields_and_clips_long_ones():
+    job = {"position": "Analist", "location": "İstanbul", "job_description": "x" * 2000,
+           "requirements": [f"şart {i}" for i in range(20)]}
+    digest = json.loads(build_job_digest(job, budget=350))
+
+    assert digest["location"] == "İstanbul"
+    assert digest["job_description"].endswith("…")
+    assert len(digest["requirements"]) <= 8
+
+
+class _Storage:
+    """Digest dosyalarını bellekte tutan async okuma/yazma interface'leri"""
+
+    def __init__(self):
+        self.files = {}
+        self.saves = 0
+
+        async def get_candidate_data(candidate_id, file_name):
+            return self.files.get((candidate_id, file_name), {})
+
+        async def save_candidate_data(job_id, candidate_id, data_type, data):
+            self.saves += 1
+            self.files[(candidate_id, f"{data_type}.json")] = data
+
+        self.async_reader = types.SimpleNamespace(get_candidate_data=get_candidate_data)
+        self.async_writer = types.SimpleNamespace(save_candidate_data=save_candidate_data)
+
+
+def test_digest_is_reused_from_memory_then_file_and_rebuilt_when_cv_changes(monkeypatch):
+    monkeypatch.setattr(prompt_digest, "_digests", OrderedDict())
+    storage = _Storage()
+    candidate_id = "Genar-00001-digest"
+
+    async def scenario():
+        first = await cv_digest(storage, "Genar-00001", candidate_id, CV)
+        same_object = await cv_digest(storage, "Genar-00001", candidate_id, CV)
+        # Yeniden başlatma: bellek boş, kaynak aynı içerikli yeni nesne -> dosyadan
+        prompt_digest._digests.clear()
+        from_file = await cv_digest(storage, "Genar-00001", candidate_id, json.loads(json.dumps(CV)))
+        changed = await cv_digest(storage, "Genar-00001", candidate_id, {**CV, "position": "Veri mühendisi"})
+        return first, same_object, from_file, changed
+
+    first, same_object, from_file, changed = asyncio.run(scenario())
+
+    assert same_object is first
+    assert from_file.text == first.text and from_file.source_hash == first.source_hash
+    assert "Veri mühendisi" in changed.text
+    assert storage.saves == 2
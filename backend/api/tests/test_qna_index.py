@@ -0,0 +1,54 @@
+from utils.qna_index import QnAIndex, normalize, stem
+
+ENTRIES = [
+    {"soru": "Maaş aralığı nedir?", "cevap": "Maaş deneyime göre 40.000 - 60.000 TL arasındadır."},
+    {"soru": "Uzaktan çalışma imkanı var mı?", "cevap": "Haftada iki gün uzaktan çalışılabilir."},
+    {"soru": "Yan haklar nelerdir?", "cevap": "Özel sağlık sigortası ve yemek kartı verilir."},
+    {"soru": "Eğitim bütçesi var mı?", "cevap": "Yıllık eğitim ve konferans bütçesi sağlanır."},
+    {"cevap": "Sorusu olmayan girdi indekslenmez."},
+]
+
+
+def test_normalize_folds_turkish_characters_and_stems_suffixes():
+    assert normalize("Maaşlar ve MAAŞI") == ["maas", "maas"]
+    assert stem("sigortasi") == stem("sigorta")
+    assert normalize("bu bir 2024 soru mu") == ["soru"]
+
+
+def test_invalid_entries_are_skipped():
+    assert len(QnAIndex(ENTRIES)) == 4
+    assert len(QnAIndex({"soru": "liste değil"})) == 0
+    assert QnAIndex([]).search("maaş") == []
+
+
+def test_search_ranks_most_relevant_entry_first():
+    index = QnAIndex(ENTRIES)
+
+    assert index.search("maaşlar ne kadar")[0] is ENTRIES[0]
+    assert index.search("evden uzaktan çalışabilir miyim")[0] is ENTRIES[1]
+    assert index.search("sağlık sigortası veriliyor mu")[0] is ENTRIES[2]
+
+
+def test_search_returns_only_matching_entries_up_to_k():
+    index = QnAIndex(ENTRIES)
+
+    assert index.search("tamamen alakasız kelimeler") == []
+    assert len(index.search("maaş eğitim uzaktan sigorta", k=2)) == 2
+
+
+def test_question_terms_weigh_more_than_answer_terms():
+    index = QnAIndex([
+        {"soru": "Konferans desteği var mı?", "cevap": "Evet, yılda bir konferans."},
+        {"soru": "Eğitim bütçesi?", "cevap": "Konferans ve kurs bütçesi sağlanır, konferans listesi ektedir."},
+    ])
+
+    assert index.search("konferans")[0]["soru"] == "Konferans desteği var mı?"
+
+
+def test_exact_match_ignores_word_order_and_suffixes():
+    index = QnAIndex(ENTRIES)
+
+    assert index.exact_match("uzaktan çalışma imkanı") is ENTRIES[1]
+    assert index.exact_match("imkanı çalışma uzaktan var mıdır") is ENTRIES[1]
+    assert index.exact_match("maaş") is None
+    assert index.exact_match("maaş aralığı ve yan haklar") is None
@@ -0,0 +1,134 @@
+import shutil
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from utils.file_manager import FileManager
+from utils.json_cache import JsonCache
+from utils.quiz_analytics import JobQuizStats, QuizAnalytics
+from utils.sqlite_storage import SQLiteFileManager
+
+
+def _result(percentage: float, answers: list) -> dict:
+    """answers: soru başına (cevaplandı mı, doğru mu)"""
+    return {
+        "percentage": percentage,
+        "results": [
+            {"question": f"Soru {i}", "selectedAnswer": 1 if answered else -1, "isCorrect": correct}
+            for i, (answered, correct) in enumerate(answers)
+        ]
+    }
+
+
+KEPT = [_result(40.0, [(True, True), (True, False)]), _result(90.0, [(True, True), (False, False)])]
+REMOVED = [_result(70.0, [(True, True), (True, True)]), _result(10.0, [(False, False), (True, False)])]
+
+
+def test_apply_matches_direct_statistics():
+    stats = JobQuizStats()
+    for result in KEPT + REMOVED:
+        stats.apply([result])
+
+    percentages = np.array([r["percentage"] for r in KEPT + REMOVED])
+    summary = stats.summary()
+    assert stats.count == 4
+    assert stats.mean == pytest.approx(percentages.mean())
+    assert summary["variance"] == pytest.approx(percentages.var(ddof=1), abs=0.01)
+    assert [bucket["count"] for bucket in summary["histogram"]] == [0, 1, 0, 0, 1, 0, 0, 1, 0, 1]
+
+
+def test_removing_results_restores_previous_aggregate():
+    expected = JobQuizStats()
+    expected.apply(KEPT)
+
+    stats = JobQuizStats()
+    stats.apply(KEPT + REMOVED)
+    for result in REMOVED:
+        stats.apply([result], sign=-1)
+
+    assert stats.count == expected.count
+    assert stats.mean == pytest.approx(expected.mean)
+    assert stats.m2 == pytest.approx(expected.m2)
+    assert stats.histogram.tolist() == expected.histogram.tolist()
+    assert stats.questions == expected.questions
+
+
+def test_removing_every_result_empties_aggregate():
+    stats = JobQuizStats()
+    stats.apply(KEPT)
+    stats.apply(KEPT, sign=-1)
+
+    assert (stats.count, stats.mean, stats.m2) == (0, 0.0, 0.0)
+    assert not stats.histogram.any()
+    assert stats.questions == {}
+
+
+def test_round_trip_through_stored_dict():
+    stats = JobQuizStats()
+    stats.apply(KEPT)
+    restored = JobQuizStats(stats.to_dict())
+
+    assert restored.summary() == stats.summary()
+
+
+def test_duplicate_submits_count_candidate_once(api, candidate_id):
+    job_id = "Genar-00001"
+
+    async def submit_three_times():
+        analytics = QuizAnalytics(api.file_manager)
+        before = (await analytics.summary(job_id))["candidates"]
+        await asyncio.gather(*(
+            analytics.record(job_id, candidate_id, _result(percentage, [(True, True)]))
+            for percentage in (20.0, 50.0, 80.0)
+        ))
+        return before, await analytics.summary(job_id)
+
+    before, summary = asyncio.run(submit_three_times())
+
+    assert summary["candidates"] == before + 1
+    assert sum(bucket["count"] for bucket in summary["histogram"]) == before + 1
+
+
+def _workers(tmp_path, data_dir, backend: str):
+    """Aynı depoyu kullanan iki ayrı süreç gibi: kendi FileManager'ı ve cache'i olan iki QuizAnalytics"""
+    root = tmp_path / "GENAR"
+    # Diğer testlerin kaydettiği sonuçlar kopyalanmaz
+    shutil.copytree(data_dir / "Genar-00001", root / "Genar-00001",
+                    ignore=shutil.ignore_patterns("quiz_results.json", "Quiz_analytics.json"))
+    if backend == "sqlite":
+        return [QuizAnalytics(SQLiteFileManager(str(tmp_path / "genar.db"), base_dir=str(root))) for _ in range(2)]
+    return [QuizAnalytics(FileManager(base_dir=str(root), cache=JsonCache())) for _ in range(2)]
+
+
+@pytest.mark.parametrize("backend", ["files", "sqlite"])
+def test_workers_do_not_overwrite_each_others_aggregate(tmp_path, data_dir, backend):
+    job_id = "Genar-00001"
+    first, second = _workers(tmp_path, data_dir, backend)
+
+    def submit(analytics, candidates):
+        async def run():
+            for index in candidates:
+                await analytics.record(job_id, f"Genar-00001-{index:05d}", _result(float(index % 100), [(True, index % 2 == 0)]))
+        asyncio.run(run())
+
+    # İlk worker'ın belleğinde boş agrega özeti varken ikincisi yazar
+    assert asyncio.run(first.summary(job_id))["candidates"] == 0
+    threads = [
+        threading.Thread(target=submit, args=(first, range(100, 110))),
+        threading.Thread(target=submit, args=(second, range(110, 120)))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Aynı adayın iki worker'dan tekrar gönderimi bir kez sayılır
+    submit(first, [100])
+    submit(second, [100])
+
+    for analytics in (first, second):
+        summary = asyncio.run(analytics.summary(job_id))
+        assert summary["candidates"] == 20
+        assert sum(bucket["count"] for bucket in summary["histogram"]) == 20
+        assert sum(q["attempts"] for q in summary["questions"]) == 20
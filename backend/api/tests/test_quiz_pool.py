@@ -0,0 +1,64 @@
+import shutil
+import asyncio
+
+import pytest
+
+from utils.file_manager import FileManager
+from utils.quiz_pool import QuizPool
+
+
+def _variant(tag: str) -> list:
+    return [
+        {"question": f"{tag} {i}", "options": ["a", "b", "c", "d"], "correctAnswerIndex": 1}
+        for i in range(10)
+    ]
+
+
+def _pool(data_dir, generated: list) -> QuizPool:
+    async def generate(qna_data, job_ad_data, priority):
+        generated.append(priority)
+        return _variant(f"v{len(generated)}")
+
+    async def generate_stream(qna_data, job_ad_data, priority):
+        for question in _variant("stream"):
+            yield question
+
+    async def repair(qna_data, job_ad_data, count, existing, priority):
+        return []
+
+    return QuizPool(FileManager(base_dir=str(data_dir)), generate, generate_stream, repair, depth=2)
+
+
+def test_refill_rejects_unknown_job_without_writing(data_dir):
+    async def scenario():
+        pool = _pool(data_dir, generated := [])
+        for job_id in ("..", "Genar-99999"):
+            with pytest.raises(LookupError):
+                pool.schedule_refill(job_id)
+            with pytest.raises(LookupError):
+                await pool.get_for_session(f"s-{job_id}", job_id)
+        return generated
+
+    assert asyncio.run(scenario()) == []
+    assert not (data_dir.parent / "Quiz.json").exists()
+    assert not (data_dir / "Genar-99999").exists()
+
+
+def test_refill_fills_known_job_to_depth(tmp_path, data_dir):
+    root = tmp_path / "GENAR"
+    shutil.copytree(data_dir / "Genar-00001", root / "Genar-00001", ignore=shutil.ignore_patterns("Genar-00001-*"))
+    (root / "Genar-00001" / "Quiz.json").unlink(missing_ok=True)
+
+    async def scenario():
+        pool = _pool(root, generated := [])
+        await pool.schedule_refill("Genar-00001")
+        return pool.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["pools"] == {"Genar-00001": 2}
+    assert stats["generated_background"] == 2
+
+
+def test_refill_endpoint_returns_404_for_unknown_job(client):
+    assert client.post("/api/quiz-pool/Genar-99999/refill").status_code == 404
+    assert client.post("/api/quiz-pool/..%2F..%2Fx/refill").status_code == 404
@@ -0,0 +1,51 @@
+import pytest
+
+from utils.session_store import MemorySessionStore, SessionStore
+
+
+class _NoSyncReads:
+    """Event loop'ta senkron okuma yapılırsa testi düşürür"""
+
+    def __getattr__(self, name):
+        raise AssertionError(f"senkron FileReader.{name} event loop'ta çağrıldı")
+
+
+def test_new_sessions_are_built_through_the_async_reader(api, client, candidate_id, monkeypatch):
+    monkeypatch.setattr(type(api.file_manager), "reader", property(lambda self: _NoSyncReads()))
+
+    debug = client.get(f"/api/debug/{candidate_id}").json()
+    assert debug["parsed_job_id"] == "Genar-00001"
+    assert debug["session_exists"] is False
+
+    assert client.post(f"/api/admission/{candidate_id}").json()["stage"] == "starting"
+    assert client.get(f"/api/debug/{candidate_id}").json()["session_exists"] is True
+
+
+def test_unknown_session_is_rejected(client):
+    assert client.post("/api/admission/Genar-00001-99999").status_code == 404
+    assert client.get("/api/debug/bozuk-id").status_code == 404
+
+
+def test_session_is_restored_from_transcript_journal(api, client, candidate_id):
+    assert client.post(f"/api/admission/{candidate_id}").json()["admitted"]
+    turn = client.post("/api/chat", json={"sessionId": candidate_id, "userMessage": "", "lastSeq": 0}).json()
+    before = client.get(f"/api/debug/{candidate_id}").json()
+
+    # Yeniden başlatma: bellekteki session kaybolur, journal kalır
+    api.session_store.delete(candidate_id)
+    restored = client.get(f"/api/debug/{candidate_id}").json()
+
+    assert restored["session_exists"] is False
+    assert restored["stage"] == before["stage"]
+    history = client.post("/api/chat", json={"sessionId": candidate_id, "userMessage": "INTERVIEW_STARTED", "lastSeq": 0}).json()
+    assert history["seq"] == turn["seq"]
+
+
+def test_session_store_requires_the_full_interface():
+    class PartialStore(SessionStore):
+        def get(self, session_id: str):
+            return None
+
+    with pytest.raises(TypeError):
+        PartialStore()
+    assert isinstance(MemorySessionStore(), SessionStore)
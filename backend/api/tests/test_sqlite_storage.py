@@ -0,0 +1,51 @@
+from utils.sqlite_storage import SQLiteFileManager
+
+
+def test_sqlite_backend_keeps_candidate_list_out_of_the_data_dir(tmp_path):
+    data = tmp_path / "data"
+    storage = SQLiteFileManager(str(tmp_path / "genar.db"), base_dir=str(data))
+    storage.save_job_data("Genar-00009", "JobAd", {"position": "Analist"})
+    storage.create_candidate_folder("Genar-00009", {"name": "Tekil Aday"})
+    storage.create_candidate_folders("Genar-00009", [("Genar-00009-00001", {"name": "Aday 1"})])
+    storage.update_interview_entry("Genar-00009", "Genar-00009-00001", {"status": "interviewed"})
+    storage.compact_interview_list("Genar-00009")
+
+    written = [path.name for path in data.rglob("*")] if data.exists() else []
+    assert not [name for name in written if name.startswith(("Interview_list", ".Interview_list"))]
+    # Sorgular SQLite'taki aday tablosundan gelir
+    rows = storage._conn().execute("SELECT candidate_id, status FROM candidates WHERE job_id = ?", ("Genar-00009",)).fetchall()
+    assert len(rows) == storage.count_candidates("Genar-00009") == 2
+    assert ("Genar-00009-00001", "interviewed") in rows
+    assert [entry["candidate_id"] for entry in storage.find_candidates(status="interviewed")] == ["Genar-00009-00001"]
+
+
+def test_sqlite_candidate_list_operations(tmp_path):
+    storage = SQLiteFileManager(str(tmp_path / "genar.db"), base_dir=str(tmp_path / "data"))
+    storage.save_job_data("Genar-00009", "JobAd", {"position": "Analist"})
+    candidates = [(f"Genar-00009-{i:05d}", {"name": f"Aday {i}"}) for i in range(1, 4)]
+
+    assert storage.create_candidate_folders("Genar-00009", candidates) == 3
+    assert storage.create_candidate_folders("Genar-00009", candidates[:1]) == 0
+    storage.update_interview_entry("Genar-00009", "Genar-00009-00002", {"status": "interviewed"})
+
+    assert storage.count_candidates("Genar-00009") == 3
+    assert storage.get_interview_entry("Genar-00009", "Genar-00009-00002")["status"] == "interviewed"
+    assert storage.get_candidate_ids_by_status("Genar-00009", "applied") == ["Genar-00009-00001", "Genar-00009-00003"]
+    assert storage.resolve_candidate("Genar-00009-00003") == "Genar-00009"
+    assert storage.get_cv_data("Genar-00009-00001") == {"name": "Aday 1"}
+
+
+def test_transcript_candidates_take_their_job_from_the_candidate_rows(tmp_path):
+    storage = SQLiteFileManager(str(tmp_path / "genar.db"), base_dir=str(tmp_path / "data"))
+    storage.save_job_data("Genar-00009", "JobAd", {"position": "Analist"})
+    storage.create_candidate_folders("Genar-00009", [("Genar-00009-00001", {"name": "Aday 1"})])
+    record = {"sender": "user", "text": "Merhaba"}
+    storage.append_transcript("Genar-00009", "Genar-00009-00001", [record])
+    # Aday kaydı olmayan (örn. silinmiş) aday ID'den, geçersiz ID'li kayıt hiç listelenmez
+    storage.append_transcript("Genar-00008", "Genar-00008-00002", [record])
+    storage.append_transcript("", "../bozuk", [record])
+
+    assert storage.transcript_candidate_ids() == [
+        ("Genar-00008", "Genar-00008-00002", True),
+        ("Genar-00009", "Genar-00009-00001", True),
+    ]
@@ -0,0 +1,66 @@
+import types
+import asyncio
+
+from utils import token_budget
+from utils.token_budget import account_session, budget_exhausted, metered, record_usage, session_tokens
+
+USAGE = types.SimpleNamespace(prompt_tokens=100, completion_tokens=20)
+
+
+def test_only_the_turns_own_task_is_metered():
+    async def background():
+        record_usage(USAGE)
+
+    async def turn():
+        with metered() as meter:
+            record_usage(USAGE)
+            # Turdan başlatılan arka plan işi context'i kopyalar ama sayılmaz
+            await asyncio.create_task(background())
+            return meter.prompt, meter.completion, meter.calls
+
+    assert asyncio.run(turn()) == (100, 20, 1)
+
+
+def test_missing_usage_is_estimated_from_lengths():
+    async def turn():
+        with metered() as meter:
+            record_usage(None, [{"role": "user", "content": "x" * 40}], output_chars=80)
+            return meter.prompt, meter.completion
+
+    prompt, completion = asyncio.run(turn())
+    assert prompt > 0
+    assert completion == 21
+
+
+def test_record_usage_outside_a_turn_is_ignored():
+    async def call():
+        record_usage(USAGE)
+
+    asyncio.run(call())
+
+
+def test_account_session_adds_each_call_once():
+    async def turn(session):
+        with metered():
+            record_usage(USAGE)
+            account_session(session)
+            account_session(session)  # tekrar kayıt (örn. iki save_turn) çift saymaz
+            record_usage(USAGE)
+            account_session(session)
+
+    session = {}
+    asyncio.run(turn(session))
+
+    assert session["tokens"] == {"prompt": 200, "completion": 40, "turns": 2}
+    assert session_tokens(session) == 240
+
+
+def test_budget_ceiling(monkeypatch):
+    session = {"tokens": {"prompt": 900, "completion": 100, "turns": 3}}
+
+    monkeypatch.setattr(token_budget, "SESSION_TOKEN_CEILING", 0)
+    assert not budget_exhausted(session)
+    monkeypatch.setattr(token_budget, "SESSION_TOKEN_CEILING", 1000)
+    assert budget_exhausted(session)
+    monkeypatch.setattr(token_budget, "SESSION_TOKEN_CEILING", 1001)
+    assert not budget_exhausted(session)
@@ -0,0 +1,225 @@
+import os
+import time
+import bisect
+import logging
+import itertools
+import threading
+
+from utils.greeting_scheduler import parse_meeting_time
+from utils.metrics import ADMISSION_WAIT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# 0 = kapasite LLM eşzamanlılığından hesaplanır; pozitif değer sabit üst sınırdır
+ADMISSION_MAX_ACTIVE = int(os.getenv("ADMISSION_MAX_ACTIVE", "0"))
+# Chat slotlarının hedeflenen doluluk oranı; kalan pay ani yoğunluklar ve tekrar denemeler içindir
+ADMISSION_UTILIZATION = float(os.getenv("ADMISSION_UTILIZATION", "0.8"))
+# Ölçüm gelene kadar kullanılan başlangıç tahminleri (saniye)
+ADMISSION_CALL_SECONDS = float(os.getenv("ADMISSION_CALL_SECONDS", "4"))
+ADMISSION_TURN_GAP_SECONDS = float(os.getenv("ADMISSION_TURN_GAP_SECONDS", "20"))
+ADMISSION_STAGE_SECONDS = float(os.getenv("ADMISSION_STAGE_SECONDS", "180"))
+# Kabul edilip bu sürede ilk turunu yapmayan / bu süre boyunca tur yapmayan adayın yeri boşaltılır
+ADMISSION_CLAIM_SECONDS = float(os.getenv("ADMISSION_CLAIM_SECONDS", "30"))
+ADMISSION_IDLE_SECONDS = float(os.getenv("ADMISSION_IDLE_SECONDS", "300"))
+# Bu sürede durumunu sormayan (sayfayı kapatan) aday kuyruktan çıkarılır
+ADMISSION_QUEUE_TTL = float(os.getenv("ADMISSION_QUEUE_TTL", "30"))
+# Bekleme odasının durum sorgulama aralığı önerisi
+ADMISSION_POLL_SECONDS = 3
+
+_EWMA_ALPHA = 0.2
+
+
+class Ewma:
+    """Üstel ağırlıklı hareketli ortalama; ölçüm gelene kadar başlangıç tahminini döndürür"""
+
+    def __init__(self, initial: float):
+        self.value = initial
+        self.samples = 0
+
+    def observe(self, value: float):
+        self.value = value if not self.samples else self.value + _EWMA_ALPHA * (value - self.value)
+        self.samples += 1
+
+
+class _Active:
+    __slots__ = ("admitted_at", "last_turn", "turns")
+
+    def __init__(self, now: float):
+        self.admitted_at = now
+        self.last_turn = None
+        self.turns = 0
+
+
+class AdmissionController:
+    """
+    Starting aşamasına giriş kontrolü ve bekleme odası kuyruğu.
+
+    - Kapasite modeli: aşamadaki bir aday, turları arasındaki sürenin (turn_gap) LLM çağrısı kadar
+      kısmında (call_seconds) bir chat slotu kullanır. Kapasite = slot * hedef doluluk * turn_gap / call_seconds;
+      iki süre de gerçek turlardan hareketli ortalamayla ölçülür
+    - Kuyruk adil sıralıdır: anahtar max(geliş, toplantı saati), yani erken gelen aday randevusu daha önce
+      olanların önüne geçemez; eşitlikte geliş sırası
+    - Kabul edilen aday starting aşamasından çıkınca (ya da boşta kalınca) yeri sıradakine geçer
+    - ETA = sıra * ortalama aşama süresi / kapasite
+
+    Durum süreç içinde tutulur; LLM slotları da süreç başına olduğu için her worker kendi kapasitesini yönetir.
+    """
+
+    def __init__(self, slots: int, max_active: int = ADMISSION_MAX_ACTIVE, utilization: float = ADMISSION_UTILIZATION):
+        self.slots = max(slots, 1)
+        self.max_active = max_active
+        self.utilization = utilization
+        self.call_seconds = Ewma(ADMISSION_CALL_SECONDS)
+        self.turn_gap = Ewma(ADMISSION_TURN_GAP_SECONDS)
+        self.stage_seconds = Ewma(ADMISSION_STAGE_SECONDS)
+        self._active = {}   # session_id -> _Active
+        self._queue = []    # sıralı (anahtar, geliş no, session_id)
+        self._queued = {}   # session_id -> (kuyruk kaydı, son sorgu zamanı, geliş zamanı)
+        self._arrivals = itertools.count()
+        self._lock = threading.Lock()
+        self._expired_at = 0.0
+        self.admitted = 0
+        self.expired = 0
+        self.wait_seconds = Ewma(0.0)
+
+    def capacity(self) -> int:
+        if self.max_active > 0:
+            return self.max_active
+        occupancy = self.call_seconds.value / max(self.turn_gap.value, self.call_seconds.value)
+        return max(int(self.slots * self.utilization / occupancy), 1)
+
+    def _expire(self, now: float):
+        # Kuyruk uzunken her sorguda taramamak için saniyede en fazla bir kez
+        if now - self._expired_at < 1:
+            return
+        self._expired_at = now
+        for session_id, active in list(self._active.items()):
+            limit = ADMISSION_CLAIM_SECONDS if active.last_turn is None else ADMISSION_IDLE_SECONDS
+            if now - (active.last_turn or active.admitted_at) > limit:
+                del self._active[session_id]
+                self.expired += 1
+        for session_id, (entry, last_poll, _) in list(self._queued.items()):
+            if now - last_poll > ADMISSION_QUEUE_TTL:
+                self._queue.remove(entry)
+                del self._queued[session_id]
+                self.expired += 1
+
+    def _promote(self, now: float):
+        capacity = self.capacity()
+        while self._queue and len(self._active) < capacity:
+            _, _, session_id = self._queue.pop(0)
+            _, _, arrived = self._queued.pop(session_id)
+            self._admit(session_id, now, now - arrived)
+
+    def _admit(self, session_id: str, now: float, waited: float):
+        self._active[session_id] = _Active(now)
+        self.admitted += 1
+        self.wait_seconds.observe(waited)
+        ADMISSION_WAIT_SECONDS.observe(waited)
+        if waited:
+            logger.info("🚪 Admission: %s %.0f sn bekledikten sonra kabul edildi", session_id, waited)
+
+    def _status(self, session_id: str) -> dict:
+        capacity = self.capacity()
+        status = {
+            "active": len(self._active),
+            "capacity": capacity,
+            "queued": len(self._queue),
+            "poll_seconds": ADMISSION_POLL_SECONDS
+        }
+        if session_id in self._active:
+            return {"admitted": True, "position": 0, "eta_seconds": 0, **status}
+        entry = self._queued[session_id][0]
+        position = bisect.bisect_left(self._queue, entry) + 1
+        return {
+            "admitted": False,
+            "position": position,
+            "eta_seconds": round(position * self.stage_seconds.value / capacity),
+            **status
+        }
+
+    def join(self, session_id: str, meeting_at: float = None) -> dict:
+        """
+        Bekleme odasının sorgusu: kabul edilmişse admitted=True; değilse kuyruğa girer (ya da yerini korur)
+        ve sırası ile tahmini bekleme süresini alır. meeting_at = toplantı saati (epoch), bilinmiyorsa None.
+        """
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            if session_id in self._active:
+                return self._status(session_id)
+            if session_id in self._queued:
+                entry, _, arrived = self._queued[session_id]
+                self._queued[session_id] = (entry, now, arrived)
+            elif not self._queue and len(self._active) < self.capacity():
+                self._admit(session_id, now, 0.0)
+                return self._status(session_id)
+            else:
+                entry = (max(now, meeting_at or now), next(self._arrivals), session_id)
+                bisect.insort(self._queue, entry)
+                self._queued[session_id] = (entry, now, now)
+            self._promote(now)
+            return self._status(session_id)
+
+    def turn_started(self, session_id: str):
+        """Kabul edilmiş adayın yeni turu; iki tur arası süre kapasite modeline yazılır"""
+        now = time.time()
+        with self._lock:
+            active = self._active.get(session_id)
+            if active is None:
+                return
+            if active.last_turn is not None:
+                self.turn_gap.observe(now - active.last_turn)
+            active.last_turn = now
+            active.turns += 1
+
+    def observe_call(self, seconds: float):
+        """LLM çağrısı yapılan starting turunun süresi"""
+        with self._lock:
+            self.call_seconds.observe(seconds)
+
+    def release(self, session_id: str, completed: bool = True):
+        """Aday starting aşamasından çıktı (completed) ya da session silindi; yeri sıradakine geçer"""
+        now = time.time()
+        with self._lock:
+            active = self._active.pop(session_id, None)
+            if active is not None and completed:
+                self.stage_seconds.observe(now - active.admitted_at)
+            entry = self._queued.pop(session_id, None)
+            if entry is not None:
+                self._queue.remove(entry[0])
+            self._expire(now)
+            self._promote(now)
+
+    def is_admitted(self, session_id: str) -> bool:
+        return session_id in self._active
+
+    def stats(self):
+        with self._lock:
+            return {
+                "active": len(self._active),
+                "capacity": self.capacity(),
+                "queued": len(self._queue),
+                "admitted": self.admitted,
+                "expired": self.expired,
+                "call_seconds": round(self.call_seconds.value, 2),
+                "turn_gap_seconds": round(self.turn_gap.value, 2),
+                "stage_seconds": round(self.stage_seconds.value, 1),
+                "avg_wait_seconds": round(self.wait_seconds.value, 1)
+            }
+
+
+class MeetingTimes:
+    """
+    candidate_id -> toplantı saati (epoch).
+    Her bekleme odası sorgusunda sadece adayın kendi kaydı index'ten okunur; ilanın tüm aday listesi
+    kurulmaz, yeniden planlanan toplantı saati de bir sonraki sorguda görülür.
+    """
+
+    def __init__(self, file_manager):
+        self.fm = file_manager
+
+    async def get(self, job_id: str, candidate_id: str):
+        entry = await self.fm.async_reader.get_interview_entry(job_id, candidate_id)
+        meeting = parse_meeting_time((entry or {}).get("meeting_scheduled"))
+        return meeting.timestamp() if meeting else None
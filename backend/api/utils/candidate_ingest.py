@@ -0,0 +1,210 @@
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.catalog import is_job_id
+
+logger = logging.getLogger(__name__)
+
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "1000"))
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "16"))
+# Özette gösterilen en fazla hata satırı (tamamı .rejected.jsonl dosyasındadır)
+MAX_REPORTED_ERRORS = 20
+
+# Toplu yüklemenin CV yazma thread'leri; canlı isteklerin file-io havuzundan ayrıdır
+_ingest_executor = ThreadPoolExecutor(max_workers=INGEST_WORKERS, thread_name_prefix="ingest")
+
+
+def ingest_candidate_id(job_id: str, ingest_id: str, line_no: int) -> str:
+    """
+    Yükleme + satır numarasından türetilen sabit aday ID'si.
+    Çökme sonrası aynı satır yeniden işlendiğinde aynı klasöre yazılır, aday çoğalmaz.
+    """
+    digest = hashlib.sha1(f"{ingest_id}:{line_no}".encode("utf-8")).hexdigest()[:12]
+    return f"{job_id}-{digest}"
+
+
+def _write_checkpoint(path: str, state: dict):
+    """Checkpoint'i atomik yazar - çökme anında yarım dosya kalmaz"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".", suffix=".tmp")
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def parse_record(raw: str, default_job_id: str = None):
+    """
+    Bir JSONL satırını (job_id, cv_data) çiftine çevirir; geçersizse ValueError fırlatır.
+    Satır {"job_id": ..., "cv": {...}} biçiminde ya da doğrudan CV olabilir (ilan default_job_id'den gelir).
+    """
+    try:
+        record = json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Geçersiz JSON: {e.msg}")
+    if not isinstance(record, dict):
+        raise ValueError("Satır bir JSON nesnesi olmalı")
+
+    if "cv" in record:
+        job_id = record.get("job_id") or default_job_id
+        cv_data = record["cv"]
+    else:
+        job_id = default_job_id
+        cv_data = record
+    if not job_id:
+        raise ValueError("job_id eksik")
+    if not is_job_id(job_id):
+        raise ValueError(f"Geçersiz job_id: {job_id}")
+    if not isinstance(cv_data, dict):
+        raise ValueError("cv bir JSON nesnesi olmalı")
+
+    name = cv_data.get("name")
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError("name alanı eksik")
+    personal_info = cv_data.get("personal_info", {})
+    if not isinstance(personal_info, dict):
+        raise ValueError("personal_info bir JSON nesnesi olmalı")
+    email = personal_info.get("email", "")
+    if email and (not isinstance(email, str) or "@" not in email):
+        raise ValueError(f"Geçersiz e-posta: {email}")
+    return job_id, cv_data
+
+
+class CandidateIngestor:
+    """
+    JSONL CV kayıtlarını partiler halinde adaya dönüştürür.
+
+    - Her parti: CV'ler paralel yazılır, ilan başına journal'a tek kayıt eklenir, sonra checkpoint yazılır
+    - Checkpoint son tamamlanan satır numarasını tutar; aynı ingest_id ile yeniden çalıştırıldığında
+      o satıra kadar olan kısım atlanır. Yarım kalan parti sabit aday ID'leriyle güvenle tekrarlanır.
+    - Geçersiz satırlar <checkpoint>.rejected.jsonl dosyasına satır numarası ve hatayla yazılır
+    """
+
+    def __init__(self, file_manager, ingest_id: str, checkpoint_path: str, default_job_id: str = None,
+                 batch_size: int = INGEST_BATCH_SIZE):
+        self.fm = file_manager
+        self.ingest_id = ingest_id
+        self.checkpoint_path = checkpoint_path
+        self.rejected_path = os.path.splitext(checkpoint_path)[0] + ".rejected.jsonl"
+        self.default_job_id = default_job_id
+        self.batch_size = max(batch_size, 1)
+        self._batch = []  # (line_no, job_id, cv_data)
+        self._rejects = []
+        self._known_jobs = {}
+        self._touched_jobs = set()
+        self._lock = threading.Lock()
+        self.line_no = 0
+
+        state = self._load_checkpoint()
+        self.resume_from = state.get("line", 0)
+        self.ingested = state.get("ingested", 0)
+        self.existing = state.get("existing", 0)
+        self.rejected = state.get("rejected", 0)
+        self.errors = state.get("errors", [])
+
+    def _load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return {}
+        if state.get("ingest_id") != self.ingest_id:
+            raise ValueError(f"Checkpoint başka bir yüklemeye ait: {state.get('ingest_id')}")
+        logger.info("⏩ Ingest: %s satır %d'den devam ediyor", self.ingest_id, state.get("line", 0))
+        return state
+
+    def _job_exists(self, job_id: str) -> bool:
+        if job_id not in self._known_jobs:
+            self._known_jobs[job_id] = self.fm.job_exists(job_id)
+        return self._known_jobs[job_id]
+
+    def feed(self, raw: str):
+        """Sıradaki satırı işler; parti dolduğunda commit eder"""
+        with self._lock:
+            self.line_no += 1
+            if self.line_no <= self.resume_from or not raw.strip():
+                return
+            try:
+                job_id, cv_data = parse_record(raw, self.default_job_id)
+                if not self._job_exists(job_id):
+                    raise ValueError(f"İlan bulunamadı: {job_id}")
+            except ValueError as e:
+                self._rejects.append({"line": self.line_no, "error": str(e)})
+            else:
+                self._batch.append((self.line_no, job_id, cv_data))
+            if len(self._batch) + len(self._rejects) >= self.batch_size:
+                self._commit()
+
+    def feed_many(self, lines):
+        for raw in lines:
+            self.feed(raw)
+
+    def _commit(self):
+        by_job = {}
+        for line_no, job_id, cv_data in self._batch:
+            by_job.setdefault(job_id, []).append((ingest_candidate_id(job_id, self.ingest_id, line_no), cv_data))
+        for job_id, candidates in by_job.items():
+            added = self.fm.create_candidate_folders(job_id, candidates, executor=_ingest_executor)
+            self.ingested += added
+            self.existing += len(candidates) - added
+            self._touched_jobs.add(job_id)
+
+        if self._rejects:
+            with open(self.rejected_path, 'a', encoding='utf-8') as f:
+                f.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in self._rejects))
+            self.rejected += len(self._rejects)
+            self.errors.extend(self._rejects[:max(MAX_REPORTED_ERRORS - len(self.errors), 0)])
+
+        self._batch = []
+        self._rejects = []
+        self._save_checkpoint()
+
+    def _save_checkpoint(self, done: bool = False):
+        _write_checkpoint(self.checkpoint_path, {
+            "ingest_id": self.ingest_id,
+            # Gövde kısa kesilmiş bir tekrar denemede checkpoint geri gitmez
+            "line": max(self.line_no, self.resume_from),
+            "ingested": self.ingested,
+            "existing": self.existing,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "done": done,
+            "updated_at": datetime.now().isoformat()
+        })
+
+    def finish(self):
+        """Kalan partiyi commit eder, dokunulan ilanların Interview_list.json'unu compaction ile yazar"""
+        with self._lock:
+            self._commit()
+            for job_id in sorted(self._touched_jobs):
+                self.fm.compact_interview_list(job_id)
+            self._save_checkpoint(done=True)
+            return self.summary()
+
+    def summary(self):
+        return {
+            "ingest_id": self.ingest_id,
+            "lines": self.line_no,
+            "resumed_from": self.resume_from,
+            "ingested": self.ingested,
+            "existing": self.existing,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "jobs": sorted(self._touched_jobs),
+            "checkpoint": self.checkpoint_path
+        }
+
+
+def ingest_file(file_manager, path: str, ingest_id: str = None, default_job_id: str = None,
+                checkpoint_path: str = None, batch_size: int = INGEST_BATCH_SIZE):
+    """JSONL dosyasını satır satır okuyarak yükler (dosya belleğe alınmaz)"""
+    ingest_id = ingest_id or os.path.basename(path)
+    checkpoint_path = checkpoint_path or f"{path}.checkpoint.json"
+    ingestor = CandidateIngestor(file_manager, ingest_id, checkpoint_path, default_job_id, batch_size)
+    with open(path, 'r', encoding='utf-8') as f:
+        ingestor.feed_many(f)
+    return ingestor.finish()
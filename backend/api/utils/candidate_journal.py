@@ -0,0 +1,204 @@
+import os
+import json
+import threading
+from collections import defaultdict
+from utils.file_lock import file_lock
+
+INTERVIEW_LIST_FILE = "Interview_list.json"
+JOURNAL_FILE = "Interview_list.journal.jsonl"
+LOCK_FILE = ".Interview_list.lock"
+
+# Journal en az bu kadar kayıt biriktirmeden compaction yapılmaz
+COMPACT_MIN_RECORDS = int(os.getenv("JOURNAL_COMPACT_MIN_RECORDS", "500"))
+
+
+class CandidateJournal:
+    """
+    Bir ilanın aday listesi için append-only JSONL journal.
+
+    - Yeni aday ve durum güncellemeleri Interview_list.journal.jsonl'e tek satır olarak eklenir
+    - Interview_list.json (base) + journal bellekte candidate_id / status index'ine açılır
+    - Compaction journal'ı base dosyaya geri yazar (mevcut Interview_list.json formatı korunur)
+
+    Yazmalar dosya kilidi altında yapılır; farklı süreçlerin eklediği satırlar
+    bir sonraki okumada offset'ten itibaren okunur.
+    """
+
+    def __init__(self, job_folder: str, write_json):
+        self.job_folder = job_folder
+        self.base_path = os.path.join(job_folder, INTERVIEW_LIST_FILE)
+        self.journal_path = os.path.join(job_folder, JOURNAL_FILE)
+        self.lock_path = os.path.join(job_folder, LOCK_FILE)
+        self._write_json = write_json
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._base_signature = None
+        self._offset = 0
+        self._meta = {}
+        self._candidates = {}
+        self._by_status = defaultdict(set)
+        self._base_count = 0
+        self._pending = 0
+
+    # ---------------- Okuma / index ----------------
+    @staticmethod
+    def _signature(path: str):
+        try:
+            stat = os.stat(path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            return None
+
+    def _reload(self):
+        """Base dosyayı ve journal'ın tamamını baştan okur"""
+        self._base_signature = self._signature(self.base_path)
+        base = {"candidates": []}
+        if self._base_signature is not None:
+            with open(self.base_path, 'r', encoding='utf-8') as f:
+                base = json.load(f)
+
+        self._meta = {k: v for k, v in base.items() if k != "candidates"}
+        self._candidates = {}
+        self._by_status = defaultdict(set)
+        for entry in base.get("candidates", []):
+            self._index(entry)
+        self._base_count = len(self._candidates)
+        self._pending = 0
+        self._offset = 0
+        self._loaded = True
+        self._read_journal()
+
+    def _read_journal(self):
+        """Journal'a son okunan offset'ten sonra eklenen satırları uygular"""
+        try:
+            with open(self.journal_path, 'rb') as f:
+                f.seek(self._offset)
+                chunk = f.read()
+        except FileNotFoundError:
+            return
+        # Yazılmakta olan yarım satırı atla, bir sonraki okumada tamamlanır
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return
+        for line in chunk[:end].splitlines():
+            if line.strip():
+                self._apply(json.loads(line.decode('utf-8')))
+        self._offset += end + 1
+
+    def _refresh(self):
+        """Başka süreçlerin yazdıklarını index'e yansıtır"""
+        if not self._loaded or self._signature(self.base_path) != self._base_signature:
+            self._reload()
+            return
+        journal_signature = self._signature(self.journal_path)
+        journal_size = journal_signature[1] if journal_signature else 0
+        if journal_size < self._offset:
+            # Başka bir süreç compaction yaptı
+            self._reload()
+        elif journal_size > self._offset:
+            self._read_journal()
+
+    def _index(self, entry: dict):
+        candidate_id = entry.get("candidate_id")
+        previous = self._candidates.get(candidate_id)
+        if previous is not None:
+            self._by_status[previous.get("status")].discard(candidate_id)
+        self._candidates[candidate_id] = entry
+        self._by_status[entry.get("status")].add(candidate_id)
+
+    def _apply(self, record: dict):
+        op = record.get("op")
+        if op == "add":
+            self._index(record["entry"])
+        elif op == "update":
+            current = self._candidates.get(record["candidate_id"])
+            if current is None:
+                return
+            self._index({**current, **record["fields"]})
+        self._pending += 1
+
+    def get_entry(self, candidate_id: str):
+        with self._lock:
+            self._refresh()
+            return self._candidates.get(candidate_id)
+
+    def get_candidate_ids_by_status(self, status: str):
+        with self._lock:
+            self._refresh()
+            return sorted(self._by_status.get(status, ()))
+
+    def count(self):
+        with self._lock:
+            self._refresh()
+            return len(self._candidates)
+
+    def snapshot(self):
+        """Interview_list.json formatında birleşik görünüm (base + journal)"""
+        with self._lock:
+            self._refresh()
+            return {**self._meta, "candidates": list(self._candidates.values())}
+
+    # ---------------- Yazma ----------------
+    def _append(self, records: list, skip_existing: bool = False):
+        with self._lock, file_lock(self.lock_path):
+            self._refresh()
+            if skip_existing:
+                records = [r for r in records if r["entry"]["candidate_id"] not in self._candidates]
+            if not records:
+                return 0
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                f.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+            self._read_journal()
+            # Journal base kadar büyüdüğünde compaction - toplam maliyet doğrusal kalır
+            if self._pending >= max(COMPACT_MIN_RECORDS, self._base_count):
+                self._compact_locked()
+            return len(records)
+
+    def add(self, entry: dict):
+        """Yeni aday kaydı ekler"""
+        self._append([{"op": "add", "entry": entry}])
+
+    def add_many(self, entries: list, skip_existing: bool = False):
+        """
+        Birden fazla aday kaydını tek kilit ve tek yazma ile ekler.
+        skip_existing ile zaten kayıtlı candidate_id'ler atlanır. Döndürdüğü: eklenen kayıt sayısı
+        """
+        if not entries:
+            return 0
+        return self._append([{"op": "add", "entry": entry} for entry in entries], skip_existing)
+
+    def update(self, candidate_id: str, fields: dict):
+        """Aday kaydının alanlarını günceller (örn: status, meeting_scheduled)"""
+        self._append([{"op": "update", "candidate_id": candidate_id, "fields": fields}])
+
+    def _compact_locked(self):
+        self._refresh()
+        if self._pending == 0:
+            return
+        self._write_json(self.base_path, {**self._meta, "candidates": list(self._candidates.values())})
+        with open(self.journal_path, 'w', encoding='utf-8'):
+            pass
+        self._base_signature = self._signature(self.base_path)
+        self._base_count = len(self._candidates)
+        self._pending = 0
+        self._offset = 0
+
+    def compact(self):
+        """Journal'ı Interview_list.json'a yazar ve journal'ı boşaltır"""
+        with self._lock, file_lock(self.lock_path):
+            self._compact_locked()
+
+
+_journals = {}
+_journals_lock = threading.Lock()
+
+
+def get_journal(job_folder: str, write_json):
+    """Aynı ilan klasörü için süreç içinde tek journal örneği döndürür"""
+    key = os.path.abspath(job_folder)
+    with _journals_lock:
+        journal = _journals.get(key)
+        if journal is None:
+            journal = CandidateJournal(key, write_json)
+            _journals[key] = journal
+        return journal
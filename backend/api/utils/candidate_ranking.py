@@ -0,0 +1,252 @@
+import os
+import re
+import logging
+import threading
+from datetime import datetime
+
+import numpy as np
+from scipy import sparse
+
+from utils.qna_index import normalize
+
+logger = logging.getLogger(__name__)
+
+RANKING_TOP_N = int(os.getenv("RANKING_TOP_N", "20"))
+# Hashing boyutu (2^18); terim sözlüğü tutulmadığı için yeni adaylar matrisi yeniden kurmadan eklenir
+FEATURE_BITS = 18
+FEATURE_DIM = 1 << FEATURE_BITS
+# Nihai skorda deneyim yılının (asgari şartı karşılama oranı) ağırlığı; kalanı metin benzerliği
+EXPERIENCE_WEIGHT = float(os.getenv("RANKING_EXPERIENCE_WEIGHT", "0.2"))
+
+_PERIOD = re.compile(r"((?:19|20)\d{2})\s*[-–—]\s*((?:19|20)\d{2}|günümüz|halen|devam|present|now)", re.IGNORECASE)
+_MIN_YEARS = re.compile(r"(?:en az|minimum|asgari)\s*(\d{1,2})\s*(?:yıl|sene)", re.IGNORECASE)
+
+
+def _features(terms: list):
+    """
+    Terim + ardışık terim çifti (örn. "google ads") -> (hash sütunları, ham frekanslar).
+    Matris sadece süreç belleğinde tutulduğu için süreç başına tuzlanan hash() yeterli.
+    """
+    tokens = terms + [f"{a} {b}" for a, b in zip(terms, terms[1:])]
+    hashes = np.fromiter(map(hash, tokens), dtype=np.int64, count=len(tokens)) & (FEATURE_DIM - 1)
+    columns, counts = np.unique(hashes, return_counts=True)
+    return columns.astype(np.int32), counts
+
+
+def _texts(value):
+    """İç içe JSON değerindeki tüm metinler"""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _texts(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _texts(item)
+
+
+def cv_terms(cv_data: dict) -> list:
+    """CV'nin eşleşmede kullanılan terimleri; kişisel bilgiler (ad, e-posta, telefon) hariç, beceriler iki kez"""
+    parts = [cv_data.get("position", ""), cv_data.get("summary", "")]
+    parts.extend(_texts(cv_data.get("experience", [])))
+    parts.extend(_texts(cv_data.get("education", [])))
+    parts.extend(_texts(cv_data.get("languages", [])))
+    skills = list(_texts(cv_data.get("skills", [])))
+    parts.extend(skills * 2)
+    return normalize(" ".join(p for p in parts if isinstance(p, str)))
+
+
+def job_terms(job_ad_data: dict, qna_data) -> list:
+    """İlan + Q&A cevapları (sorular her ilanda aynı kalıp olduğu için alınmaz)"""
+    parts = list(_texts(job_ad_data or {}))
+    if isinstance(qna_data, list):
+        parts.extend(str(e.get("cevap", "")) for e in qna_data if isinstance(e, dict))
+    return normalize(" ".join(parts))
+
+
+def experience_years(cv_data: dict) -> float:
+    """experience[].period alanlarından ("2019–2022", "2021 - Günümüz") toplam yıl"""
+    current_year = datetime.now().year
+    total = 0
+    for item in cv_data.get("experience") or []:
+        if not isinstance(item, dict):
+            continue
+        match = _PERIOD.search(str(item.get("period", "")))
+        if match:
+            end = int(match.group(2)) if match.group(2).isdigit() else current_year
+            total += max(end - int(match.group(1)), 0)
+    return float(total)
+
+
+def required_years(job_ad_data: dict, qna_data) -> float:
+    """İlan/Q&A'daki "en az N yıl" ifadelerinin en büyüğü (yoksa 0)"""
+    texts = list(_texts(job_ad_data or {}))
+    if isinstance(qna_data, list):
+        texts.extend(str(e.get("cevap", "")) for e in qna_data if isinstance(e, dict))
+    years = [int(m) for text in texts for m in _MIN_YEARS.findall(text)]
+    return float(max(years)) if years else 0.0
+
+
+class JobMatrix:
+    """
+    Bir ilanın aday matrisi: satır = aday, sütun = hash'lenmiş terim, değer = 1 + log(tf).
+
+    CSR dizileri kapasitesi ikiye katlanan tamponlarda tutulur; aday eklemek satır sonuna yazmaktır.
+    IDF doküman frekanslarından (df) sorgu anında hesaplanır, bu yüzden eklemeler eski satırları değiştirmez.
+    Aynı aday tekrar eklenirse eski satırı pasifleşir.
+    """
+
+    def __init__(self):
+        self.candidate_ids = []
+        self.names = []
+        self._rows = {}  # candidate_id -> satır
+        self._data = np.zeros(1024, dtype=np.float32)
+        self._indices = np.zeros(1024, dtype=np.int32)
+        self._indptr = [0]
+        self._years = np.zeros(64, dtype=np.float32)
+        self._alive = np.zeros(64, dtype=bool)
+        self.df = np.zeros(FEATURE_DIM, dtype=np.int32)
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, candidate_id):
+        return candidate_id in self._rows
+
+    @staticmethod
+    def _grow(array, size: int):
+        if size <= array.size:
+            return array
+        grown = np.zeros(max(size, array.size * 2), dtype=array.dtype)
+        grown[:array.size] = array
+        return grown
+
+    def _row_columns(self, row: int):
+        return self._indices[self._indptr[row]:self._indptr[row + 1]]
+
+    def add(self, candidate_id: str, cv_data: dict):
+        columns, counts = _features(cv_terms(cv_data))
+        previous = self._rows.get(candidate_id)
+        if previous is not None:
+            self._alive[previous] = False
+            self.df[self._row_columns(previous)] -= 1
+
+        row = len(self.candidate_ids)
+        start = self._indptr[-1]
+        end = start + columns.size
+        self._data = self._grow(self._data, end)
+        self._indices = self._grow(self._indices, end)
+        self._indices[start:end] = columns
+        self._data[start:end] = 1 + np.log(counts)
+        self._indptr.append(end)
+        # Sütunlar tekil olduğu için add.at gerekmez
+        self.df[columns] += 1
+
+        self._years = self._grow(self._years, row + 1)
+        self._alive = self._grow(self._alive, row + 1)
+        self._years[row] = experience_years(cv_data)
+        self._alive[row] = True
+        self.candidate_ids.append(candidate_id)
+        self.names.append(cv_data.get("name", ""))
+        self._rows[candidate_id] = row
+
+    def score(self, query_terms: list, min_years: float):
+        """(skorlar, metin benzerliği, deneyim yılı, aktif satır maskesi) - tüm adaylar için vektörel"""
+        rows = len(self.candidate_ids)
+        matrix = sparse.csr_matrix(
+            (self._data[:self._indptr[-1]], self._indices[:self._indptr[-1]], np.asarray(self._indptr, dtype=np.int64)),
+            shape=(rows, FEATURE_DIM)
+        )
+        alive = self._alive[:rows]
+        idf = np.log((1 + len(self)) / (1 + self.df.astype(np.float32))) + 1
+
+        query = np.zeros(FEATURE_DIM, dtype=np.float32)
+        columns, counts = _features(query_terms)
+        query[columns] = (1 + np.log(counts)) * idf[columns]
+        query_norm = float(np.linalg.norm(query)) or 1.0
+
+        # Kosinüs: (X·diag(idf))·q / (‖X·diag(idf)‖ ‖q‖)
+        dots = matrix @ (idf * query)
+        norms = np.sqrt(matrix.multiply(matrix) @ (idf * idf))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            similarity = np.where(norms > 0, dots / (norms * query_norm), 0.0)
+
+        years = self._years[:rows]
+        if min_years > 0:
+            experience = np.minimum(years / min_years, 1.0)
+            scores = (1 - EXPERIENCE_WEIGHT) * similarity + EXPERIENCE_WEIGHT * experience
+        else:
+            scores = similarity
+        return np.where(alive, scores, -np.inf), similarity, years, alive
+
+
+class CandidateRanking:
+    """
+    İlan başına aday sıralaması (LLM çağrısı yok).
+
+    - FileManager'a aday dinleyicisi olarak bağlanır; create_candidate_folder(s) ile eklenen CV'ler matrise eklenir
+    - Başka süreçlerin (toplu yükleme CLI'ı) eklediği adaylar, aday sayısı farklıysa sorgu öncesinde okunup eklenir
+    - İlk sorguda ilanın matrisi mevcut adaylardan kurulur
+    """
+
+    def __init__(self, file_manager):
+        self.fm = file_manager
+        self._jobs = {}
+        self._jobs_lock = threading.Lock()
+        file_manager.add_candidate_listener(self._on_candidates_added)
+
+    def _job(self, job_id: str) -> JobMatrix:
+        with self._jobs_lock:
+            if job_id not in self._jobs:
+                self._jobs[job_id] = JobMatrix()
+            return self._jobs[job_id]
+
+    def _on_candidates_added(self, job_id: str, candidates: list):
+        with self._jobs_lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return  # Henüz sorgulanmamış ilan; ilk sorguda zaten tamamı okunur
+        with job.lock:
+            for candidate_id, cv_data in candidates:
+                job.add(candidate_id, cv_data)
+
+    def _sync(self, job_id: str, job: JobMatrix):
+        """Matriste olmayan adayları depolamadan okuyup ekler"""
+        if self.fm.count_candidates(job_id) == len(job):
+            return
+        added = 0
+        for entry in self.fm.find_candidates(job_id=job_id):
+            candidate_id = entry.get("candidate_id")
+            if candidate_id and candidate_id not in job:
+                job.add(candidate_id, self.fm.get_cv_data(candidate_id))
+                added += 1
+        if added:
+            logger.info("📈 Sıralama: %s matrisine %d aday eklendi (toplam %d)", job_id, added, len(job))
+
+    def top(self, job_id: str, n: int = RANKING_TOP_N):
+        """İlana en uygun n aday (senkron; CPU ve ilk kurulumda disk I/O yapar)"""
+        job_ad_data = self.fm.get_job_ad_data(job_id)
+        qna_data = self.fm.get_qna_data(job_id)
+        min_years = required_years(job_ad_data, qna_data)
+        job = self._job(job_id)
+        with job.lock:
+            self._sync(job_id, job)
+            if not len(job):
+                return {"job_id": job_id, "candidates": 0, "required_years": min_years, "ranking": []}
+            scores, similarity, years, _ = job.score(job_terms(job_ad_data, qna_data), min_years)
+            n = min(n, len(job))
+            best = np.argpartition(-scores, n - 1)[:n]
+            best = best[np.argsort(-scores[best], kind="stable")]
+            ranking = [
+                {
+                    "rank": rank,
+                    "candidate_id": job.candidate_ids[row],
+                    "name": job.names[row],
+                    "score": round(float(scores[row]), 4),
+                    "text_similarity": round(float(similarity[row]), 4),
+                    "experience_years": float(years[row])
+                }
+                for rank, row in enumerate(best, start=1)
+            ]
+            return {"job_id": job_id, "candidates": len(job), "required_years": min_years, "ranking": ranking}
@@ -0,0 +1,97 @@
+import re
+import time
+import threading
+
+# İlan: Genar-00001. Aday: Genar-00001-00001, Genar-00001-a1b2c3d4 (UUID) ve toplu yüklemedeki Genar-00001-<sha1[:12]>
+# Tek bölümlü aday kodu zorunlu; "..", "/" gibi yol parçaları eşleşmez
+_JOB_PART = r"[A-Za-z0-9_]{1,32}-[A-Za-z0-9_]{1,32}"
+_JOB_ID = re.compile(rf"^{_JOB_PART}$")
+_CANDIDATE_ID = re.compile(rf"^({_JOB_PART})-([A-Za-z0-9_]{{1,64}})$")
+
+
+def is_job_id(job_id) -> bool:
+    """İlan ID'si biçiminde mi (disk erişimi yapılmaz)"""
+    return isinstance(job_id, str) and _JOB_ID.match(job_id) is not None
+
+
+def split_candidate_id(candidate_id) -> str:
+    """Aday ID'sinin ilan kısmı; biçim geçersizse None (disk erişimi yapılmaz)"""
+    if not isinstance(candidate_id, str):
+        return None
+    match = _CANDIDATE_ID.match(candidate_id)
+    return match.group(1) if match else None
+
+
+class Catalog:
+    """
+    Veri ağacının bellek içi haritası: ilanlar, adaylar ve her birinde bulunan dosyalar.
+
+    - Başlangıçta bir kez taranır (load); yazmalar FileManager üzerinden anında eklenir
+    - Tarama sürerken yapılan yazmalar kaybolmaz: load mevcut kayıtlarla birleştirir
+    - Pozitif sonuçlar kesindir. Başka süreçlerin (toplu yükleme CLI'ı, diğer worker'lar) yazdıkları
+      katalogda olmayabileceği için "yok" cevabında çağıran taraf diske bakar
+    """
+
+    def __init__(self):
+        self._jobs = {}        # job_id -> {dosya adı, ...}
+        self._candidates = {}  # candidate_id -> (job_id, {dosya adı, ...})
+        self._lock = threading.Lock()
+        self.ready = False
+        self.warm_seconds = None
+
+    def _add(self, job_id: str, candidate_id: str, file_name: str):
+        job_files = self._jobs.setdefault(job_id, set())
+        if not candidate_id:
+            if file_name:
+                job_files.add(file_name)
+            return
+        entry = self._candidates.get(candidate_id)
+        if entry is None:
+            entry = self._candidates[candidate_id] = (job_id, set())
+        if file_name:
+            entry[1].add(file_name)
+
+    def load(self, entries):
+        """Tarama sonucunu ekler: entries = [(job_id, candidate_id | "", dosya adı | None), ...]"""
+        started = time.perf_counter()
+        for job_id, candidate_id, file_name in entries:
+            with self._lock:
+                self._add(job_id, candidate_id, file_name)
+        self.warm_seconds = round(time.perf_counter() - started, 3)
+        self.ready = True
+
+    def add(self, job_id: str, candidate_id: str = "", file_name: str = None):
+        """Yazma sonrası: ilanı/adayı/dosyayı kataloğa ekler"""
+        with self._lock:
+            self._add(job_id, candidate_id, file_name)
+
+    def discard(self, candidate_id: str, file_name: str):
+        """Silinen aday dosyasını katalogdan çıkarır"""
+        with self._lock:
+            entry = self._candidates.get(candidate_id)
+            if entry is not None:
+                entry[1].discard(file_name)
+
+    def has_job_file(self, job_id: str, file_name: str) -> bool:
+        files = self._jobs.get(job_id)
+        return files is not None and file_name in files
+
+    def candidate_job(self, candidate_id: str) -> str:
+        """Adayın ilanı; aday katalogda yoksa None"""
+        entry = self._candidates.get(candidate_id)
+        return entry[0] if entry is not None else None
+
+    def has_file(self, candidate_id: str, file_name: str) -> bool:
+        entry = self._candidates.get(candidate_id)
+        return entry is not None and file_name in entry[1]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "warm_seconds": self.warm_seconds,
+                "jobs": len(self._jobs),
+                "candidates": len(self._candidates),
+                "files": sum(len(files) for files in self._jobs.values())
+                         + sum(len(entry[1]) for entry in self._candidates.values())
+            }
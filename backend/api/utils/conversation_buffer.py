@@ -0,0 +1,140 @@
+import threading
+from collections import OrderedDict
+from itertools import chain, islice
+
+# Özet satırlarında her mesajdan tutulacak en fazla karakter
+SUMMARY_LINE_CHARS = 120
+
+
+def estimate_tokens(text: str) -> int:
+    """Kaba token tahmini (~4 karakter = 1 token), tokenizer çağırmadan"""
+    return len(text) // 4 + 1
+
+
+def render_message(msg: dict) -> str:
+    return f"{'Aday' if msg['sender'] == 'user' else 'Asistan'}: {msg['text']}"
+
+
+class ConversationBuffer:
+    """
+    Konuşma geçmişini artımlı olarak render eder.
+    Her mesaj bir kez render edilir; satırlar ve token sayıları cache'lenir,
+    token bütçesine göre pencere (son mesajlar + eski mesajların özeti) üretilir.
+    """
+
+    def __init__(self):
+        self._messages = []
+        self._lines = []
+        self._tokens = []
+        self._assistant_counts = []  # her index'e kadar (dahil) asistan mesajı sayısı
+        self._last_message = None
+        self._total_tokens = 0
+
+    def __len__(self):
+        return len(self._lines)
+
+    def reset(self):
+        self.__init__()
+
+    def append(self, msg: dict):
+        line = render_message(msg)
+        tokens = estimate_tokens(line)
+        assistant_before = self._assistant_counts[-1] if self._assistant_counts else 0
+        self._messages.append(msg)
+        self._lines.append(line)
+        self._tokens.append(tokens)
+        self._assistant_counts.append(assistant_before + (msg['sender'] != 'user'))
+        self._total_tokens += tokens
+        self._last_message = msg
+
+    def sync(self, *parts):
+        """
+        Buffer'ı verilen mesaj listeleriyle (sırayla birleştirilmiş) eşitler.
+        Sadece yeni eklenen mesajlar render edilir; geçmiş değişmişse baştan kurulur.
+        """
+        total = sum(len(part) for part in parts)
+        synced = len(self._lines)
+        if synced and (total < synced or _message_at(parts, synced - 1) != self._last_message):
+            self.reset()
+            synced = 0
+        for msg in islice(chain(*parts), synced, None):
+            self.append(msg)
+        return self
+
+    def window(self, token_budget: int, summary_ratio: float = 0.25) -> list:
+        """
+        Token bütçesine sığan geçmiş ({"sender", "text"} listesi).
+        Bütçe aşılıyorsa son mesajlar tam, daha eskileri kısaltılmış bir özet olarak verilir;
+        özet listenin başında sender="summary" olan bir kayıttır.
+        """
+        if self._total_tokens <= token_budget:
+            return list(self._messages)
+
+        recent_budget = token_budget - int(token_budget * summary_ratio)
+        start = len(self._lines)
+        used = 0
+        while start > 0 and used + self._tokens[start - 1] <= recent_budget:
+            start -= 1
+            used += self._tokens[start]
+        if start == len(self._lines):
+            # En az son mesaj her zaman gönderilir
+            start -= 1
+            used = self._tokens[start]
+
+        summary = self._summary(start, max(token_budget - used, 0))
+        recent = self._messages[start:]
+        return [{"sender": "summary", "text": summary}] + recent if summary else recent
+
+    def _summary(self, end: int, token_budget: int) -> str:
+        """İlk `end` mesajın kısaltılmış özeti (en yeni mesajlardan geriye doğru)"""
+        if end <= 0:
+            return ""
+        assistant = self._assistant_counts[end - 1]
+        header = f"[Önceki konuşma özeti: {end} mesaj ({assistant} asistan, {end - assistant} aday)]"
+        used = estimate_tokens(header)
+        compact = []
+        for index in range(end - 1, -1, -1):
+            line = self._lines[index]
+            short = line if len(line) <= SUMMARY_LINE_CHARS else line[:SUMMARY_LINE_CHARS].rstrip() + "…"
+            tokens = estimate_tokens(short)
+            if used + tokens > token_budget:
+                break
+            compact.append(short)
+            used += tokens
+        compact.reverse()
+        return "\n".join([header] + compact)
+
+
+def _message_at(parts, index: int):
+    for part in parts:
+        if index < len(part):
+            return part[index]
+        index -= len(part)
+    return None
+
+
+class ConversationBuffers:
+    """Session başına buffer'ları tutan süreç içi LRU kayıt"""
+
+    def __init__(self, max_sessions: int = 10000):
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()  # session_id -> {key: ConversationBuffer}
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str, key: str, *parts) -> ConversationBuffer:
+        """Session'ın `key` buffer'ını verilen mesajlarla eşitleyip döndürür"""
+        with self._lock:
+            buffers = self._sessions.get(session_id)
+            if buffers is None:
+                buffers = {}
+                self._sessions[session_id] = buffers
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            buffer = buffers.setdefault(key, ConversationBuffer())
+            return buffer.sync(*parts)
+
+    def drop(self, session_id: str):
+        """Session'a ait tüm buffer'ları siler"""
+        with self._lock:
+            self._sessions.pop(session_id, None)
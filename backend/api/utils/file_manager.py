@@ -1,14 +1,48 @@
 import os
 import json
 import uuid
+import asyncio
+import logging
+import tempfile
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from utils.json_cache import shared_cache
+from utils.file_lock import file_lock
+from utils.candidate_journal import get_journal
+from utils import transcript_journal
+from utils.catalog import Catalog, split_candidate_id
+from utils.metrics import FILE_IO_SECONDS
 
-class FileManager:
+logger = logging.getLogger(__name__)
+
+def _io_kind(file_path: str) -> str:
+    """Metrik etiketi: dosya adı (JobAd, cv_extraction, ...) - küçük ve sabit bir küme"""
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+# Async interface'lerin disk I/O'yu taşıdığı sınırlı thread pool (tüm FileManager'lar paylaşır)
+_io_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("FILE_IO_WORKERS", "4")),
+    thread_name_prefix="file-io"
+)
+
+class BaseFileManager:
+    """
+    Depolama arka uçlarının ortak kısmı: interface'ler, I/O thread pool'u, katalog, aday dinleyicileri
+    ve diğer okumalardan türetilen yardımcılar. Veriyi okuyan/yazan metotları alt sınıflar tanımlar:
+    FileManager (JSON dosyaları + aday journal'ı) ve SQLiteFileManager.
+    """
     def __init__(self, base_dir="data"):
         self.base_dir = base_dir
         self._reader = None
         self._writer = None
         self._manager = None
+        self._async_reader = None
+        self._async_writer = None
+        self._candidate_listeners = []
+        # İlan/aday/dosya haritası; warm_catalog ile doldurulur, yazmalarda güncellenir
+        self.catalog = Catalog()
     
     @property
     def reader(self):
@@ -30,15 +64,25 @@ class FileManager:
         if self._manager is None:
             self._manager = FileManagerOps(self)
         return self._manager
-        
-    def get_job_data(self, job_id: str, data_type: str):
-        """Job verilerini okur (JobAd, Q&A, Quiz)"""
-        file_path = os.path.join(self.base_dir, job_id, f"{data_type}.json")
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
+    
+    @property
+    def async_reader(self):
+        """Event loop'u bloklamayan okuma interface'i"""
+        if self._async_reader is None:
+            self._async_reader = AsyncFileReader(self)
+        return self._async_reader
+    
+    @property
+    def async_writer(self):
+        """Event loop'u bloklamayan yazma interface'i"""
+        if self._async_writer is None:
+            self._async_writer = AsyncFileWriter(self)
+        return self._async_writer
+    
+    async def run_io(self, func, *args):
+        """Senkron bir I/O fonksiyonunu thread pool'da çalıştırır"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_io_executor, functools.partial(func, *args))
     
     def get_cv_data(self, candidate_id: str):
         """Adayın CV verilerini okur"""
@@ -57,13 +101,157 @@ class FileManager:
         """İş ilanı verilerini okur"""
         return self.get_job_data(job_id, "JobAd")
     
+    def add_candidate_listener(self, callback):
+        """Yeni aday eklendiğinde çağrılacak fonksiyon: callback(job_id, [(candidate_id, cv_data), ...])"""
+        self._candidate_listeners.append(callback)
+    
+    def _notify_candidates_added(self, job_id: str, candidates: list):
+        for callback in self._candidate_listeners:
+            try:
+                callback(job_id, candidates)
+            except Exception as e:
+                logger.error("❌ FileManager: Aday dinleyicisi hatası (%s): %s", job_id, e)
+    
+    @staticmethod
+    def _candidate_entry(candidate_id: str, candidate_data: dict):
+        """Interview_list.json'daki aday kaydı"""
+        return {
+            "candidate_id": candidate_id,
+            "name": candidate_data.get("name", "Unknown"),
+            "email": candidate_data.get("personal_info", {}).get("email", ""),
+            "application_date": datetime.now().isoformat(),
+            "status": "applied"
+        }
+    
+    def _get_paths_from_id(self, candidate_id: str):
+        """Candidate ID'den ilan ve aday klasör yollarını çıkarır"""
+        # Genar-00001-uuid veya Genar-00001-00001 formatını destekler
+        job_id = split_candidate_id(candidate_id)
+        if job_id is None:
+            raise ValueError(f"Invalid candidate_id format: {candidate_id}")
+        
+        # Yolları oluştur
+        job_folder = os.path.join(self.base_dir, job_id)
+        candidate_folder = os.path.join(job_folder, candidate_id)
+        
+        return job_folder, candidate_folder
+    
+    def get_transcript(self, candidate_id: str):
+        """interview_transcript görünümü; journal'dan o an üretilir (kayıt yoksa {})"""
+        records = self.get_transcript_records(candidate_id)
+        return transcript_journal.materialise(candidate_id, records) if records else {}
+    
+    def warm_catalog(self):
+        """Kataloğu veri ağacından doldurur (senkron; başlangıçta thread'de çalıştırılır)"""
+        self.catalog.load(self._scan_catalog())
+        stats = self.catalog.stats()
+        logger.info("🗂️ Katalog hazır: %d ilan, %d aday, %d dosya (%.2f sn)",
+                    stats["jobs"], stats["candidates"], stats["files"], stats["warm_seconds"])
+        return stats
+    
+    def resolve_candidate(self, candidate_id: str):
+        """
+        Aday ID'sinin ilanı; ID geçersizse ya da aday yoksa None.
+        Biçimi bozuk ID için disk erişimi yapılmaz, katalogdaki aday sözlükten bulunur;
+        sadece katalogda olmayan (örn. başka süreçte yüklenmiş) aday için diske bir kez bakılır.
+        """
+        job_id = split_candidate_id(candidate_id)
+        if job_id is None:
+            return None
+        known_job = self.catalog.candidate_job(candidate_id)
+        if known_job is not None:
+            return known_job
+        return job_id if self._probe_candidate(job_id, candidate_id) else None
+
+class FileManager(BaseFileManager):
+    """GENAR ağacını JSON dosyaları olarak tutan depolama; aday listesi ilan başına append-only journal'dadır"""
+    def __init__(self, base_dir="data", cache=None):
+        super().__init__(base_dir=base_dir)
+        self.cache = cache if cache is not None else shared_cache
+    
+    def _write_json(self, file_path: str, data):
+        """JSON'u atomik yazar ve cache kaydını siler (süre metriklere eklenir)"""
+        with FILE_IO_SECONDS.time(op="write", kind=_io_kind(file_path)):
+            self._write_json_atomic(file_path, data)
+        self.cache.invalidate(file_path)
+    
+    def _write_json_atomic(self, file_path: str, data):
+        """JSON'u geçici dosyaya yazıp rename eder - okuyucular yarım dosya görmez"""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        
+    def get_job_data(self, job_id: str, data_type: str):
+        """Job verilerini okur (JobAd, Q&A, Quiz)"""
+        file_path = os.path.join(self.base_dir, job_id, f"{data_type}.json")
+        try:
+            with FILE_IO_SECONDS.time(op="read", kind=data_type):
+                return self.cache.load(file_path)
+        except FileNotFoundError:
+            return {}
+    
+    def list_job_ids(self):
+        """Veri klasöründeki ilan ID'leri (sıralı)"""
+        if not os.path.isdir(self.base_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.base_dir)
+            if not name.startswith(".") and os.path.isdir(os.path.join(self.base_dir, name))
+        )
+    
+    def job_exists(self, job_id: str):
+        """İlanın JobAd.json'u var mı (katalogda varsa disk erişimi yapılmaz)"""
+        if self.catalog.has_job_file(job_id, "JobAd.json"):
+            return True
+        return os.path.isfile(os.path.join(self.base_dir, job_id, "JobAd.json"))
+    
+    def find_candidates(self, status: str = None, job_id: str = None):
+        """İlanlar genelinde Interview_list kayıtları (status ve/veya ilana göre süzülür)"""
+        job_ids = [job_id] if job_id else self.list_job_ids()
+        results = []
+        for current_job in job_ids:
+            for entry in self.get_interview_list_data(current_job).get("candidates", []):
+                if status is None or entry.get("status") == status:
+                    results.append(entry)
+        return results
+    
+    def count_candidates(self, job_id: str):
+        """İlandaki aday sayısı (index'ten)"""
+        if not os.path.isdir(os.path.join(self.base_dir, job_id)):
+            return 0
+        return self.get_candidate_journal(job_id).count()
+    
+    def get_candidate_journal(self, job_id: str):
+        """İlanın aday journal'ını döndürür (Interview_list.json + append-only kayıtlar)"""
+        return get_journal(os.path.join(self.base_dir, job_id), self._write_json)
+    
     def get_interview_list_data(self, job_id: str):
-        """Interview list verilerini okur (meeting link dahil)"""
-        return self.get_job_data(job_id, "Interview_list")
+        """Interview list verilerini okur (meeting link dahil, journal'daki adaylarla birleşik)"""
+        if not os.path.isdir(os.path.join(self.base_dir, job_id)):
+            return {}
+        return self.get_candidate_journal(job_id).snapshot()
+    
+    def get_interview_entry(self, job_id: str, candidate_id: str):
+        """Adayın Interview_list kaydını index'ten döndürür"""
+        return self.get_candidate_journal(job_id).get_entry(candidate_id) or {}
+    
+    def get_candidate_ids_by_status(self, job_id: str, status: str):
+        """Belirli durumdaki adayların ID'lerini index'ten döndürür"""
+        return self.get_candidate_journal(job_id).get_candidate_ids_by_status(status)
     
     def get_meeting_link(self, job_id: str):
         """Meeting link'ini döndürür"""
-        interview_data = self.get_interview_list_data(job_id)
+        # meeting_link journal'a yazılmaz, sadece base dosyada durur
+        interview_data = self.get_job_data(job_id, "Interview_list")
         return interview_data.get("meeting_link", "")
     
     def save_job_data(self, job_id: str, data_type: str, data: dict):
@@ -72,18 +260,47 @@ class FileManager:
         os.makedirs(job_folder, exist_ok=True)
         
         file_path = os.path.join(job_folder, f"{data_type}.json")
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        self._write_json(file_path, data)
+        self.catalog.add(job_id, "", f"{data_type}.json")
+    
+    def update_job_data(self, job_id: str, data_type: str, update):
+        """
+        İlan dosyasını süreçler arası kilit altında diskten okuyup update(data) sonucunu yazar.
+        Birden fazla worker aynı agregayı güncellerken birbirinin yazdığını kaybetmez.
+        """
+        job_folder = os.path.join(self.base_dir, job_id)
+        file_path = os.path.join(job_folder, f"{data_type}.json")
+        with file_lock(os.path.join(job_folder, f".{data_type}.lock")):
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    current = json.load(f)
+            except FileNotFoundError:
+                current = {}
+            data = update(current)
+            self.save_job_data(job_id, data_type, data)
+        return data
     
 
+    def get_root_data(self, data_type: str):
+        """Veri kökündeki dosyayı okur (örn. Company_profile)"""
+        try:
+            return self.cache.load(os.path.join(self.base_dir, f"{data_type}.json"))
+        except FileNotFoundError:
+            return {}
+    
+    def save_root_data(self, data_type: str, data: dict):
+        """Veri kökündeki dosyayı kaydeder"""
+        os.makedirs(self.base_dir, exist_ok=True)
+        self._write_json(os.path.join(self.base_dir, f"{data_type}.json"), data)
+    
     def save_candidate_data(self, job_id: str, candidate_id: str, data_type: str, data: dict):
         """Aday verilerini kaydeder"""
         candidate_folder = os.path.join(self.base_dir, job_id, candidate_id)
         os.makedirs(candidate_folder, exist_ok=True)
         
         file_path = os.path.join(candidate_folder, f"{data_type}.json")
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        self._write_json(file_path, data)
+        self.catalog.add(job_id, candidate_id, f"{data_type}.json")
     
     def create_candidate_folder(self, job_id: str, candidate_data: dict):
         """Yeni aday klasörü oluşturur - UUID ile race condition korumalı"""
@@ -102,50 +319,43 @@ class FileManager:
         
         # Interview list güncelle
         self._update_interview_list(job_folder, candidate_id, candidate_data)
+        self._notify_candidates_added(job_id, [(candidate_id, candidate_data)])
         
         return candidate_folder
     
-    def _update_interview_list(self, job_folder: str, candidate_id: str, candidate_data: dict):
-        """Interview_list.json dosyasını günceller"""
-        interview_list_path = os.path.join(job_folder, "Interview_list.json")
-        
-        # Mevcut listeyi oku
-        if os.path.exists(interview_list_path):
-            with open(interview_list_path, 'r', encoding='utf-8') as f:
-                interview_list = json.load(f)
+    def create_candidate_folders(self, job_id: str, candidates: list, executor=None):
+        """
+        Toplu aday oluşturma: candidates = [(candidate_id, candidate_data), ...]
+        CV dosyaları (executor verilirse paralel) yazıldıktan sonra tüm adaylar journal'a tek kayıtla eklenir.
+        Journal'da zaten olan adaylar tekrar eklenmez; aynı parti yeniden işlenebilir.
+        Döndürdüğü: journal'a yeni eklenen aday sayısı
+        """
+        def write(item):
+            candidate_id, candidate_data = item
+            self.save_candidate_data(job_id, candidate_id, "cv_extraction", candidate_data)
+
+        if executor is None:
+            for item in candidates:
+                write(item)
         else:
-            interview_list = {"candidates": []}
-        
-        # Yeni adayı ekle
-        candidate_entry = {
-            "candidate_id": candidate_id,
-            "name": candidate_data.get("name", "Unknown"),
-            "email": candidate_data.get("personal_info", {}).get("email", ""),
-            "application_date": datetime.now().isoformat(),
-            "status": "applied"
-        }
-        
-        interview_list["candidates"].append(candidate_entry)
-        
-        # Dosyayı kaydet
-        with open(interview_list_path, 'w', encoding='utf-8') as f:
-            json.dump(interview_list, f, ensure_ascii=False, indent=2)
+            list(executor.map(write, candidates))
+
+        entries = [self._candidate_entry(candidate_id, candidate_data) for candidate_id, candidate_data in candidates]
+        added = self.get_candidate_journal(job_id).add_many(entries, skip_existing=True)
+        self._notify_candidates_added(job_id, candidates)
+        return added
     
-    def _get_paths_from_id(self, candidate_id: str):
-        """Candidate ID'den ilan ve aday klasör yollarını çıkarır"""
-        # Genar-00001-uuid veya Genar-00001-00001 formatını destekler
-        parts = candidate_id.split("-")
-        if len(parts) < 3:
-            raise ValueError(f"Invalid candidate_id format: {candidate_id}")
-        
-        # İlan kodu: Genar-00001
-        job_id = f"{parts[0]}-{parts[1]}"
-        
-        # Yolları oluştur
-        job_folder = os.path.join(self.base_dir, job_id)
-        candidate_folder = os.path.join(job_folder, candidate_id)
-        
-        return job_folder, candidate_folder
+    def _update_interview_list(self, job_folder: str, candidate_id: str, candidate_data: dict):
+        """Adayı ilanın journal'ına ekler - Interview_list.json compaction ile güncellenir"""
+        get_journal(job_folder, self._write_json).add(self._candidate_entry(candidate_id, candidate_data))
+    
+    def update_interview_entry(self, job_id: str, candidate_id: str, fields: dict):
+        """Adayın Interview_list kaydını günceller (örn: status, meeting_scheduled)"""
+        self.get_candidate_journal(job_id).update(candidate_id, fields)
+    
+    def compact_interview_list(self, job_id: str):
+        """Journal'daki kayıtları Interview_list.json'a yazar"""
+        self.get_candidate_journal(job_id).compact()
     
     def get_candidate_file_path(self, candidate_id: str, file_name: str):
         """Adayın belirli dosyasının tam yolunu döndürür"""
@@ -153,7 +363,8 @@ class FileManager:
             _, candidate_folder = self._get_paths_from_id(candidate_id)
             file_path = os.path.join(candidate_folder, file_name)
             
-            if os.path.exists(file_path):
+            # Katalogdaki dosya için stat yapılmaz; katalogda olmayan başka süreçte yazılmış olabilir
+            if self.catalog.has_file(candidate_id, file_name) or os.path.exists(file_path):
                 return file_path
             return None
         except Exception:
@@ -161,17 +372,114 @@ class FileManager:
     
     def get_candidate_data(self, candidate_id: str, file_name: str):
         """Adayın JSON dosyasını okur ve dictionary döndürür"""
+        if file_name == f"{transcript_journal.TRANSCRIPT_VIEW}.json":
+            # Journal'ı olmayan eski adaylar için kaydedilmiş dosya okunur
+            transcript = self.get_transcript(candidate_id)
+            if transcript:
+                return transcript
+        
         file_path = self.get_candidate_file_path(candidate_id, file_name)
         
         if not file_path:
             return {}
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with FILE_IO_SECONDS.time(op="read", kind=_io_kind(file_name)):
+                return self.cache.load(file_path)
         except (FileNotFoundError, json.JSONDecodeError):
             return {}
     
+    # ---------------- Transcript journal ----------------
+    def append_transcript(self, job_id: str, candidate_id: str, records: list):
+        """Turun kayıtlarını adayın transcript journal'ına tek yazmayla ekler"""
+        candidate_folder = os.path.join(self.base_dir, job_id, candidate_id)
+        os.makedirs(candidate_folder, exist_ok=True)
+        with FILE_IO_SECONDS.time(op="append", kind="transcript"):
+            with open(os.path.join(candidate_folder, transcript_journal.TRANSCRIPT_JOURNAL_FILE), 'a', encoding='utf-8') as f:
+                f.write(transcript_journal.encode_records(records))
+                if transcript_journal.TRANSCRIPT_FSYNC:
+                    f.flush()
+                    os.fsync(f.fileno())
+        self.catalog.add(job_id, candidate_id, transcript_journal.TRANSCRIPT_JOURNAL_FILE)
+    
+    def get_transcript_records(self, candidate_id: str):
+        """Arşiv + journal kayıtları, yazılma sırasıyla"""
+        try:
+            _, candidate_folder = self._get_paths_from_id(candidate_id)
+        except ValueError:
+            return []
+        records = []
+        with FILE_IO_SECONDS.time(op="read", kind="transcript"):
+            try:
+                with open(os.path.join(candidate_folder, transcript_journal.TRANSCRIPT_ARCHIVE_FILE), 'rb') as f:
+                    records.extend(transcript_journal.read_archive(f.read()))
+            except FileNotFoundError:
+                pass
+            try:
+                with open(os.path.join(candidate_folder, transcript_journal.TRANSCRIPT_JOURNAL_FILE), 'r', encoding='utf-8') as f:
+                    records.extend(transcript_journal.decode_lines(f))
+            except FileNotFoundError:
+                pass
+        return records
+    
+    def archive_transcript(self, job_id: str, candidate_id: str):
+        """
+        Mülakat sonu: journal gzip arşive taşınır (TRANSCRIPT_COMPRESS=0 ise journal olduğu gibi kalır).
+        Arşiv atomik yazılıp sonra journal silinir; arada çökme olursa okuma ikisini birleştirir.
+        """
+        if not transcript_journal.TRANSCRIPT_COMPRESS:
+            return
+        candidate_folder = os.path.join(self.base_dir, job_id, candidate_id)
+        journal_path = os.path.join(candidate_folder, transcript_journal.TRANSCRIPT_JOURNAL_FILE)
+        if not os.path.exists(journal_path):
+            return
+        records = self.get_transcript_records(candidate_id)
+        fd, tmp_path = tempfile.mkstemp(dir=candidate_folder, prefix=".", suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(transcript_journal.build_archive(records))
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, os.path.join(candidate_folder, transcript_journal.TRANSCRIPT_ARCHIVE_FILE))
+        self.catalog.add(job_id, candidate_id, transcript_journal.TRANSCRIPT_ARCHIVE_FILE)
+        os.remove(journal_path)
+        self.catalog.discard(candidate_id, transcript_journal.TRANSCRIPT_JOURNAL_FILE)
+    
+    # ---------------- Katalog ----------------
+    def _scan_catalog(self):
+        """Veri ağacını bir kez gezer: (job_id, candidate_id | "", dosya adı | None)"""
+        for job_id in self.list_job_ids():
+            yield job_id, "", None
+            with os.scandir(os.path.join(self.base_dir, job_id)) as job_entries:
+                for entry in job_entries:
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_file():
+                        yield job_id, "", entry.name
+                    elif entry.is_dir():
+                        yield from self._scan_candidate(job_id, entry.name)
+    
+    def _scan_candidate(self, job_id: str, candidate_id: str):
+        yield job_id, candidate_id, None
+        with os.scandir(os.path.join(self.base_dir, job_id, candidate_id)) as files:
+            for entry in files:
+                if not entry.name.startswith(".") and entry.is_file():
+                    yield job_id, candidate_id, entry.name
+    
+    def _probe_candidate(self, job_id: str, candidate_id: str):
+        """Katalogda olmayan adayı diskte arar; varsa dosyalarıyla kataloğa ekler"""
+        if not os.path.isdir(os.path.join(self.base_dir, job_id, candidate_id)):
+            return False
+        for entry in self._scan_candidate(job_id, candidate_id):
+            self.catalog.add(*entry)
+        return True
+    
+    def get_cache_stats(self):
+        """Okuma cache'inin hit/miss istatistiklerini döndürür"""
+        return self.cache.stats()
+    
+    def invalidate_cache(self, file_path: str):
+        """Dışarıdan değiştirilen bir dosyanın cache kaydını siler"""
+        self.cache.invalidate(file_path)
+    
     def get_all_candidate_files(self, candidate_id: str):
         """Adayın klasöründeki tüm dosyaları listeler"""
         try:
@@ -189,6 +497,31 @@ class FileManager:
         except Exception:
             return []
 
+_shared_file_manager = None
+_shared_lock = threading.Lock()
+
+def get_file_manager(base_dir: str = None):
+    """
+    Süreç genelinde paylaşılan FileManager: app.py ve agent'lar aynı örneği (ve kataloğu) kullanır.
+    İlk çağrıda oluşturulur; agent'lar çağırdığında app.py .env'i yükleyip örneği çoktan oluşturmuştur.
+    """
+    global _shared_file_manager
+    with _shared_lock:
+        if _shared_file_manager is None:
+            _shared_file_manager = create_file_manager(base_dir)
+        return _shared_file_manager
+
+def create_file_manager(base_dir: str = None):
+    """STORAGE_BACKEND ortam değişkenine göre (files | sqlite) FileManager oluşturur"""
+    base_dir = base_dir or os.getenv("DATA_PATH", "../../GENAR")
+    backend = os.getenv("STORAGE_BACKEND", "files").lower()
+    if backend == "sqlite":
+        from utils.sqlite_storage import SQLiteFileManager
+        return SQLiteFileManager(os.getenv("STORAGE_DB_PATH", "genar.db"), base_dir=base_dir)
+    if backend != "files":
+        raise ValueError(f"Bilinmeyen STORAGE_BACKEND: {backend}")
+    return FileManager(base_dir=base_dir)
+
 class FileReader:
     def __init__(self, file_manager):
         self.fm = file_manager
@@ -216,6 +549,36 @@ class FileReader:
     
     def get_meeting_link(self, job_id: str):
         return self.fm.get_meeting_link(job_id)
+    
+    def get_interview_entry(self, job_id: str, candidate_id: str):
+        return self.fm.get_interview_entry(job_id, candidate_id)
+    
+    def get_candidate_ids_by_status(self, job_id: str, status: str):
+        return self.fm.get_candidate_ids_by_status(job_id, status)
+    
+    def list_job_ids(self):
+        return self.fm.list_job_ids()
+    
+    def job_exists(self, job_id: str):
+        return self.fm.job_exists(job_id)
+    
+    def resolve_candidate(self, candidate_id: str):
+        return self.fm.resolve_candidate(candidate_id)
+    
+    def find_candidates(self, status: str = None, job_id: str = None):
+        return self.fm.find_candidates(status, job_id)
+    
+    def count_candidates(self, job_id: str):
+        return self.fm.count_candidates(job_id)
+    
+    def get_transcript(self, candidate_id: str):
+        return self.fm.get_transcript(candidate_id)
+    
+    def get_transcript_records(self, candidate_id: str):
+        return self.fm.get_transcript_records(candidate_id)
+    
+    def get_cache_stats(self):
+        return self.fm.get_cache_stats()
 
 class FileWriter:
     def __init__(self, file_manager):
@@ -224,8 +587,81 @@ class FileWriter:
     def save_job_data(self, job_id: str, data_type: str, data: dict):
         return self.fm.save_job_data(job_id, data_type, data)
     
+    def update_job_data(self, job_id: str, data_type: str, update):
+        return self.fm.update_job_data(job_id, data_type, update)
+    
     def save_candidate_data(self, job_id: str, candidate_id: str, data_type: str, data: dict):
         return self.fm.save_candidate_data(job_id, candidate_id, data_type, data)
+    
+    def append_transcript(self, job_id: str, candidate_id: str, records: list):
+        return self.fm.append_transcript(job_id, candidate_id, records)
+    
+    def archive_transcript(self, job_id: str, candidate_id: str):
+        return self.fm.archive_transcript(job_id, candidate_id)
+
+class AsyncFileReader:
+    """FileReader'ın async karşılığı - okumalar thread pool'da yapılır"""
+    def __init__(self, file_manager):
+        self.fm = file_manager
+    
+    async def get_job_data(self, job_id: str, data_type: str):
+        return await self.fm.run_io(self.fm.get_job_data, job_id, data_type)
+    
+    async def get_cv_data(self, candidate_id: str):
+        return await self.fm.run_io(self.fm.get_cv_data, candidate_id)
+    
+    async def get_qna_data(self, job_id: str):
+        return await self.fm.run_io(self.fm.get_qna_data, job_id)
+    
+    async def get_quiz_data(self, job_id: str):
+        return await self.fm.run_io(self.fm.get_quiz_data, job_id)
+    
+    async def get_job_ad_data(self, job_id: str):
+        return await self.fm.run_io(self.fm.get_job_ad_data, job_id)
+    
+    async def get_candidate_data(self, candidate_id: str, file_name: str):
+        return await self.fm.run_io(self.fm.get_candidate_data, candidate_id, file_name)
+    
+    async def get_interview_list_data(self, job_id: str):
+        return await self.fm.run_io(self.fm.get_interview_list_data, job_id)
+    
+    async def get_interview_entry(self, job_id: str, candidate_id: str):
+        return await self.fm.run_io(self.fm.get_interview_entry, job_id, candidate_id)
+    
+    async def get_meeting_link(self, job_id: str):
+        return await self.fm.run_io(self.fm.get_meeting_link, job_id)
+    
+    async def resolve_candidate(self, candidate_id: str):
+        return await self.fm.run_io(self.fm.resolve_candidate, candidate_id)
+    
+    async def job_exists(self, job_id: str):
+        return await self.fm.run_io(self.fm.job_exists, job_id)
+    
+    async def get_transcript_records(self, candidate_id: str):
+        return await self.fm.run_io(self.fm.get_transcript_records, candidate_id)
+    
+    def get_cache_stats(self):
+        return self.fm.get_cache_stats()
+
+class AsyncFileWriter:
+    """FileWriter'ın async karşılığı - yazmalar thread pool'da atomik yapılır"""
+    def __init__(self, file_manager):
+        self.fm = file_manager
+    
+    async def save_job_data(self, job_id: str, data_type: str, data: dict):
+        return await self.fm.run_io(self.fm.save_job_data, job_id, data_type, data)
+    
+    async def update_job_data(self, job_id: str, data_type: str, update):
+        return await self.fm.run_io(self.fm.update_job_data, job_id, data_type, update)
+    
+    async def save_candidate_data(self, job_id: str, candidate_id: str, data_type: str, data: dict):
+        return await self.fm.run_io(self.fm.save_candidate_data, job_id, candidate_id, data_type, data)
+    
+    async def append_transcript(self, job_id: str, candidate_id: str, records: list):
+        return await self.fm.run_io(self.fm.append_transcript, job_id, candidate_id, records)
+    
+    async def archive_transcript(self, job_id: str, candidate_id: str):
+        return await self.fm.run_io(self.fm.archive_transcript, job_id, candidate_id)
 
 class FileManagerOps:
     def __init__(self, file_manager):
@@ -234,8 +670,20 @@ class FileManagerOps:
     def create_candidate_folder(self, job_id: str, candidate_data: dict):
         return self.fm.create_candidate_folder(job_id, candidate_data)
     
+    def create_candidate_folders(self, job_id: str, candidates: list, executor=None):
+        return self.fm.create_candidate_folders(job_id, candidates, executor)
+    
     def get_candidate_file_path(self, candidate_id: str, file_name: str):
         return self.fm.get_candidate_file_path(candidate_id, file_name)
     
     def get_all_candidate_files(self, candidate_id: str):
-        return self.fm.get_all_candidate_files(candidate_id)
\ No newline at end of file
+        return self.fm.get_all_candidate_files(candidate_id)
+    
+    def update_interview_entry(self, job_id: str, candidate_id: str, fields: dict):
+        return self.fm.update_interview_entry(job_id, candidate_id, fields)
+    
+    def compact_interview_list(self, job_id: str):
+        return self.fm.compact_interview_list(job_id)
+    
+    def warm_catalog(self):
+        return self.fm.warm_catalog()
\ No newline at end of file
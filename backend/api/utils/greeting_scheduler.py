@@ -0,0 +1,102 @@
+import os
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from utils.logging_setup import bind_context
+
+logger = logging.getLogger(__name__)
+
+GREETING_PREWARM = os.getenv("GREETING_PREWARM", "1") != "0"
+# Toplantısı bu kadar saat içinde olan adayların karşılaması önceden üretilir
+GREETING_LEAD_HOURS = float(os.getenv("GREETING_LEAD_HOURS", "24"))
+GREETING_SCAN_SECONDS = float(os.getenv("GREETING_SCAN_SECONDS", "300"))
+# Toplantı saati geçmiş ama mülakata hâlâ girilebilecek adaylar da kapsanır
+GREETING_GRACE_HOURS = 2
+
+
+def parse_meeting_time(value):
+    """meeting_scheduled değerini ("2024-11-14T10:00:00.000Z") UTC datetime'a çevirir, okunamazsa None"""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.astimezone()
+
+
+class GreetingScheduler:
+    """
+    Yaklaşan toplantıları periyodik olarak tarar ve adayların ilk karşılama mesajını önceden ürettirir.
+    Üretim/geçerlilik kontrolü `prewarm` fonksiyonundadır (async candidate_id -> bool);
+    CV veya ilan değiştiyse karşılama orada yeniden üretilir.
+    """
+
+    def __init__(self, file_manager, prewarm, lead_hours: float = GREETING_LEAD_HOURS,
+                 interval: float = GREETING_SCAN_SECONDS):
+        self.fm = file_manager
+        self._prewarm = prewarm
+        self.lead = timedelta(hours=lead_hours)
+        self.interval = interval
+        self._task = None
+        self.scans = 0
+        self.ready = 0
+        self.failures = 0
+
+    def upcoming_candidates(self, now=None):
+        """Toplantısı [now - grace, now + lead] aralığında olan aday ID'leri"""
+        now = now or datetime.now(timezone.utc)
+        earliest = now - timedelta(hours=GREETING_GRACE_HOURS)
+        latest = now + self.lead
+        candidate_ids = []
+        for job_id in self.fm.list_job_ids():
+            for entry in self.fm.get_interview_list_data(job_id).get("candidates", []):
+                meeting = parse_meeting_time(entry.get("meeting_scheduled"))
+                if meeting and earliest <= meeting <= latest:
+                    candidate_ids.append(entry["candidate_id"])
+        return candidate_ids
+
+    async def scan(self):
+        """Tek tarama: yaklaşan adayların karşılamalarını sırayla hazırlar"""
+        self.scans += 1
+        candidate_ids = await self.fm.run_io(self.upcoming_candidates)
+        for candidate_id in candidate_ids:
+            bind_context(candidate_id=candidate_id)
+            try:
+                if await self._prewarm(candidate_id):
+                    self.ready += 1
+            except Exception as e:
+                self.failures += 1
+                logger.error("❌ Greeting Scheduler: %s için karşılama üretilemedi: %s", candidate_id, e)
+        return candidate_ids
+
+    async def _run(self):
+        while True:
+            try:
+                await self.scan()
+            except Exception as e:
+                logger.error("❌ Greeting Scheduler: Tarama hatası: %s", e)
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("🌅 Greeting Scheduler: Her %.0f sn'de bir %s içindeki toplantılar taranıyor", self.interval, self.lead)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self):
+        return {
+            "running": self._task is not None,
+            "scans": self.scans,
+            "ready": self.ready,
+            "failures": self.failures
+        }
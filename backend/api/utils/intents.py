@@ -0,0 +1,59 @@
+import re
+
+# Kapanış anlamı taşıyan kelimeler (tam kelime olarak aranır, "yoksa" / "hayırlı" eşleşmez)
+CLOSING_KEYWORDS = {
+    "yok", "yoktur", "hayır", "teşekkürler", "teşekkür", "sağol", "sağolun",
+    "tamamdır", "bitsin", "yeterli"
+}
+# Kapanış cümlelerinde anlamı değiştirmeyen dolgu kelimeleri
+CLOSING_FILLERS = {
+    "başka", "sorum", "sorumuz", "soru", "bir", "şey", "şeyim", "ederim", "ediyorum", "çok",
+    "bu", "kadar", "şimdilik", "her", "için", "de", "da", "ben", "benim", "gayet", "net",
+    "açık", "evet", "anladım", "tamam", "iyi", "günler", "peki", "o", "zaman",
+    "eklemek", "istediğim", "hepsi", "size", "ilginiz"
+}
+
+# Mülakata geçmeye hazır olduğunu belirten kelimeler
+READY_KEYWORDS = {"hazırım", "hazırız", "başlayalım", "başlayabiliriz", "geçelim", "geçebiliriz"}
+READY_FILLERS = {"evet", "ben", "tamam", "o", "zaman", "artık", "hadi", "şimdi", "bence", "hazır", "olarak", "ise"}
+
+# Soru ekleri - bu kelimeleri içeren mesaj soru sayılır ("yok mu?")
+QUESTION_PARTICLES = {"mi", "mı", "mu", "mü", "misiniz", "mısınız", "musunuz", "müsünüz", "miyim", "mıyım"}
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_SAG_OL = re.compile(r"\bsağ\s+ol", re.UNICODE)
+
+
+def tr_lower(text: str) -> str:
+    """Türkçe kurallarıyla küçük harfe çevirir (I -> ı, İ -> i)"""
+    return text.replace("I", "ı").replace("İ", "i").lower()
+
+
+def tokenize(text: str) -> list:
+    # "sağ ol(un)" tek kelime olarak değerlendirilir
+    return _WORD.findall(_SAG_OL.sub("sağol", tr_lower(text)))
+
+
+def is_question(text: str) -> bool:
+    return "?" in text or any(token in QUESTION_PARTICLES for token in tokenize(text))
+
+
+def has_closing_word(text: str) -> bool:
+    """Mesajda kapanış kelimesi var mı (soru cümleleri hariç)"""
+    if is_question(text):
+        return False
+    return any(token in CLOSING_KEYWORDS for token in tokenize(text))
+
+
+def _only(tokens: list, keywords: set, fillers: set) -> bool:
+    return bool(tokens) and any(t in keywords for t in tokens) and all(t in keywords or t in fillers for t in tokens)
+
+
+def is_plain_closing(text: str) -> bool:
+    """Mesaj sadece bir kapanış ifadesi mi ("yok, teşekkürler", "başka sorum yok")"""
+    return not is_question(text) and _only(tokenize(text), CLOSING_KEYWORDS, CLOSING_FILLERS)
+
+
+def is_plain_ready(text: str) -> bool:
+    """Mesaj sadece hazır olduğunu mu belirtiyor ("hazırım", "evet başlayalım")"""
+    return not is_question(text) and _only(tokenize(text), READY_KEYWORDS, READY_FILLERS)
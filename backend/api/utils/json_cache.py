@@ -0,0 +1,81 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+
+
+class JsonCache:
+    """
+    Yol bazlı, mtime/size ile doğrulanan LRU JSON okuma cache'i.
+    Dönen veri cache'teki nesnenin kendisidir; çağıran taraf değiştirmemelidir.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # path -> (mtime_ns, size, data)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(file_path: str):
+        return os.path.abspath(file_path)
+
+    def load(self, file_path: str):
+        """
+        Dosyayı cache üzerinden okur.
+        Dosya yoksa FileNotFoundError, bozuksa json.JSONDecodeError fırlatır (json.load gibi).
+        """
+        key = self._key(file_path)
+        stat = os.stat(key)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[:2] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        with open(key, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        with self._lock:
+            self._entries[key] = (signature[0], signature[1], data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return data
+
+    def invalidate(self, file_path: str):
+        """Yazma sonrası ilgili dosyanın cache kaydını siler"""
+        key = self._key(file_path)
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Cache istatistiklerini döndürür"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+
+# Tüm FileManager örnekleri (app.py ve agent'lar) aynı cache'i paylaşır
+shared_cache = JsonCache(max_entries=int(os.getenv("FILE_CACHE_SIZE", "256")))
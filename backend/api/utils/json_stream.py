@@ -0,0 +1,71 @@
+import re
+import json
+
+
+class JsonArrayItems:
+    """
+    Parça parça gelen JSON metnindeki bir dizinin ({"questions": [...]} ya da doğrudan [...])
+    elemanlarını, her nesne kapanır kapanmaz döndürür.
+
+    - Dizi öncesindeki metin ve kod bloğu işaretleri (```json) yok sayılır
+    - Metin içindeki süslü parantez/tırnaklar string ve kaçış durumu izlenerek atlanır
+    - Tek başına parse edilemeyen eleman atlanır ve `invalid` sayacı artar; sonraki elemanlar etkilenmez
+    """
+
+    def __init__(self, key: str = "questions"):
+        self._start = re.compile(r'"%s"\s*:\s*\[|^\s*(?:```(?:json)?\s*)?\[' % re.escape(key))
+        self._head = ""
+        self._in_array = False
+        self._item = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self.done = False
+        self.invalid = 0
+
+    def feed(self, chunk: str) -> list:
+        """Yeni metin parçasını işler; bu parçayla tamamlanan elemanları döndürür"""
+        if self.done:
+            return []
+        if not self._in_array:
+            self._head += chunk
+            match = self._start.search(self._head)
+            if match is None:
+                return []
+            self._in_array = True
+            chunk = self._head[match.end():]
+            self._head = ""
+
+        items = []
+        for char in chunk:
+            if self._depth == 0:
+                # Elemanlar arası: virgül/boşluk atlanır, ']' dizinin sonudur
+                if char == "{":
+                    self._depth = 1
+                    self._item = [char]
+                elif char == "]":
+                    self.done = True
+                    break
+                continue
+
+            self._item.append(char)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        items.append(json.loads("".join(self._item)))
+                    except json.JSONDecodeError:
+                        self.invalid += 1
+                    self._item = []
+        return items
@@ -0,0 +1,307 @@
+import os
+import re
+import time
+import random
+import asyncio
+import logging
+import itertools
+from contextlib import asynccontextmanager
+
+import httpx
+from groq import (
+    AsyncGroq, DefaultAsyncHttpxClient, RateLimitError, APITimeoutError, APIConnectionError, APIStatusError
+)
+
+from utils.metrics import (
+    LLM_REQUEST_SECONDS, LLM_FIRST_TOKEN_SECONDS, LLM_QUEUE_SECONDS, LLM_RETRIES, LLM_FAILURES, observe_usage
+)
+from utils.token_budget import record_usage
+
+logger = logging.getLogger(__name__)
+
+MODEL = "openai/gpt-oss-120b"
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+# Bu kadar slot her zaman canlı sohbet turlarına ayrılır; arka plan işleri (quiz üretimi) kalanı kullanır
+LLM_CHAT_RESERVED = int(os.getenv("LLM_CHAT_RESERVED", "2"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "20"))
+
+# Öncelik şeritleri: küçük sayı önce çalışır
+PRIORITY_CHAT = 0
+PRIORITY_BACKGROUND = 1
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_duration(value) -> float:
+    """'2', '7.66s', '2m59.56s', '150ms' gibi rate limit süreleri -> saniye (okunamazsa 0)"""
+    if not value:
+        return 0.0
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in _DURATION_PART.findall(value))
+
+
+def retry_after(error) -> float:
+    """Sağlayıcının hata yanıtında önerdiği bekleme süresi (retry-after / x-ratelimit-reset-*)"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return 0.0
+    headers = response.headers
+    return max(
+        parse_duration(headers.get("retry-after")),
+        parse_duration(headers.get("x-ratelimit-reset-requests")) if isinstance(error, RateLimitError) else 0.0,
+        parse_duration(headers.get("x-ratelimit-reset-tokens")) if isinstance(error, RateLimitError) else 0.0,
+    )
+
+
+def is_retryable(error) -> bool:
+    if isinstance(error, (RateLimitError, APITimeoutError, APIConnectionError, asyncio.TimeoutError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+def error_reason(error) -> str:
+    """Metrik etiketi olarak kullanılan kısa hata sınıfı"""
+    if isinstance(error, RateLimitError):
+        return "rate_limit"
+    if isinstance(error, (APITimeoutError, asyncio.TimeoutError)):
+        return "timeout"
+    if isinstance(error, APIConnectionError):
+        return "connection"
+    if isinstance(error, APIStatusError):
+        return "server_error" if error.status_code >= 500 else "client_error"
+    return "other"
+
+
+def create_client(api_key: str, base_url: str = None) -> AsyncGroq:
+    """
+    Tüm agent'ların paylaştığı AsyncGroq istemcisi.
+    Tekrar denemeleri gateway yaptığı için SDK'nın kendi retry'ı kapalıdır;
+    bağlantı havuzu eşzamanlılık sınırına göre boyutlandırılır ve bağlantılar yeniden kullanılır.
+    """
+    limits = httpx.Limits(
+        max_connections=LLM_MAX_CONCURRENCY * 2,
+        max_keepalive_connections=LLM_MAX_CONCURRENCY,
+        keepalive_expiry=60
+    )
+    return AsyncGroq(
+        api_key=api_key,
+        base_url=base_url,
+        max_retries=0,
+        timeout=LLM_TIMEOUT_SECONDS,
+        http_client=DefaultAsyncHttpxClient(limits=limits)
+    )
+
+
+class _PrioritySlots:
+    """
+    Öncelikli semafor: boşalan slot bekleyenlerden en yüksek öncelikliye (aynı öncelikte ilk gelene) verilir.
+    Arka plan işleri en fazla `limit - reserved` slot kullanabilir.
+    """
+
+    def __init__(self, limit: int, reserved: int):
+        self.limit = max(limit, 1)
+        self.background_limit = max(self.limit - max(reserved, 0), 1)
+        self.active = {PRIORITY_CHAT: 0, PRIORITY_BACKGROUND: 0}
+        self._waiters = []  # (priority, seq, future) - sıralı tutulur
+        self._seq = itertools.count()
+
+    def _can_run(self, priority: int) -> bool:
+        if sum(self.active.values()) >= self.limit:
+            return False
+        return priority == PRIORITY_CHAT or self.active[PRIORITY_BACKGROUND] < self.background_limit
+
+    def waiting(self, priority: int) -> int:
+        return sum(1 for p, _, _ in self._waiters if p == priority)
+
+    async def acquire(self, priority: int):
+        # Aynı veya daha yüksek öncelikte bekleyen varsa sıraya girilir
+        if self._can_run(priority) and not any(p <= priority for p, _, _ in self._waiters):
+            self.active[priority] += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        waiter = (priority, next(self._seq), future)
+        self._waiters.append(waiter)
+        self._waiters.sort(key=lambda w: w[:2])
+        try:
+            await future
+        except asyncio.CancelledError:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif future.done() and not future.cancelled():
+                # Slot verildikten hemen sonra iptal edildi - slotu geri bırak
+                self.release(priority)
+            raise
+
+    def release(self, priority: int):
+        self.active[priority] -= 1
+        self._wake()
+
+    def _wake(self):
+        for waiter in list(self._waiters):
+            priority, _, future = waiter
+            if future.done():
+                self._waiters.remove(waiter)
+                continue
+            if self._can_run(priority):
+                self._waiters.remove(waiter)
+                self.active[priority] += 1
+                future.set_result(None)
+            elif priority == PRIORITY_CHAT:
+                # Toplam kapasite dolu - daha düşük öncelikliler de bekler
+                break
+
+
+class LLMGateway:
+    """
+    Tüm agent'ların LLM çağrılarını yaptığı tek nokta.
+
+    - Eşzamanlı çağrı sınırı ve öncelik şeritleri (sohbet turları quiz üretiminin önüne geçer)
+    - 429/5xx/timeout hatalarında jitter'lı üstel bekleme; rate limit başlıkları dikkate alınır
+      ve 429 sonrası tüm çağrılar bekleme süresi dolana kadar durur (kaskad 429'ları önler)
+    - Çağrı başına zaman aşımı
+    """
+
+    def __init__(self, client, max_concurrency: int = LLM_MAX_CONCURRENCY, chat_reserved: int = LLM_CHAT_RESERVED,
+                 max_retries: int = LLM_MAX_RETRIES, timeout: float = LLM_TIMEOUT_SECONDS):
+        self.client = client
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._slots = _PrioritySlots(max_concurrency, chat_reserved)
+        self._cooldown_until = 0.0
+        self.calls = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.failures = 0
+
+    @asynccontextmanager
+    async def _slot(self, priority: int, agent: str):
+        """
+        429 cooldown'u slot alınmadan beklenir; beklerken slot tutulmaz.
+        Slot beklenirken başka bir çağrı yeni cooldown başlattıysa slot bırakılıp tekrar beklenir.
+        """
+        with LLM_QUEUE_SECONDS.time(agent=agent, priority="chat" if priority == PRIORITY_CHAT else "background"):
+            while True:
+                await self._wait_cooldown()
+                await self._slots.acquire(priority)
+                if self._cooldown_until <= time.monotonic():
+                    break
+                self._slots.release(priority)
+        try:
+            yield
+        finally:
+            self._slots.release(priority)
+
+    async def _wait_cooldown(self):
+        delay = self._cooldown_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _backoff(self, attempt: int, error) -> float:
+        delay = random.uniform(0.5, 1.0) * min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * 2 ** attempt)
+        if isinstance(error, RateLimitError):
+            self.rate_limited += 1
+            delay = max(delay, min(retry_after(error), LLM_BACKOFF_MAX))
+            self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+        return delay
+
+    async def _create(self, messages: list, agent: str, priority: int, timeout, params: dict):
+        async with self._slot(priority, agent):
+            self.calls += 1
+            completion = await asyncio.wait_for(
+                self.client.chat.completions.create(messages=messages, model=MODEL, timeout=timeout, **params),
+                timeout + 1
+            )
+        choices = getattr(completion, "choices", None)
+        observe_usage(agent, getattr(completion, "usage", None), choices[0].finish_reason if choices else None)
+        output = choices[0].message.content if choices else None
+        record_usage(getattr(completion, "usage", None), messages, len(output or ""))
+        return completion
+
+    def _retry(self, agent: str, attempt: int, error) -> float:
+        delay = self._backoff(attempt, error)
+        self.retries += 1
+        LLM_RETRIES.inc(agent=agent, reason=error_reason(error))
+        return delay
+
+    def _fail(self, agent: str, error):
+        self.failures += 1
+        LLM_FAILURES.inc(agent=agent, reason=error_reason(error))
+
+    async def complete(self, messages: list, agent: str, priority: int = PRIORITY_CHAT, timeout: float = None, **params):
+        """Stream'siz chat completion; tekrar denenebilir hatalarda en fazla max_retries kez yeniden dener"""
+        timeout = timeout or self.timeout
+        with LLM_REQUEST_SECONDS.time(agent=agent, mode="complete"):
+            for attempt in range(self.max_retries + 1):
+                try:
+                    return await self._create(messages, agent, priority, timeout, params)
+                except Exception as e:
+                    if not is_retryable(e) or attempt == self.max_retries:
+                        self._fail(agent, e)
+                        raise
+                    delay = self._retry(agent, attempt, e)
+                    logger.warning("🔁 LLM Gateway: %s çağrısı %.2f sn sonra tekrar denenecek (%s)", agent, delay, type(e).__name__)
+                    await asyncio.sleep(delay)
+
+    async def stream(self, messages: list, agent: str, priority: int = PRIORITY_CHAT, timeout: float = None, **params):
+        """
+        Stream eden chat completion; metin parçalarını üretir.
+        Tekrar deneme sadece ilk parça gelmeden önce yapılır; slot stream bitene kadar tutulur.
+        """
+        timeout = timeout or self.timeout
+        started = time.perf_counter()
+        for attempt in range(self.max_retries + 1):
+            has_output = False
+            usage = finish_reason = None
+            output_chars = 0
+            try:
+                async with self._slot(priority, agent):
+                    self.calls += 1
+                    stream = await asyncio.wait_for(
+                        self.client.chat.completions.create(messages=messages, model=MODEL, timeout=timeout, stream=True, **params),
+                        timeout + 1
+                    )
+                    async for chunk in stream:
+                        # Groq son parçada kullanım bilgisini x_groq.usage içinde gönderir
+                        usage = getattr(chunk, "usage", None) or getattr(getattr(chunk, "x_groq", None), "usage", None) or usage
+                        if chunk.choices and chunk.choices[0].finish_reason:
+                            finish_reason = chunk.choices[0].finish_reason
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                        if delta:
+                            if not has_output:
+                                LLM_FIRST_TOKEN_SECONDS.observe(time.perf_counter() - started, agent=agent)
+                            has_output = True
+                            output_chars += len(delta)
+                            yield delta
+                observe_usage(agent, usage, finish_reason)
+                record_usage(usage, messages, output_chars)
+                LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, agent=agent, mode="stream")
+                return
+            except Exception as e:
+                if has_output or not is_retryable(e) or attempt == self.max_retries:
+                    self._fail(agent, e)
+                    LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, agent=agent, mode="stream")
+                    raise
+                delay = self._retry(agent, attempt, e)
+                logger.warning("🔁 LLM Gateway: %s stream'i %.2f sn sonra tekrar denenecek (%s)", agent, delay, type(e).__name__)
+                await asyncio.sleep(delay)
+
+    def stats(self):
+        return {
+            "max_concurrency": self._slots.limit,
+            "background_limit": self._slots.background_limit,
+            "active": {"chat": self._slots.active[PRIORITY_CHAT], "background": self._slots.active[PRIORITY_BACKGROUND]},
+            "waiting": {"chat": self._slots.waiting(PRIORITY_CHAT), "background": self._slots.waiting(PRIORITY_BACKGROUND)},
+            "calls": self.calls,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "failures": self.failures,
+            "cooldown_remaining": round(max(self._cooldown_until - time.monotonic(), 0.0), 2)
+        }
@@ -0,0 +1,141 @@
+import os
+import sys
+import json
+import queue
+import atexit
+import random
+import logging
+import contextvars
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# Her kayda eklenen istek bağlamı; FastAPI'de her istek kendi context kopyasında çalışır
+_session_id = contextvars.ContextVar("session_id", default="-")
+_candidate_id = contextvars.ContextVar("candidate_id", default="-")
+
+# Prompt/yanıt gövdeleri için kesme ve örnekleme ayarları (setup_logging ortamdan okur)
+_payload_chars = 200
+_payload_sample_rate = 1.0
+
+_listener = None
+_handler = None
+
+
+def bind_context(session_id: str = None, candidate_id: str = None):
+    """Bu istek/görev içindeki tüm log kayıtlarına session_id ve candidate_id ekler"""
+    if session_id is not None:
+        _session_id.set(session_id)
+    if candidate_id is not None:
+        _candidate_id.set(candidate_id)
+
+
+class Payload:
+    """
+    Prompt/yanıt gibi uzun metinleri log'a tembel olarak ekler.
+    Metin sadece kayıt gerçekten yazılacaksa kesilir; örnekleme dışında kalırsa sadece uzunluğu yazılır.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self):
+        text = self.value if isinstance(self.value, str) else str(self.value)
+        if _payload_sample_rate < 1.0 and random.random() >= _payload_sample_rate:
+            return f"<{len(text)} karakter>"
+        if _payload_chars and len(text) > _payload_chars:
+            return f"{text[:_payload_chars]}… (+{len(text) - _payload_chars} karakter)"
+        return text
+
+
+def payload(value) -> Payload:
+    return Payload(value)
+
+
+class ContextFilter(logging.Filter):
+    """Kayıt oluşturulduğu anda (çağıran görevde) bağlam alanlarını ekler"""
+
+    def filter(self, record):
+        record.session_id = _session_id.get()
+        record.candidate_id = _candidate_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Satır başına bir JSON nesnesi (log toplayıcılar için)"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "session_id": getattr(record, "session_id", "-"),
+            "candidate_id": getattr(record, "candidate_id", "-")
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """Kuyruk doluysa kaydı bekletmeden düşürür; event loop log yüzünden hiç bloklanmaz"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def parse_levels(spec: str) -> dict:
+    """'agents.starting_agent=DEBUG,utils.llm_gateway=WARNING' -> {logger adı: seviye}"""
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.strip().partition("=")
+        if name and level:
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging():
+    """
+    Kök logger'a kuyruklu handler kurar; kayıtlar arka plan thread'inde biçimlenip yazılır.
+    Ayarlar ortam değişkenlerinden okunur (LOG_LEVEL, LOG_LEVELS, LOG_FORMAT, LOG_PAYLOAD_*, LOG_QUEUE_SIZE).
+    Birden fazla çağrılırsa sadece ilki etkilidir.
+    """
+    global _listener, _handler, _payload_chars, _payload_sample_rate
+    if _listener is not None:
+        return
+
+    _payload_chars = int(os.getenv("LOG_PAYLOAD_CHARS", "200"))
+    _payload_sample_rate = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "1"))
+
+    if os.getenv("LOG_FORMAT", "text").lower() == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(session_id)s] %(message)s")
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(formatter)
+
+    _handler = _DroppingQueueHandler(queue.Queue(maxsize=int(os.getenv("LOG_QUEUE_SIZE", "10000"))))
+    _handler.addFilter(ContextFilter())
+    _listener = QueueListener(_handler.queue, output, respect_handler_level=False)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root = logging.getLogger()
+    root.addHandler(_handler)
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    for name, level in parse_levels(os.getenv("LOG_LEVELS", "")).items():
+        logging.getLogger(name).setLevel(level)
+
+
+def dropped_records() -> int:
+    """Kuyruk dolu olduğu için yazılamayan kayıt sayısı"""
+    return _handler.dropped if _handler is not None else 0
@@ -0,0 +1,64 @@
+import re
+
+# Agent'ların akışı yönlendirmek için yanıt içine koyduğu kontrol işaretleri
+CONTROL_MARKERS = ("START_INTERVIEW", "INTERVIEW_COMPLETE", "POST_INTERVIEW_COMPLETE")
+
+
+class MarkerFilter:
+    """
+    Stream edilen yanıttan kontrol işaretlerini ayıklar.
+    İşaret chunk'lar arasında bölünse bile yakalanır: bir işaretin başlangıcı
+    olabilecek son ek, bir sonraki chunk gelene kadar bekletilir.
+    """
+
+    def __init__(self, markers=CONTROL_MARKERS):
+        # Uzun işaret önce denenir (POST_INTERVIEW_COMPLETE, INTERVIEW_COMPLETE'i içerir)
+        self.markers = sorted(markers, key=len, reverse=True)
+        self._pattern = re.compile("|".join(re.escape(m) for m in self.markers))
+        self._pending = ""
+        self._started = False
+        self.found = set()
+        self._parts = []
+
+    def _held_suffix_length(self, text: str) -> int:
+        """Metnin sonunda bir işaretin başı olabilecek en uzun kısmın uzunluğu"""
+        longest = 0
+        for marker in self.markers:
+            for size in range(min(len(marker) - 1, len(text)), longest, -1):
+                if text.endswith(marker[:size]):
+                    longest = size
+                    break
+        return longest
+
+    def _emit(self, text: str) -> str:
+        if not self._started:
+            text = text.lstrip()
+            if not text:
+                return ""
+            self._started = True
+        self._parts.append(text)
+        return text
+
+    def feed(self, chunk: str) -> str:
+        """Yeni chunk'ı işler, kullanıcıya gönderilmesi güvenli metni döndürür"""
+        text = self._pending + chunk
+        for match in self._pattern.finditer(text):
+            self.found.add(match.group(0))
+        text = self._pattern.sub("", text)
+
+        held = self._held_suffix_length(text)
+        safe, self._pending = text[:len(text) - held], text[len(text) - held:]
+        # Sondaki boşluklar da bekletilir, yanıt işaretle bitiyorsa gönderilmez
+        stripped = safe.rstrip()
+        self._pending = safe[len(stripped):] + self._pending
+        return self._emit(stripped) if stripped else ""
+
+    def flush(self) -> str:
+        """Stream bittiğinde bekletilen (işaret olmadığı anlaşılan) metni döndürür"""
+        text, self._pending = self._pending.rstrip(), ""
+        return self._emit(text) if text else ""
+
+    @property
+    def text(self) -> str:
+        """Şimdiye kadar gönderilen temizlenmiş yanıt"""
+        return "".join(self._parts)
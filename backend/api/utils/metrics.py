@@ -0,0 +1,267 @@
+import time
+import logging
+import threading
+from contextlib import contextmanager
+
+from utils.prompt_builder import cached_tokens
+
+logger = logging.getLogger(__name__)
+
+# Süre histogramları için varsayılan sınırlar (saniye)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+# Dosya I/O'su çoğunlukla cache'ten döner; milisaniye altı ayrım gerekir
+IO_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+TOKEN_BUCKETS = (16, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+WAIT_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800)
+
+
+def _format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} etiketleri {self.labelnames} olmalı, gelen: {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def samples(self):
+        """(son ek, etiket değerleri, ek etiketler, değer) listesi"""
+        with self._lock:
+            return [("", key, (), value) for key, value in sorted(self._values.items())]
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, key, extra, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(self.labelnames, key, extra)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Sadece artan sayaç"""
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set_total(self, value: float, **labels):
+        """Başka bir bileşenin kendi tuttuğu toplamı (örn. cache hit sayısı) scrape anında yansıtır"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Gauge(_Metric):
+    """Anlık değer"""
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Sabit sınırlı histogram (Prometheus _bucket/_sum/_count biçimi)"""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Bloğun süresini ölçer (hata fırlasa da kaydedilir)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, (list(state[0]), state[1], state[2])) for key, state in self._values.items())
+        result = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                result.append(("_bucket", key, (("le", _format_value(bound)),), cumulative))
+            result.append(("_sum", key, (), total))
+            result.append(("_count", key, (), count))
+        return result
+
+
+class MetricsRegistry:
+    """
+    Süreç içi metrik kayıt defteri.
+    Diğer bileşenlerin kendi tuttuğu durumlar (session sayıları, cache sayaçları) scrape anında
+    `on_collect` ile eklenen fonksiyonlarla okunur; böylece sıcak yolda ek iş yapılmaz.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"{metric.name} zaten kayıtlı")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def on_collect(self, callback):
+        """Her scrape öncesi çağrılacak fonksiyon ekler (parametresiz)"""
+        self._collectors.append(callback)
+        return callback
+
+    def render(self) -> str:
+        """Prometheus text exposition formatı (0.0.4)"""
+        for callback in list(self._collectors):
+            try:
+                callback()
+            except Exception as e:
+                logger.error("❌ Metrics: Toplayıcı hatası (%s): %s", getattr(callback, '__name__', callback), e)
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+registry = MetricsRegistry()
+
+# LLM gateway
+LLM_REQUEST_SECONDS = registry.histogram(
+    "genar_llm_request_seconds", "LLM çağrısının slot bekleme dahil toplam süresi", ("agent", "mode"))
+LLM_FIRST_TOKEN_SECONDS = registry.histogram(
+    "genar_llm_first_token_seconds", "Stream çağrılarında ilk metin parçasına kadar geçen süre", ("agent",))
+LLM_QUEUE_SECONDS = registry.histogram(
+    "genar_llm_queue_seconds", "Gateway slotu için bekleme süresi", ("agent", "priority"))
+LLM_PROMPT_TOKENS = registry.histogram(
+    "genar_llm_prompt_tokens", "Çağrı başına prompt token sayısı", ("agent",), TOKEN_BUCKETS)
+LLM_COMPLETION_TOKENS = registry.histogram(
+    "genar_llm_completion_tokens", "Çağrı başına üretilen token sayısı", ("agent",), TOKEN_BUCKETS)
+LLM_CACHED_TOKENS = registry.counter(
+    "genar_llm_cached_prompt_tokens_total", "Sağlayıcı cache'inden okunan prompt token sayısı", ("agent",))
+LLM_RETRIES = registry.counter(
+    "genar_llm_retries_total", "Gateway'in yaptığı tekrar denemeler", ("agent", "reason"))
+LLM_FAILURES = registry.counter(
+    "genar_llm_failures_total", "Tüm denemeleri başarısız olan LLM çağrıları", ("agent", "reason"))
+LLM_TRUNCATIONS = registry.counter(
+    "genar_llm_truncations_total", "finish_reason == \"length\" ile kesilen yanıtlar", ("agent",))
+LLM_SLOTS_ACTIVE = registry.gauge(
+    "genar_llm_slots_active", "Kullanımdaki gateway slotları", ("priority",))
+LLM_SLOTS_WAITING = registry.gauge(
+    "genar_llm_slots_waiting", "Gateway slotu bekleyen çağrılar", ("priority",))
+
+# Agent'lar
+AGENT_FALLBACKS = registry.counter(
+    "genar_agent_fallbacks_total", "LLM yanıtı yerine kullanılan sabit yanıtlar", ("agent", "reason"))
+AGENT_LOCAL_REPLIES = registry.counter(
+    "genar_agent_local_replies_total", "LLM çağrılmadan yerelde verilen yanıtlar", ("agent", "kind"))
+
+QUIZ_INVALID_QUESTIONS = registry.counter(
+    "genar_quiz_invalid_questions_total", "Quiz üretiminde atlanan (parse edilemeyen / şemaya uymayan) sorular")
+
+# Cache'ler: result = hit | miss
+CACHE_REQUESTS = registry.counter(
+    "genar_cache_requests_total", "Cache erişimleri", ("cache", "result"))
+
+# Dosya I/O
+FILE_IO_SECONDS = registry.histogram(
+    "genar_file_io_seconds", "FileManager okuma/yazma süresi", ("op", "kind"), IO_BUCKETS)
+
+# HTTP turları
+CHAT_TURN_SECONDS = registry.histogram(
+    "genar_chat_turn_seconds", "Sohbet turunun uçtan uca süresi", ("endpoint", "stage"))
+ACTIVE_SESSIONS = registry.gauge(
+    "genar_active_sessions", "Aşamaya göre canlı session sayısı", ("stage",))
+LOG_RECORDS_DROPPED = registry.counter(
+    "genar_log_records_dropped_total", "Log kuyruğu dolu olduğu için yazılamayan kayıtlar")
+
+# Bekleme odası: state = active | queued
+ADMISSION_SESSIONS = registry.gauge(
+    "genar_admission_sessions", "Starting aşamasına kabul edilmiş / sırada bekleyen session'lar", ("state",))
+ADMISSION_CAPACITY = registry.gauge(
+    "genar_admission_capacity", "Kapasite modelinin izin verdiği eşzamanlı starting session sayısı")
+ADMISSION_WAIT_SECONDS = registry.histogram(
+    "genar_admission_wait_seconds", "Kabul edilene kadar kuyrukta geçen süre", buckets=WAIT_BUCKETS)
+
+
+def usage_tokens(usage):
+    """(prompt, completion, cached) token sayıları; usage yoksa None"""
+    if not usage:
+        return None
+    return getattr(usage, "prompt_tokens", 0) or 0, getattr(usage, "completion_tokens", 0) or 0, cached_tokens(usage)
+
+
+def observe_usage(agent: str, usage, finish_reason=None):
+    """Bir LLM yanıtının token ve kesilme bilgisini kaydeder"""
+    tokens = usage_tokens(usage)
+    if tokens:
+        prompt, completion, cached = tokens
+        LLM_PROMPT_TOKENS.observe(prompt, agent=agent)
+        LLM_COMPLETION_TOKENS.observe(completion, agent=agent)
+        if cached:
+            LLM_CACHED_TOKENS.inc(cached, agent=agent)
+    if finish_reason == "length":
+        LLM_TRUNCATIONS.inc(agent=agent)
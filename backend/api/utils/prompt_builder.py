@@ -0,0 +1,75 @@
+import json
+import hashlib
+
+from utils.conversation_buffer import estimate_tokens
+
+# Geçmiş mesajlarının sender alanı -> chat API rolü
+ROLE_BY_SENDER = {"user": "user", "assistant": "assistant", "summary": "system"}
+
+
+def stable_json(data) -> str:
+    """Aynı veri için her zaman aynı byte dizisini üreten JSON (anahtarlar sıralı, boşluksuz)"""
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def _section(title: str, data) -> str:
+    body = data if isinstance(data, str) else stable_json(data)
+    return f"<{title}>\n{body}\n</{title}>"
+
+
+def build_system_prefix(rules: str, sections: list) -> str:
+    """
+    Sabit sistem mesajı: önce kurallar, sonra (başlık, veri) bölümleri.
+    Bu metinde konuşmaya göre değişen hiçbir şey olmamalı; böylece aynı session'ın
+    (quiz'de aynı ilanın) tüm çağrılarında prompt aynı prefix ile başlar ve sağlayıcı cache'ine girer.
+    """
+    parts = [rules.strip()]
+    parts.extend(_section(title, data) for title, data in sections)
+    return "\n\n".join(parts)
+
+
+def attach_sections(user_message: str, sections: list) -> str:
+    """Tura özgü veriyi (örn. soruyla ilgili Q&A girdileri) son aday mesajının önüne ekler"""
+    parts = [_section(title, data) for title, data in sections]
+    return "\n\n".join(parts + [f"CANDIDATE'S LAST MESSAGE: {user_message}"])
+
+
+def history_messages(history: list) -> list:
+    """{"sender", "text"} listesini chat mesajlarına çevirir (özet kaydı system mesajı olur)"""
+    return [{"role": ROLE_BY_SENDER.get(msg["sender"], "assistant"), "content": msg["text"]} for msg in history]
+
+
+class ChatPrompt:
+    """Sabit sistem prefix'i + konuşma turlarından oluşan mesaj dizisi"""
+
+    def __init__(self, system_prefix: str, turns: list):
+        self.system_prefix = system_prefix
+        self.messages = [{"role": "system", "content": system_prefix}] + turns
+
+    @property
+    def prefix_chars(self) -> int:
+        return len(self.system_prefix)
+
+    @property
+    def prefix_tokens(self) -> int:
+        return estimate_tokens(self.system_prefix)
+
+    @property
+    def prefix_hash(self) -> str:
+        """Prefix'in kısa özeti - turlar arasında değişmediğini loglardan doğrulamak için"""
+        return hashlib.sha1(self.system_prefix.encode("utf-8")).hexdigest()[:10]
+
+    def describe(self) -> str:
+        return f"sabit prefix ~{self.prefix_tokens} token ({self.prefix_chars} karakter, {self.prefix_hash}), {len(self.messages)} mesaj"
+
+
+def build_chat_prompt(rules: str, sections: list, history: list, user_message: str) -> ChatPrompt:
+    """Kurallar + veri bölümleri system mesajında, geçmiş ve son aday mesajı ayrı turlar olarak"""
+    turns = history_messages(history) + [{"role": "user", "content": user_message}]
+    return ChatPrompt(build_system_prefix(rules, sections), turns)
+
+
+def cached_tokens(usage) -> int:
+    """Sağlayıcının cache'den okuduğu prompt token sayısı (bildirilmiyorsa 0)"""
+    details = getattr(usage, "prompt_tokens_details", None) if usage else None
+    return getattr(details, "cached_tokens", 0) or 0
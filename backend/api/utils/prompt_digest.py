@@ -0,0 +1,174 @@
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from utils.prompt_builder import stable_json
+from utils.conversation_buffer import estimate_tokens
+from utils.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+# Seçim/kırpma kuralları değişince artırılır; eski digest dosyaları yeniden üretilir
+DIGEST_VERSION = 1
+CV_DIGEST_TOKENS = int(os.getenv("CV_DIGEST_TOKENS", "400"))
+JOB_DIGEST_TOKENS = int(os.getenv("JOB_DIGEST_TOKENS", "350"))
+# Kaynağın yanında saklanan digest'ler: aday klasöründe cv_digest.json, ilan klasöründe JobAd_digest.json
+CV_DIGEST_FILE = "cv_digest"
+JOB_DIGEST_FILE = "JobAd_digest"
+# Bellekte tutulan digest sayısı (aday başına bir kayıt)
+MAX_CACHED_DIGESTS = int(os.getenv("MAX_CACHED_DIGESTS", "4096"))
+
+
+class Digest:
+    """Prompt'a olduğu gibi eklenen kompakt JSON metni ve üretildiği kaynağın özeti"""
+
+    def __init__(self, text: str, source_hash: str):
+        self.text = text
+        self.source_hash = source_hash
+        self.tokens = estimate_tokens(text)
+
+
+def _clip(value, chars: int):
+    if isinstance(value, str) and len(value) > chars:
+        return value[:chars - 1].rstrip() + "…"
+    return value
+
+
+def _strings(values, count: int, chars: int) -> list:
+    return [_clip(v, chars) for v in (values or [])[:count] if isinstance(v, (str, int, float))]
+
+
+def _fit(build, levels: list, budget: int) -> str:
+    """Token bütçesine sığan ilk (en ayrıntılı) seviyeyi döndürür; hiçbiri sığmazsa en kısa olanı"""
+    text = ""
+    for level in levels:
+        text = stable_json(build(**level))
+        if estimate_tokens(text) <= budget:
+            break
+    return text
+
+
+def _cv_fields(cv_data: dict, experiences: int, items: int, chars: int) -> dict:
+    """Isınma sohbeti için gereken alanlar; iletişim bilgileri (e-posta, telefon, yaş) alınmaz"""
+    digest = {
+        "name": cv_data.get("name", ""),
+        "position": cv_data.get("position", ""),
+        "summary": _clip(cv_data.get("summary", ""), chars * 2),
+        "skills": _strings(cv_data.get("skills"), items * 2, 40),
+        "languages": _strings(cv_data.get("languages"), 4, 40)
+    }
+    location = (cv_data.get("personal_info") or {}).get("location")
+    if location:
+        digest["location"] = location
+    digest["experience"] = [
+        {
+            "position": e.get("position", ""),
+            "company": e.get("company", ""),
+            "period": e.get("period", ""),
+            "responsibilities": _strings(e.get("responsibilities"), items, chars)
+        }
+        for e in (cv_data.get("experience") or [])[:experiences] if isinstance(e, dict)
+    ]
+    digest["education"] = [
+        {k: e[k] for k in ("school", "department", "degree", "graduation_year") if k in e}
+        for e in (cv_data.get("education") or [])[:2] if isinstance(e, dict)
+    ]
+    return {k: v for k, v in digest.items() if v not in ("", [], None)}
+
+
+def _job_fields(job_ad_data: dict, items: int, chars: int) -> dict:
+    """Pozisyon, tanım, sorumluluklar ve şartlar; diğer kısa metin alanları (şirket, lokasyon...) olduğu gibi"""
+    digest = {
+        key: value for key, value in job_ad_data.items()
+        if isinstance(value, (int, float)) or (isinstance(value, str) and len(value) <= 120)
+    }
+    digest["position"] = job_ad_data.get("position", "")
+    digest["job_description"] = _clip(job_ad_data.get("job_description", ""), chars * 3)
+    for key in ("responsibilities", "requirements"):
+        if job_ad_data.get(key):
+            digest[key] = _strings(job_ad_data.get(key), items, chars)
+    return {k: v for k, v in digest.items() if v not in ("", [], None)}
+
+
+def build_cv_digest(cv_data: dict, budget: int = CV_DIGEST_TOKENS) -> str:
+    return _fit(lambda **level: _cv_fields(cv_data, **level), [
+        {"experiences": 4, "items": 4, "chars": 160},
+        {"experiences": 3, "items": 3, "chars": 120},
+        {"experiences": 2, "items": 2, "chars": 80},
+        {"experiences": 1, "items": 1, "chars": 60},
+    ], budget)
+
+
+def build_job_digest(job_ad_data: dict, budget: int = JOB_DIGEST_TOKENS) -> str:
+    return _fit(lambda **level: _job_fields(job_ad_data, **level), [
+        {"items": 8, "chars": 200},
+        {"items": 6, "chars": 140},
+        {"items": 4, "chars": 100},
+        {"items": 3, "chars": 70},
+    ], budget)
+
+
+def source_hash(data) -> str:
+    return hashlib.sha1(stable_json(data).encode("utf-8")).hexdigest()
+
+
+_digests = OrderedDict()  # (tür, id) -> (kaynak nesne, Digest)
+_digests_lock = threading.Lock()
+
+
+async def _digest(kind: str, key: str, source: dict, build, load, save) -> Digest:
+    """
+    Bellek -> kaynağın yanındaki digest dosyası -> yeniden üretim.
+    JsonCache/SQLite cache'i kaynak değişmedikçe aynı nesneyi döndürdüğü için bellekteki kayıt
+    kimlik karşılaştırmasıyla doğrulanır (turda JSON serileştirme yok); dosya kaynak özetiyle doğrulanır.
+    """
+    with _digests_lock:
+        cached = _digests.get((kind, key))
+        if cached is not None and cached[0] is source:
+            _digests.move_to_end((kind, key))
+            return cached[1]
+
+    digest_hash = source_hash(source)
+    stored = await load()
+    if stored and stored.get("version") == DIGEST_VERSION and stored.get("source_hash") == digest_hash and stored.get("text"):
+        CACHE_REQUESTS.inc(cache="prompt_digest", result="hit")
+        digest = Digest(stored["text"], digest_hash)
+    else:
+        CACHE_REQUESTS.inc(cache="prompt_digest", result="miss")
+        digest = Digest(build(source), digest_hash)
+        await save({
+            "version": DIGEST_VERSION,
+            "source_hash": digest_hash,
+            "tokens": digest.tokens,
+            "text": digest.text,
+            "created_at": datetime.now().isoformat()
+        })
+        logger.info("🗜️ Prompt Digest: %s %s için ~%d token (kaynak ~%d)", kind, key, digest.tokens,
+                    estimate_tokens(stable_json(source)))
+    with _digests_lock:
+        _digests[(kind, key)] = (source, digest)
+        _digests.move_to_end((kind, key))
+        while len(_digests) > MAX_CACHED_DIGESTS:
+            _digests.popitem(last=False)
+    return digest
+
+
+async def cv_digest(fm, job_id: str, candidate_id: str, cv_data: dict) -> Digest:
+    """Adayın CV digest'i (aday klasöründeki cv_digest.json'dan ya da yeniden üretilerek)"""
+    return await _digest(
+        "cv", candidate_id, cv_data, build_cv_digest,
+        load=lambda: fm.async_reader.get_candidate_data(candidate_id, f"{CV_DIGEST_FILE}.json"),
+        save=lambda data: fm.async_writer.save_candidate_data(job_id, candidate_id, CV_DIGEST_FILE, data)
+    )
+
+
+async def job_digest(fm, job_id: str, job_ad_data: dict) -> Digest:
+    """İlanın JobAd digest'i (ilan klasöründeki JobAd_digest.json'dan ya da yeniden üretilerek)"""
+    return await _digest(
+        "job", job_id, job_ad_data, build_job_digest,
+        load=lambda: fm.async_reader.get_job_data(job_id, JOB_DIGEST_FILE),
+        save=lambda data: fm.async_writer.save_job_data(job_id, JOB_DIGEST_FILE, data)
+    )
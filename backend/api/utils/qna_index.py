@@ -0,0 +1,127 @@
+import os
+import re
+import math
+import logging
+import threading
+from collections import Counter
+from functools import lru_cache
+
+from utils.intents import tr_lower
+
+logger = logging.getLogger(__name__)
+
+QNA_TOP_K = int(os.getenv("QNA_TOP_K", "4"))
+
+# Türkçe karakterler ASCII karşılıklarına katlanır; "ı"/"i" ayrımı ve klavye farkları eşleşmeyi bozmaz
+_FOLD = str.maketrans("ıiİşçğöüâîû", "iiiscgouaiu")
+# Sık çekim ekleri (katlanmış, uzundan kısaya); ekten sonra en az MIN_STEM harf kalmalı
+SUFFIXES = (
+    "larindan", "lerinden", "larinda", "lerinde", "larini", "lerini", "lari", "leri", "lar", "ler",
+    "mak", "mek", "dan", "den", "tan", "ten", "nin", "nun", "in", "un", "da", "de", "ta", "te",
+    "si", "su", "i", "u", "a", "e"
+)
+MIN_STEM = 4
+# Ek atıldıktan sonra kelimenin ilk STEM_LENGTH harfi kök sayılır ("maaşı", "maaşlar" -> "maas")
+STEM_LENGTH = 5
+# Arama sonucunu etkilemeyen soru/bağlaç kelimeleri (katlanmış halleriyle)
+STOPWORDS = {
+    "bu", "bir", "ve", "ile", "icin", "mi", "mu", "ne", "nedir", "neler", "nelerdir", "var", "yok",
+    "hangi", "nasil", "kac", "da", "de", "ki", "ya", "veya", "olarak", "olan", "midir", "mudur",
+    "acaba", "peki", "sey", "ben", "benim", "siz", "sizin", "bana"
+}
+
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+# Kelime dağarcığı sınırlı; CV'ler toplu indekslenirken aynı kelimeler tekrar tekrar köklenir
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM:
+            word = word[:-len(suffix)]
+            break
+    return word[:STEM_LENGTH]
+
+
+def normalize(text: str) -> list:
+    """Metni katlanmış, eklerinden arındırılmış ve stopword'süz terimlere çevirir"""
+    terms = []
+    for word in _WORD.findall(tr_lower(text).translate(_FOLD)):
+        if word in STOPWORDS or word.isdigit():
+            continue
+        terms.append(stem(word))
+    return terms
+
+
+class QnAIndex:
+    """
+    Bir ilanın Q&A girdileri üzerinde BM25 indeksi.
+    Soru metni iki kez sayılır (soru eşleşmesi cevaptaki geçişten daha güçlü sinyal).
+    """
+
+    def __init__(self, entries, k1: float = 1.5, b: float = 0.75):
+        self.entries = [e for e in entries if isinstance(e, dict) and e.get("soru") and e.get("cevap")] \
+            if isinstance(entries, list) else []
+        self.k1 = k1
+        self.b = b
+        self._question_terms = []
+        self._docs = []
+        df = Counter()
+        for entry in self.entries:
+            question_terms = normalize(str(entry["soru"]))
+            doc = Counter(question_terms * 2 + normalize(str(entry["cevap"])))
+            self._question_terms.append(frozenset(question_terms))
+            self._docs.append((doc, sum(doc.values())))
+            df.update(doc.keys())
+        n = len(self.entries)
+        self._avg_len = sum(length for _, length in self._docs) / n if n else 0
+        self._idf = {term: math.log(1 + (n - count + 0.5) / (count + 0.5)) for term, count in df.items()}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def search(self, query: str, k: int = QNA_TOP_K) -> list:
+        """En alakalı k girdiyi (skor > 0) azalan sırada döndürür"""
+        terms = set(normalize(query))
+        scored = []
+        for i, (doc, length) in enumerate(self._docs):
+            score = 0.0
+            for term in terms:
+                tf = doc.get(term)
+                if tf:
+                    norm = self.k1 * (1 - self.b + self.b * length / self._avg_len)
+                    score += self._idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            if score > 0:
+                scored.append((score, i))
+        scored.sort(reverse=True)
+        return [self.entries[i] for _, i in scored[:k]]
+
+    def exact_match(self, query: str):
+        """
+        Aday Q&A'daki bir soruyu (kelime sırası/ekleri farklı olsa da) aynen sorduysa o girdiyi döndürür.
+        Eşleşme tek ve en az iki anlamlı terimli olmalı; aksi halde None.
+        """
+        terms = frozenset(normalize(query))
+        if len(terms) < 2:
+            return None
+        matches = [self.entries[i] for i, question in enumerate(self._question_terms) if question == terms]
+        return matches[0] if len(matches) == 1 else None
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(job_id: str, qna_data) -> QnAIndex:
+    """
+    İlanın indeksini döndürür; Q&A verisi değiştiyse yeniden kurar.
+    JsonCache dosya değişmedikçe aynı nesneyi döndürdüğü için kimlik karşılaştırması yeterli.
+    """
+    with _indexes_lock:
+        cached = _indexes.get(job_id)
+        if cached is None or cached[0] is not qna_data:
+            cached = (qna_data, QnAIndex(qna_data))
+            _indexes[job_id] = cached
+            logger.info("🔎 Q&A Index: %s için %d girdi indekslendi", job_id, len(cached[1]))
+        return cached[1]
@@ -0,0 +1,205 @@
+import asyncio
+import hashlib
+import logging
+from datetime import datetime
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# İlan klasöründe (SQLite'ta ilan dokümanı olarak) tutulan agrega
+ANALYTICS_DATA_TYPE = "Quiz_analytics"
+# Yüzde histogramı: %0-10, %10-20, ..., %90-100 (100 son kutuya dahil)
+HISTOGRAM_EDGES = np.linspace(0, 100, 11)
+
+
+def question_key(text: str) -> str:
+    """Soru metninden sabit kısa anahtar (aynı soru farklı varyantlarda da aynı anahtarı alır)"""
+    return hashlib.sha1(text.strip().encode("utf-8")).hexdigest()[:12]
+
+
+def _bins(percentages) -> np.ndarray:
+    """Her yüzdenin histogram kutusu indeksi"""
+    return np.clip(np.searchsorted(HISTOGRAM_EDGES, percentages, side="right") - 1, 0, len(HISTOGRAM_EDGES) - 2)
+
+
+def _question_rows(quiz_results: dict):
+    """quiz_results.json'daki cevaplar: [(anahtar, soru, cevaplandı mı, doğru mu), ...]"""
+    rows = []
+    for result in quiz_results.get("results") or []:
+        if not isinstance(result, dict) or not isinstance(result.get("question"), str):
+            continue
+        answered = result.get("selectedAnswer", -1) not in (-1, None)
+        rows.append((question_key(result["question"]), result["question"], answered, bool(result.get("isCorrect"))))
+    return rows
+
+
+class JobQuizStats:
+    """
+    Bir ilanın quiz agregası - aday sayısından bağımsız sabit boyutlu.
+
+    - Yüzde skorların sayısı, ortalaması ve M2'si (Chan/Welford birleştirme) -> varyans
+    - Yüzde histogramı
+    - Soru başına deneme / doğru / boş sayıları
+    Bir adayın sonucu tekrar kaydedilirse eski katkısı çıkarılıp yenisi eklenir.
+    version her yazmada artar; worker'ların bellekteki özetleri buna göre tazelenir.
+    """
+
+    def __init__(self, data: dict = None):
+        data = data or {}
+        self.version = int(data.get("version", 0))
+        self.count = int(data.get("count", 0))
+        self.mean = float(data.get("mean", 0.0))
+        self.m2 = float(data.get("m2", 0.0))
+        self.histogram = np.array(data.get("histogram") or [0] * (len(HISTOGRAM_EDGES) - 1), dtype=np.int64)
+        # anahtar -> {"question", "attempts", "correct", "unanswered"}
+        self.questions = {key: dict(value) for key, value in (data.get("questions") or {}).items()}
+
+    def _merge(self, count: int, mean: float, m2: float, sign: int):
+        """(count, mean, m2) özetini ekler (sign=1) ya da çıkarır (sign=-1)"""
+        total = self.count + sign * count
+        if total <= 0:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        delta = mean - self.mean
+        new_mean = self.mean + sign * delta * count / total
+        if sign > 0:
+            self.m2 += m2 + delta * delta * self.count * count / total
+        else:
+            # Çıkarma, ekleme formülünün tersidir: M2_kalan = M2 - m2 - δ'² * n_kalan * n / N
+            delta_rest = mean - new_mean
+            self.m2 -= m2 + delta_rest * delta_rest * total * count / self.count
+        self.count, self.mean, self.m2 = total, new_mean, max(self.m2, 0.0)
+
+    def apply(self, results: list, sign: int = 1):
+        """quiz_results kayıtlarını toplu olarak ekler/çıkarır (yeniden oluşturmada tek geçişte)"""
+        percentages = np.array([float(r.get("percentage", 0.0)) for r in results], dtype=np.float64)
+        if percentages.size:
+            self._merge(percentages.size, float(percentages.mean()),
+                        float(((percentages - percentages.mean()) ** 2).sum()), sign)
+            self.histogram += sign * np.bincount(_bins(percentages), minlength=self.histogram.size)
+            np.maximum(self.histogram, 0, out=self.histogram)
+
+        rows = [row for r in results for row in _question_rows(r)]
+        if not rows:
+            return
+        keys = sorted({row[0] for row in rows})
+        index = {key: i for i, key in enumerate(keys)}
+        positions = np.array([index[row[0]] for row in rows])
+        attempts = np.bincount(positions, minlength=len(keys))
+        correct = np.bincount(positions, weights=np.array([row[3] for row in rows], dtype=np.float64), minlength=len(keys))
+        unanswered = np.bincount(positions, weights=np.array([not row[2] for row in rows], dtype=np.float64), minlength=len(keys))
+        texts = {row[0]: row[1] for row in rows}
+        for i, key in enumerate(keys):
+            stats = self.questions.setdefault(key, {"question": texts[key], "attempts": 0, "correct": 0, "unanswered": 0})
+            stats["attempts"] += sign * int(attempts[i])
+            stats["correct"] += sign * int(correct[i])
+            stats["unanswered"] += sign * int(unanswered[i])
+            if stats["attempts"] <= 0:
+                del self.questions[key]
+
+    def to_dict(self) -> dict:
+        return {
+            "version": self.version,
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "histogram": self.histogram.tolist(),
+            "questions": self.questions,
+            "updated_at": datetime.now().isoformat()
+        }
+
+    def summary(self) -> dict:
+        """Endpoint'in döndürdüğü özet; soru listesi en zor sorudan başlar"""
+        variance = self.m2 / (self.count - 1) if self.count > 1 else 0.0
+        questions = [
+            {
+                "key": key,
+                "question": stats["question"],
+                "attempts": stats["attempts"],
+                "correct_rate": round(stats["correct"] / stats["attempts"], 4),
+                "unanswered_rate": round(stats["unanswered"] / stats["attempts"], 4)
+            }
+            for key, stats in self.questions.items()
+        ]
+        questions.sort(key=lambda q: (q["correct_rate"], -q["attempts"]))
+        return {
+            "candidates": self.count,
+            "mean_percentage": round(self.mean, 2),
+            "variance": round(variance, 2),
+            "std_dev": round(float(np.sqrt(variance)), 2),
+            "histogram": [
+                {"from": int(low), "to": int(high), "count": int(count)}
+                for low, high, count in zip(HISTOGRAM_EDGES[:-1], HISTOGRAM_EDGES[1:], self.histogram)
+            ],
+            "questions": questions
+        }
+
+
+class QuizAnalytics:
+    """
+    İlan başına quiz agregalarını /api/save-quiz-results ile artımlı günceller.
+
+    Agrega Quiz_analytics olarak ilanın yanında saklanır ve her güncellemede depodaki son hali
+    süreçler arası kilit altında okunup delta uygulanır (update_job_data); birden fazla worker
+    birbirinin yazdığını ezmez. Bellekte sadece özet tutulur, agreganın version'ı değişince yenilenir.
+    Yeniden oluşturma (backfill) için rebuild().
+    """
+
+    def __init__(self, file_manager):
+        self.fm = file_manager
+        self._summaries = {}  # job_id -> ((version, updated_at), özet dict)
+        self._locks = {}      # job_id -> asyncio.Lock (aynı süreçteki güncellemeler I/O thread'lerini kilitte bekletmesin)
+
+    def _lock(self, job_id: str):
+        if job_id not in self._locks:
+            self._locks[job_id] = asyncio.Lock()
+        return self._locks[job_id]
+
+    async def record(self, job_id: str, candidate_id: str, quiz_results: dict):
+        """
+        Adayın sonucunu kaydeder ve agregaya ekler; aday daha önce sonuç kaydettiyse eskisinin katkısı çıkarılır.
+        Önceki sonucu okuma, yeni sonucu yazma ve agregayı güncelleme ilanın süreçler arası kilidi altında
+        tek adımdır; aynı adayın eşzamanlı ya da tekrar denenen gönderimleri birbirinin önceki sonucunu görür.
+        """
+        def apply(data: dict):
+            previous = self.fm.get_candidate_data(candidate_id, "quiz_results.json")
+            self.fm.save_candidate_data(job_id, candidate_id, "quiz_results", quiz_results)
+            stats = JobQuizStats(data)
+            if previous:
+                stats.apply([previous], sign=-1)
+            stats.apply([quiz_results])
+            stats.version += 1
+            return stats.to_dict()
+
+        async with self._lock(job_id):
+            await self.fm.async_writer.update_job_data(job_id, ANALYTICS_DATA_TYPE, apply)
+
+    async def summary(self, job_id: str):
+        """İlanın analitik özeti (agrega değişmediyse bellekten)"""
+        data = await self.fm.async_reader.get_job_data(job_id, ANALYTICS_DATA_TYPE)
+        signature = (data.get("version", 0), data.get("updated_at"))
+        cached = self._summaries.get(job_id)
+        if cached is None or cached[0] != signature:
+            cached = self._summaries[job_id] = (signature, JobQuizStats(data).summary())
+        return {"job_id": job_id, **cached[1]}
+
+    def rebuild(self, job_id: str):
+        """
+        Tüm adayların quiz_results'ını okuyup agregayı baştan yazar (senkron; CLI ve backfill için).
+        Okuma ve yazma record() ile aynı kilit altındadır; çalışan sunucular yeni version'ı bir sonraki özette görür.
+        """
+        def replace(data: dict):
+            results = []
+            for entry in self.fm.find_candidates(job_id=job_id):
+                quiz_results = self.fm.get_candidate_data(entry["candidate_id"], "quiz_results.json")
+                if quiz_results:
+                    results.append(quiz_results)
+            stats = JobQuizStats()
+            stats.apply(results)
+            stats.version = JobQuizStats(data).version + 1
+            return stats.to_dict()
+
+        stats = JobQuizStats(self.fm.update_job_data(job_id, ANALYTICS_DATA_TYPE, replace))
+        logger.info("📊 Quiz analitiği yeniden oluşturuldu: %s (%d aday)", job_id, stats.count)
+        return stats.summary()
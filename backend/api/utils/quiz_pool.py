@@ -0,0 +1,236 @@
+import os
+import asyncio
+import logging
+from datetime import datetime
+
+from utils.llm_gateway import PRIORITY_CHAT, PRIORITY_BACKGROUND
+
+logger = logging.getLogger(__name__)
+
+QUIZ_POOL_DEPTH = int(os.getenv("QUIZ_POOL_DEPTH", "3"))
+# Bir quizdeki soru sayısı (eksik kalanlar onarım çağrısıyla tamamlanır)
+QUIZ_QUESTION_COUNT = 10
+# Geçersiz sorular atıldıktan sonra bir varyantın kabul edilmesi için gereken en az soru
+QUIZ_MIN_QUESTIONS = int(os.getenv("QUIZ_MIN_QUESTIONS", "8"))
+
+
+def validate_question(question) -> bool:
+    """Frontend'in beklediği formatta (question, 4 şık, correctAnswerIndex) mı"""
+    if not isinstance(question, dict):
+        return False
+    options = question.get("options")
+    return (
+        isinstance(question.get("question"), str) and question["question"].strip() != ""
+        and isinstance(options, list) and len(options) == 4
+        and all(isinstance(o, str) and o.strip() for o in options)
+        and question.get("correctAnswerIndex") in (0, 1, 2, 3)
+    )
+
+
+def validate_variant(questions):
+    """Geçerli soruları döndürür, varyant kullanılamazsa None"""
+    if not isinstance(questions, list):
+        return None
+    valid = [q for q in questions if validate_question(q)]
+    return valid if len(valid) >= QUIZ_MIN_QUESTIONS else None
+
+
+class QuizDelivery:
+    """
+    Bir session'a verilen quiz. Sorular üretildikçe eklenir; aynı session'ın
+    eşzamanlı istekleri (ön yükleme, stream) aynı soruları aynı sırayla izler.
+    """
+
+    def __init__(self):
+        self.questions = []
+        self.done = False
+        self.error = None
+        self._changed = asyncio.Event()
+
+    def _wake(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def push(self, question: dict):
+        self.questions.append(question)
+        self._wake()
+
+    def finish(self, error: Exception = None):
+        self.done = True
+        self.error = error
+        self._wake()
+
+    async def follow(self):
+        """Soruları geldikçe üretir; üretim hatayla bittiyse gönderilenlerden sonra hatayı fırlatır"""
+        sent = 0
+        while True:
+            changed = self._changed
+            while sent < len(self.questions):
+                yield self.questions[sent]
+                sent += 1
+            if self.done:
+                if self.error:
+                    raise self.error
+                return
+            await changed.wait()
+
+    async def result(self):
+        """Tamamlanmış quiz"""
+        async for _ in self.follow():
+            pass
+        return list(self.questions)
+
+
+class QuizPool:
+    """
+    İlan başına önceden üretilmiş quiz varyantları havuzu.
+
+    - Her session'a havuzdan bir varyant verilir; aynı session'ın eşzamanlı istekleri
+      tek bir üretim/atama işleminde birleştirilir
+    - Havuz boşsa quiz stream edilerek üretilir; geçerli sorular geldikçe session'a verilir,
+      geçersiz/eksik sorular sadece onlar için yapılan onarım çağrısıyla tamamlanır
+    - Havuz arka planda QUIZ_POOL_DEPTH varyanta tamamlanır (ilan başına tek refill görevi)
+    - Havuz Quiz.json'a {"variants": [...]} olarak yazılır; eski liste formatı tek varyant sayılır
+    """
+
+    def __init__(self, file_manager, generate, generate_stream, repair, depth: int = QUIZ_POOL_DEPTH):
+        self.fm = file_manager
+        self._generate = generate  # async (qna_data, job_ad_data, priority) -> list
+        self._generate_stream = generate_stream  # async generator (qna_data, job_ad_data, priority) -> soru
+        self._repair = repair  # async (qna_data, job_ad_data, count, existing, priority) -> list
+        self.depth = depth
+        self._pools = {}      # job_id -> [variant, ...]
+        self._deliveries = {}  # session_id -> QuizDelivery (üretim/atama sürerken)
+        self._refill_tasks = {}   # job_id -> Task
+        self._locks = {}  # job_id -> asyncio.Lock (Quiz.json yükleme/yazma sırası)
+        self.served_from_pool = 0
+        self.generated_on_demand = 0
+        self.generated_background = 0
+        self.rejected_variants = 0
+        self.repaired_questions = 0
+
+    async def _pool(self, job_id: str):
+        """İlanın havuzunu (gerekirse Quiz.json'dan yükleyerek) döndürür"""
+        if job_id in self._pools:
+            return self._pools[job_id]
+        if not await self.fm.async_reader.job_exists(job_id):
+            raise LookupError(f"Bilinmeyen ilan: {job_id}")
+        async with self._locks.setdefault(job_id, asyncio.Lock()):
+            if job_id not in self._pools:
+                stored = await self.fm.async_reader.get_quiz_data(job_id)
+                if isinstance(stored, list):
+                    candidates = [stored]
+                else:
+                    candidates = stored.get("variants", []) if isinstance(stored, dict) else []
+                self._pools[job_id] = [v for v in (validate_variant(c) for c in candidates) if v]
+        return self._pools[job_id]
+
+    async def _persist(self, job_id: str):
+        async with self._locks.setdefault(job_id, asyncio.Lock()):
+            await self.fm.async_writer.save_job_data(job_id, "Quiz", {
+                "updated_at": datetime.now().isoformat(),
+                "variants": list(self._pools.get(job_id, []))
+            })
+
+    async def _generate_variant(self, job_id: str, priority: int = PRIORITY_BACKGROUND):
+        qna_data = await self.fm.async_reader.get_qna_data(job_id)
+        job_ad_data = await self.fm.async_reader.get_job_ad_data(job_id)
+        variant = validate_variant(await self._generate(qna_data, job_ad_data, priority))
+        if variant is None:
+            self.rejected_variants += 1
+        return variant
+
+    async def _stream_variant(self, job_id: str, delivery: QuizDelivery):
+        """Havuz boşken: aday beklediği için sohbet önceliğiyle stream ederek üretir, eksikleri onarır"""
+        qna_data = await self.fm.async_reader.get_qna_data(job_id)
+        job_ad_data = await self.fm.async_reader.get_job_ad_data(job_id)
+        try:
+            async for question in self._generate_stream(qna_data, job_ad_data, PRIORITY_CHAT):
+                if len(delivery.questions) < QUIZ_QUESTION_COUNT:
+                    delivery.push(question)
+        except Exception as e:
+            logger.error("❌ Quiz Pool: %s için stream hatası (%d soru alındı): %s", job_id, len(delivery.questions), e)
+
+        for _ in range(2):
+            missing = QUIZ_QUESTION_COUNT - len(delivery.questions)
+            if missing <= 0:
+                break
+            self.repaired_questions += missing
+            try:
+                for question in await self._repair(qna_data, job_ad_data, missing, delivery.questions, PRIORITY_CHAT):
+                    delivery.push(question)
+            except Exception as e:
+                logger.error("❌ Quiz Pool: %s için onarım hatası: %s", job_id, e)
+
+        if len(delivery.questions) < QUIZ_MIN_QUESTIONS:
+            raise RuntimeError(f"{job_id} için geçerli quiz üretilemedi")
+
+    async def _take(self, job_id: str, delivery: QuizDelivery):
+        try:
+            pool = await self._pool(job_id)
+            if pool:
+                for question in pool.pop(0):
+                    delivery.push(question)
+                self.served_from_pool += 1
+                await self._persist(job_id)
+            else:
+                await self._stream_variant(job_id, delivery)
+                self.generated_on_demand += 1
+            self.schedule_refill(job_id)
+        except Exception as e:
+            delivery.finish(e)
+            return
+        delivery.finish()
+
+    def deliver(self, session_id: str, job_id: str) -> QuizDelivery:
+        """Session'ın quiz teslimatını başlatır ya da süren teslimata bağlanır"""
+        delivery = self._deliveries.get(session_id)
+        if delivery is None:
+            delivery = self._deliveries[session_id] = QuizDelivery()
+            task = asyncio.create_task(self._take(job_id, delivery))
+            task.add_done_callback(lambda _: self._deliveries.pop(session_id, None))
+        return delivery
+
+    async def get_for_session(self, session_id: str, job_id: str):
+        """Session'a bir quiz varyantı atar; aynı session'ın eşzamanlı istekleri aynı sonucu alır"""
+        return await self.deliver(session_id, job_id).result()
+
+    def schedule_refill(self, job_id: str):
+        """Havuzu arka planda hedef derinliğe tamamlar (ilan başına tek görev); bilinmeyen ilan LookupError"""
+        if job_id in self._refill_tasks:
+            return self._refill_tasks[job_id]
+        if job_id not in self._pools and not self.fm.job_exists(job_id):
+            raise LookupError(f"Bilinmeyen ilan: {job_id}")
+        task = asyncio.create_task(self._refill(job_id))
+        self._refill_tasks[job_id] = task
+        task.add_done_callback(lambda _: self._refill_tasks.pop(job_id, None))
+        return task
+
+    async def _refill(self, job_id: str):
+        pool = await self._pool(job_id)
+        failures = 0
+        while len(pool) < self.depth and failures < 3:
+            try:
+                variant = await self._generate_variant(job_id)
+            except Exception as e:
+                logger.error("❌ Quiz Pool: %s için üretim hatası: %s", job_id, e)
+                variant = None
+            if variant is None:
+                failures += 1
+                continue
+            pool.append(variant)
+            self.generated_background += 1
+            await self._persist(job_id)
+        logger.info("🧩 Quiz Pool: %s havuzu %d/%d", job_id, len(pool), self.depth)
+
+    def stats(self):
+        return {
+            "depth": self.depth,
+            "pools": {job_id: len(pool) for job_id, pool in self._pools.items()},
+            "refilling": sorted(self._refill_tasks),
+            "served_from_pool": self.served_from_pool,
+            "generated_on_demand": self.generated_on_demand,
+            "generated_background": self.generated_background,
+            "rejected_variants": self.rejected_variants,
+            "repaired_questions": self.repaired_questions
+        }
@@ -0,0 +1,219 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+
+class SessionStore(ABC):
+    """
+    Session saklama interface'i.
+    get() ile alınan session dict'i değiştirildikten sonra save() ile geri yazılmalıdır.
+    """
+
+    @abstractmethod
+    def get(self, session_id: str):
+        ...
+
+    @abstractmethod
+    def save(self, session_id: str, session: dict):
+        ...
+
+    @abstractmethod
+    def delete(self, session_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    def count(self) -> int:
+        ...
+
+    @abstractmethod
+    def stage_counts(self) -> dict:
+        """Canlı session'ların aşamaya (stage) göre sayısı"""
+
+    @abstractmethod
+    def stats(self) -> dict:
+        ...
+
+
+class MemorySessionStore(SessionStore):
+    """Süreç içi LRU + TTL session store (tek worker için)"""
+
+    def __init__(self, max_sessions: int = 10000, ttl_seconds: float = 4 * 3600):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions = OrderedDict()  # session_id -> (last_access, session)
+        self._lock = threading.Lock()
+        self.evicted_ttl = 0
+        self.evicted_capacity = 0
+
+    def _evict_expired(self, now: float):
+        # OrderedDict son erişim sırasına göre tutulur, en eskiler baştadır
+        while self._sessions:
+            session_id, (last_access, _) = next(iter(self._sessions.items()))
+            if now - last_access < self.ttl_seconds:
+                break
+            del self._sessions[session_id]
+            self.evicted_ttl += 1
+
+    def get(self, session_id: str):
+        now = time.time()
+        with self._lock:
+            self._evict_expired(now)
+            item = self._sessions.get(session_id)
+            if item is None:
+                return None
+            self._sessions[session_id] = (now, item[1])
+            self._sessions.move_to_end(session_id)
+            return item[1]
+
+    def save(self, session_id: str, session: dict):
+        now = time.time()
+        with self._lock:
+            self._evict_expired(now)
+            self._sessions[session_id] = (now, session)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted_capacity += 1
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def count(self) -> int:
+        with self._lock:
+            self._evict_expired(time.time())
+            return len(self._sessions)
+
+    def stage_counts(self) -> dict:
+        counts = {}
+        with self._lock:
+            self._evict_expired(time.time())
+            for _, session in self._sessions.values():
+                stage = session.get("stage", "unknown")
+                counts[stage] = counts.get(stage, 0) + 1
+        return counts
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "live_sessions": self.count(),
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl_seconds,
+            "evicted_ttl": self.evicted_ttl,
+            "evicted_capacity": self.evicted_capacity
+        }
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Yerel SQLite (WAL) session store.
+    Aynı makinedeki birden fazla uvicorn worker'ı aynı aday session'ına erişebilir.
+    """
+
+    # Kapasite / TTL temizliği her bu kadar save'de bir yapılır
+    SWEEP_EVERY = 100
+
+    def __init__(self, db_path: str, max_sessions: int = 10000, ttl_seconds: float = 4 * 3600):
+        self.db_path = db_path
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._saves = 0
+        self.evicted_ttl = 0
+        self.evicted_capacity = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "session_id TEXT PRIMARY KEY, data TEXT NOT NULL, last_access REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_last_access ON sessions(last_access)")
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, session_id: str):
+        now = time.time()
+        row = self._conn().execute(
+            "SELECT data FROM sessions WHERE session_id = ? AND last_access > ?",
+            (session_id, now - self.ttl_seconds)
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def save(self, session_id: str, session: dict):
+        conn = self._conn()
+        conn.execute(
+            "INSERT INTO sessions (session_id, data, last_access) VALUES (?, ?, ?) "
+            "ON CONFLICT(session_id) DO UPDATE SET data = excluded.data, last_access = excluded.last_access",
+            (session_id, json.dumps(session, ensure_ascii=False), time.time())
+        )
+        self._saves += 1
+        if self._saves % self.SWEEP_EVERY == 0:
+            self._sweep(conn)
+
+    def _sweep(self, conn):
+        """Süresi dolan ve kapasiteyi aşan (en eski) session'ları siler"""
+        cursor = conn.execute("DELETE FROM sessions WHERE last_access <= ?", (time.time() - self.ttl_seconds,))
+        self.evicted_ttl += cursor.rowcount
+        cursor = conn.execute(
+            "DELETE FROM sessions WHERE session_id IN ("
+            "SELECT session_id FROM sessions ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_sessions,)
+        )
+        self.evicted_capacity += cursor.rowcount
+
+    def delete(self, session_id: str) -> bool:
+        cursor = self._conn().execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        return cursor.rowcount > 0
+
+    def count(self) -> int:
+        row = self._conn().execute(
+            "SELECT COUNT(*) FROM sessions WHERE last_access > ?", (time.time() - self.ttl_seconds,)
+        ).fetchone()
+        return row[0]
+
+    def stage_counts(self) -> dict:
+        rows = self._conn().execute(
+            "SELECT json_extract(data, '$.stage'), COUNT(*) FROM sessions WHERE last_access > ? GROUP BY 1",
+            (time.time() - self.ttl_seconds,)
+        ).fetchall()
+        return {stage or "unknown": count for stage, count in rows}
+
+    def stats(self) -> dict:
+        return {
+            "backend": "sqlite",
+            "live_sessions": self.count(),
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl_seconds,
+            # Eviction sayaçları bu worker sürecine aittir
+            "evicted_ttl": self.evicted_ttl,
+            "evicted_capacity": self.evicted_capacity
+        }
+
+
+def create_session_store():
+    """SESSION_STORE ortam değişkenine göre (memory | sqlite) store oluşturur"""
+    backend = os.getenv("SESSION_STORE", "memory").lower()
+    max_sessions = int(os.getenv("MAX_SESSIONS", "10000"))
+    ttl_seconds = float(os.getenv("SESSION_TTL_SECONDS", str(4 * 3600)))
+
+    if backend == "sqlite":
+        db_path = os.getenv("SESSION_DB_PATH", "sessions.db")
+        return SQLiteSessionStore(db_path, max_sessions=max_sessions, ttl_seconds=ttl_seconds)
+    if backend != "memory":
+        raise ValueError(f"Bilinmeyen SESSION_STORE: {backend}")
+    return MemorySessionStore(max_sessions=max_sessions, ttl_seconds=ttl_seconds)
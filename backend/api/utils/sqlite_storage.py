@@ -0,0 +1,456 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from utils.file_manager import BaseFileManager
+from utils.catalog import split_candidate_id
+from utils import transcript_journal
+from utils.metrics import FILE_IO_SECONDS
+
+INTERVIEW_LIST = "Interview_list"
+
+SCHEMA = (
+    # job_id = '' -> veri kökündeki dosyalar (Company_profile), candidate_id = '' -> ilan dosyaları
+    "CREATE TABLE IF NOT EXISTS documents ("
+    "job_id TEXT NOT NULL, candidate_id TEXT NOT NULL, data_type TEXT NOT NULL, "
+    "data TEXT NOT NULL, version INTEGER NOT NULL, updated_at REAL NOT NULL, "
+    "PRIMARY KEY (job_id, candidate_id, data_type))",
+    "CREATE INDEX IF NOT EXISTS idx_documents_type ON documents(data_type, job_id)",
+    # Interview_list.json'daki aday kayıtları; entry kaydın tamamıdır, diğer kolonlar sorgu içindir
+    "CREATE TABLE IF NOT EXISTS candidates ("
+    "seq INTEGER PRIMARY KEY AUTOINCREMENT, candidate_id TEXT NOT NULL UNIQUE, job_id TEXT NOT NULL, "
+    "status TEXT, name TEXT, email TEXT, entry TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_candidates_job_status ON candidates(job_id, status)",
+    "CREATE INDEX IF NOT EXISTS idx_candidates_status ON candidates(status)",
+    # Tur başına transcript kayıtları; mülakat bitince adayın kayıtları tek sıkıştırılmış satıra taşınır
+    "CREATE TABLE IF NOT EXISTS transcript_records ("
+    "seq INTEGER PRIMARY KEY AUTOINCREMENT, candidate_id TEXT NOT NULL, record TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_transcript_records_candidate ON transcript_records(candidate_id, seq)",
+    "CREATE TABLE IF NOT EXISTS transcript_archives (candidate_id TEXT PRIMARY KEY, data BLOB NOT NULL)",
+)
+
+
+def _data_type(file_name: str) -> str:
+    """'cv_extraction.json' -> 'cv_extraction'"""
+    return file_name[:-5] if file_name.endswith(".json") else file_name
+
+
+def _dumps(data) -> str:
+    return json.dumps(data, ensure_ascii=False)
+
+
+class SQLiteFileManager(BaseFileManager):
+    """
+    GENAR ağacını tek bir SQLite (WAL) veritabanında tutan FileManager.
+
+    FileReader / FileWriter / FileManagerOps ve async karşılıkları aynı şekilde kullanılır.
+    Dokümanlar (ilan, job_id, candidate_id, data_type) ile, adaylar ayrıca ilan ve status ile indekslidir.
+    Okunan JSON'lar versiyon numarasıyla doğrulanan bir LRU'da tutulur; değişmemiş doküman tekrar parse edilmez.
+    Aynı makinedeki birden fazla worker aynı veritabanını kullanabilir.
+    """
+
+    def __init__(self, db_path: str, base_dir: str = "data", max_cached: int = 1024):
+        super().__init__(base_dir=base_dir)
+        self.db_path = db_path
+        self.max_cached = max_cached
+        self._local = threading.local()
+        self._cached = OrderedDict()  # (job_id, candidate_id, data_type) -> (version, data)
+        self._cache_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        for statement in SCHEMA:
+            conn.execute(statement)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ---------------- Doküman okuma / yazma ----------------
+    def _read(self, key: tuple):
+        """Dokümanı döndürür, yoksa None. Dönen veri cache'teki nesnedir; değiştirilmemelidir."""
+        conn = self._conn()
+        with FILE_IO_SECONDS.time(op="read", kind=key[2]):
+            with self._cache_lock:
+                cached = self._cached.get(key)
+            if cached is not None:
+                row = conn.execute(
+                    "SELECT version FROM documents WHERE job_id = ? AND candidate_id = ? AND data_type = ?", key
+                ).fetchone()
+                if row is not None and row[0] == cached[0]:
+                    with self._cache_lock:
+                        self._cached.move_to_end(key)
+                        self.hits += 1
+                    return cached[1]
+
+            row = conn.execute(
+                "SELECT version, data FROM documents WHERE job_id = ? AND candidate_id = ? AND data_type = ?", key
+            ).fetchone()
+            with self._cache_lock:
+                self.misses += 1
+                if row is None:
+                    self._cached.pop(key, None)
+                    return None
+                data = json.loads(row[1])
+                self._cached[key] = (row[0], data)
+                self._cached.move_to_end(key)
+                while len(self._cached) > self.max_cached:
+                    self._cached.popitem(last=False)
+            return data
+
+    @staticmethod
+    def _upsert(conn, key: tuple, data):
+        conn.execute(
+            "INSERT INTO documents (job_id, candidate_id, data_type, data, version, updated_at) VALUES (?, ?, ?, ?, 1, ?) "
+            "ON CONFLICT(job_id, candidate_id, data_type) DO UPDATE SET "
+            "data = excluded.data, version = documents.version + 1, updated_at = excluded.updated_at",
+            (*key, _dumps(data), time.time())
+        )
+
+    def _write(self, key: tuple, data):
+        with FILE_IO_SECONDS.time(op="write", kind=key[2]):
+            self._upsert(self._conn(), key, data)
+        with self._cache_lock:
+            self._cached.pop(key, None)
+
+    def _transaction(self):
+        """BEGIN IMMEDIATE ... COMMIT/ROLLBACK bloğu"""
+        return _Transaction(self._conn())
+
+    def _candidate_key(self, candidate_id: str, data_type: str):
+        job_folder, _ = self._get_paths_from_id(candidate_id)
+        return (os.path.basename(job_folder), candidate_id, data_type)
+
+    # ---------------- FileReader ----------------
+    def get_job_data(self, job_id: str, data_type: str):
+        if data_type == INTERVIEW_LIST:
+            return self.get_interview_list_data(job_id)
+        return self._read((job_id, "", data_type)) or {}
+
+    def get_root_data(self, data_type: str):
+        """Veri kökündeki doküman (örn. Company_profile)"""
+        return self._read(("", "", data_type)) or {}
+
+    def get_candidate_data(self, candidate_id: str, file_name: str):
+        if file_name == f"{transcript_journal.TRANSCRIPT_VIEW}.json":
+            transcript = self.get_transcript(candidate_id)
+            if transcript:
+                return transcript
+        try:
+            key = self._candidate_key(candidate_id, _data_type(file_name))
+        except ValueError:
+            return {}
+        return self._read(key) or {}
+
+    def _job_meta(self, job_id: str):
+        return self._read((job_id, "", INTERVIEW_LIST))
+
+    def get_interview_list_data(self, job_id: str):
+        meta = self._job_meta(job_id)
+        rows = self._conn().execute("SELECT entry FROM candidates WHERE job_id = ? ORDER BY seq", (job_id,)).fetchall()
+        if meta is None and not rows and not self.job_exists(job_id):
+            return {}
+        return {**(meta or {}), "candidates": [json.loads(row[0]) for row in rows]}
+
+    def get_interview_entry(self, job_id: str, candidate_id: str):
+        row = self._conn().execute(
+            "SELECT entry FROM candidates WHERE candidate_id = ? AND job_id = ?", (candidate_id, job_id)
+        ).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def get_candidate_ids_by_status(self, job_id: str, status: str):
+        rows = self._conn().execute(
+            "SELECT candidate_id FROM candidates WHERE job_id = ? AND status = ? ORDER BY candidate_id", (job_id, status)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_meeting_link(self, job_id: str):
+        return (self._job_meta(job_id) or {}).get("meeting_link", "")
+
+    def list_job_ids(self):
+        rows = self._conn().execute("SELECT DISTINCT job_id FROM documents WHERE job_id != '' ORDER BY job_id").fetchall()
+        return [row[0] for row in rows]
+
+    def job_exists(self, job_id: str):
+        if self.catalog.has_job_file(job_id, "JobAd.json"):
+            return True
+        row = self._conn().execute(
+            "SELECT 1 FROM documents WHERE job_id = ? AND candidate_id = '' AND data_type = 'JobAd'", (job_id,)
+        ).fetchone()
+        return row is not None
+
+    def count_candidates(self, job_id: str):
+        return self._conn().execute("SELECT COUNT(*) FROM candidates WHERE job_id = ?", (job_id,)).fetchone()[0]
+
+    def find_candidates(self, status: str = None, job_id: str = None):
+        """İlanlar genelinde aday kayıtları - dizin gezmeden indeksten"""
+        query, params = "SELECT entry FROM candidates", []
+        conditions = []
+        if job_id:
+            conditions.append("job_id = ?")
+            params.append(job_id)
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        rows = self._conn().execute(query + " ORDER BY seq", params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def find_documents(self, data_type: str, job_id: str = None):
+        """Belirli türdeki tüm aday dokümanları: [(candidate_id, data), ...] (örn. tüm quiz_results)"""
+        query = "SELECT candidate_id, data FROM documents WHERE data_type = ? AND candidate_id != ''"
+        params = [data_type]
+        if job_id:
+            query += " AND job_id = ?"
+            params.append(job_id)
+        rows = self._conn().execute(query + " ORDER BY job_id, candidate_id", params).fetchall()
+        return [(row[0], json.loads(row[1])) for row in rows]
+
+    def iter_documents(self):
+        """Tüm dokümanlar: (job_id, candidate_id, data_type, data) - dışa aktarma için"""
+        rows = self._conn().execute(
+            "SELECT job_id, candidate_id, data_type, data FROM documents ORDER BY job_id, candidate_id, data_type"
+        )
+        for job_id, candidate_id, data_type, data in rows:
+            yield job_id, candidate_id, data_type, json.loads(data)
+
+    # ---------------- FileWriter ----------------
+    def save_job_data(self, job_id: str, data_type: str, data: dict):
+        self.catalog.add(job_id, "", f"{data_type}.json")
+        if data_type != INTERVIEW_LIST:
+            self._write((job_id, "", data_type), data)
+            return
+        # Interview_list: meta doküman olarak, adaylar tabloya
+        meta = {k: v for k, v in data.items() if k != "candidates"}
+        with self._transaction() as conn:
+            self._upsert(conn, (job_id, "", INTERVIEW_LIST), meta)
+            conn.execute("DELETE FROM candidates WHERE job_id = ?", (job_id,))
+            self._insert_entries(conn, job_id, data.get("candidates", []))
+        with self._cache_lock:
+            self._cached.pop((job_id, "", INTERVIEW_LIST), None)
+
+    def update_job_data(self, job_id: str, data_type: str, update):
+        """İlan dokümanını BEGIN IMMEDIATE altında okuyup update(data) sonucunu yazar (update içindeki okuma/yazmalar da aynı transaction'dadır)"""
+        key = (job_id, "", data_type)
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT data FROM documents WHERE job_id = ? AND candidate_id = ? AND data_type = ?", key
+            ).fetchone()
+            data = update(json.loads(row[0]) if row else {})
+            self._upsert(conn, key, data)
+        with self._cache_lock:
+            self._cached.pop(key, None)
+        self.catalog.add(job_id, "", f"{data_type}.json")
+        return data
+
+    def save_root_data(self, data_type: str, data: dict):
+        self._write(("", "", data_type), data)
+
+    def save_candidate_data(self, job_id: str, candidate_id: str, data_type: str, data: dict):
+        self._write((job_id, candidate_id, data_type), data)
+        self.catalog.add(job_id, candidate_id, f"{data_type}.json")
+
+    # ---------------- Transcript ----------------
+    def append_transcript(self, job_id: str, candidate_id: str, records: list):
+        with FILE_IO_SECONDS.time(op="append", kind="transcript"):
+            self._conn().executemany(
+                "INSERT INTO transcript_records (candidate_id, record) VALUES (?, ?)",
+                [(candidate_id, _dumps(record)) for record in records]
+            )
+        self.catalog.add(job_id, candidate_id, transcript_journal.TRANSCRIPT_JOURNAL_FILE)
+
+    def get_transcript_records(self, candidate_id: str):
+        conn = self._conn()
+        records = []
+        with FILE_IO_SECONDS.time(op="read", kind="transcript"):
+            row = conn.execute("SELECT data FROM transcript_archives WHERE candidate_id = ?", (candidate_id,)).fetchone()
+            if row:
+                records.extend(transcript_journal.read_archive(row[0]))
+            rows = conn.execute(
+                "SELECT record FROM transcript_records WHERE candidate_id = ? ORDER BY seq", (candidate_id,)
+            ).fetchall()
+            records.extend(json.loads(row[0]) for row in rows)
+        return records
+
+    def transcript_candidate_ids(self):
+        """
+        Transcript kaydı olan adaylar: [(job_id, candidate_id, açık kayıt var mı), ...] - dışa aktarma için.
+        İlan aday kaydından alınır; kaydı olmayan adayda ID'den çıkarılır, ID geçersizse aday atlanır.
+        """
+        rows = self._conn().execute(
+            "SELECT t.candidate_id, t.still_open, c.job_id FROM ("
+            "SELECT candidate_id, 0 AS still_open FROM transcript_archives "
+            "UNION ALL SELECT DISTINCT candidate_id, 1 FROM transcript_records"
+            ") t LEFT JOIN candidates c ON c.candidate_id = t.candidate_id"
+        ).fetchall()
+        jobs, open_ids = {}, set()
+        for candidate_id, still_open, job_id in rows:
+            jobs[candidate_id] = job_id or split_candidate_id(candidate_id)
+            if still_open:
+                open_ids.add(candidate_id)
+        return [
+            (jobs[candidate_id], candidate_id, candidate_id in open_ids)
+            for candidate_id in sorted(jobs) if jobs[candidate_id]
+        ]
+
+    def archive_transcript(self, job_id: str, candidate_id: str):
+        """Adayın tur kayıtları tek gzip satırına taşınır (TRANSCRIPT_COMPRESS=0 ise dokunulmaz)"""
+        if not transcript_journal.TRANSCRIPT_COMPRESS:
+            return
+        with self._transaction() as conn:
+            if conn.execute("SELECT 1 FROM transcript_records WHERE candidate_id = ? LIMIT 1", (candidate_id,)).fetchone() is None:
+                return
+            records = self.get_transcript_records(candidate_id)
+            conn.execute(
+                "INSERT OR REPLACE INTO transcript_archives (candidate_id, data) VALUES (?, ?)",
+                (candidate_id, transcript_journal.build_archive(records))
+            )
+            conn.execute("DELETE FROM transcript_records WHERE candidate_id = ?", (candidate_id,))
+        self.catalog.add(job_id, candidate_id, transcript_journal.TRANSCRIPT_ARCHIVE_FILE)
+        self.catalog.discard(candidate_id, transcript_journal.TRANSCRIPT_JOURNAL_FILE)
+
+    # ---------------- FileManagerOps ----------------
+    @staticmethod
+    def _insert_entries(conn, job_id: str, entries: list):
+        """Zaten kayıtlı adayları atlayarak ekler; eklenen sayıyı döndürür"""
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT OR IGNORE INTO candidates (candidate_id, job_id, status, name, email, entry) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (entry["candidate_id"], job_id, entry.get("status"), entry.get("name"), entry.get("email"), _dumps(entry))
+                for entry in entries
+            ]
+        )
+        return conn.total_changes - before
+
+    def create_candidate_folder(self, job_id: str, candidate_data: dict):
+        candidate_id = f"{job_id}-{str(uuid.uuid4())[:8]}"
+        self.create_candidate_folders(job_id, [(candidate_id, candidate_data)])
+        # Dosya tabanlı sürümle aynı mantıksal yol döner
+        return os.path.join(self.base_dir, job_id, candidate_id)
+
+    def create_candidate_folders(self, job_id: str, candidates: list, executor=None):
+        """CV'ler ve aday kayıtları tek transaction'da yazılır (executor kullanılmaz)"""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT INTO documents (job_id, candidate_id, data_type, data, version, updated_at) "
+                "VALUES (?, ?, 'cv_extraction', ?, 1, ?) "
+                "ON CONFLICT(job_id, candidate_id, data_type) DO UPDATE SET "
+                "data = excluded.data, version = documents.version + 1, updated_at = excluded.updated_at",
+                [(job_id, candidate_id, _dumps(data), now) for candidate_id, data in candidates]
+            )
+            added = self._insert_entries(
+                conn, job_id, [self._candidate_entry(candidate_id, data) for candidate_id, data in candidates]
+            )
+        with self._cache_lock:
+            for candidate_id, _ in candidates:
+                self._cached.pop((job_id, candidate_id, "cv_extraction"), None)
+        for candidate_id, _ in candidates:
+            self.catalog.add(job_id, candidate_id, "cv_extraction.json")
+        self._notify_candidates_added(job_id, candidates)
+        return added
+
+    def update_interview_entry(self, job_id: str, candidate_id: str, fields: dict):
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT entry FROM candidates WHERE candidate_id = ? AND job_id = ?", (candidate_id, job_id)
+            ).fetchone()
+            if row is None:
+                return
+            entry = {**json.loads(row[0]), **fields}
+            conn.execute(
+                "UPDATE candidates SET entry = ?, status = ?, name = ?, email = ? WHERE candidate_id = ?",
+                (_dumps(entry), entry.get("status"), entry.get("name"), entry.get("email"), candidate_id)
+            )
+
+    def compact_interview_list(self, job_id: str):
+        """SQLite'ta journal yok; aday listesi her zaman güncel"""
+
+    def get_candidate_file_path(self, candidate_id: str, file_name: str):
+        """Doküman varsa mantıksal yolunu (<base>/<ilan>/<aday>/<dosya>) döndürür"""
+        try:
+            key = self._candidate_key(candidate_id, _data_type(file_name))
+        except ValueError:
+            return None
+        if self.catalog.has_file(candidate_id, file_name):
+            return os.path.join(self.base_dir, key[0], candidate_id, f"{key[2]}.json")
+        row = self._conn().execute(
+            "SELECT 1 FROM documents WHERE job_id = ? AND candidate_id = ? AND data_type = ?", key
+        ).fetchone()
+        return os.path.join(self.base_dir, key[0], candidate_id, f"{key[2]}.json") if row else None
+
+    def get_all_candidate_files(self, candidate_id: str):
+        try:
+            job_id, _, _ = self._candidate_key(candidate_id, "")
+        except ValueError:
+            return []
+        rows = self._conn().execute(
+            "SELECT data_type FROM documents WHERE job_id = ? AND candidate_id = ? ORDER BY data_type", (job_id, candidate_id)
+        ).fetchall()
+        return [f"{row[0]}.json" for row in rows]
+
+    # ---------------- Katalog ----------------
+    def _scan_catalog(self):
+        """Dokümanlar, aday kayıtları ve transcript'ler - dosya tabanlı sürümle aynı (mantıksal) dosya adlarıyla"""
+        conn = self._conn()
+        for job_id, candidate_id, data_type in conn.execute(
+            "SELECT job_id, candidate_id, data_type FROM documents WHERE job_id != ''"
+        ).fetchall():
+            yield job_id, candidate_id, f"{data_type}.json"
+        for job_id, candidate_id in conn.execute("SELECT job_id, candidate_id FROM candidates").fetchall():
+            yield job_id, candidate_id, None
+        for job_id, candidate_id, still_open in self.transcript_candidate_ids():
+            file_name = transcript_journal.TRANSCRIPT_JOURNAL_FILE if still_open else transcript_journal.TRANSCRIPT_ARCHIVE_FILE
+            yield job_id, candidate_id, file_name
+
+    def _probe_candidate(self, job_id: str, candidate_id: str):
+        rows = self._conn().execute(
+            "SELECT data_type FROM documents WHERE job_id = ? AND candidate_id = ? "
+            "UNION ALL SELECT NULL FROM candidates WHERE candidate_id = ?", (job_id, candidate_id, candidate_id)
+        ).fetchall()
+        for (data_type,) in rows:
+            self.catalog.add(job_id, candidate_id, f"{data_type}.json" if data_type else None)
+        return bool(rows)
+
+    def get_cache_stats(self):
+        with self._cache_lock:
+            total = self.hits + self.misses
+            return {
+                "backend": "sqlite",
+                "entries": len(self._cached),
+                "max_entries": self.max_cached,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0
+            }
+
+    def invalidate_cache(self, file_path: str = None):
+        """SQLite'ta cache versiyonla doğrulanır; elle silmek sadece belleği boşaltır"""
+        with self._cache_lock:
+            self._cached.clear()
+
+
+class _Transaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
@@ -0,0 +1,85 @@
+import os
+import asyncio
+import contextvars
+from contextlib import contextmanager
+
+from utils.conversation_buffer import estimate_tokens
+from utils.metrics import usage_tokens
+
+# Bir mülakatın sohbet turlarında harcanabilecek toplam token (prompt + completion); 0 = sınırsız
+SESSION_TOKEN_CEILING = int(os.getenv("SESSION_TOKEN_CEILING", "0"))
+
+
+class TokenMeter:
+    """Tek bir sohbet turunun LLM kullanımı; sadece turu işleyen görevin çağrıları sayılır"""
+
+    def __init__(self):
+        self.task = asyncio.current_task()
+        self.prompt = 0
+        self.completion = 0
+        self.calls = 0
+        self.accounted = 0  # session toplamlarına yazılmış çağrı sayısı
+
+
+_meter = contextvars.ContextVar("token_meter", default=None)
+
+
+@contextmanager
+def metered():
+    """
+    Blok içindeki LLM çağrılarını turun sayacına yazar.
+    Bu görevden başlatılan arka plan işleri (greeting/quiz ön üretimi) context'i kopyalasa da
+    sayaç görev kontrolü yaptığı için adayın bütçesine yazılmaz.
+    """
+    token = _meter.set(TokenMeter())
+    try:
+        yield _meter.get()
+    finally:
+        try:
+            _meter.reset(token)
+        except ValueError:
+            pass  # Yarıda kesilen SSE generator'ı başka bir context'te kapatıldı; sayaç zaten atılıyor
+
+
+def record_usage(usage, messages: list = None, output_chars: int = 0):
+    """
+    Gateway her başarılı çağrıdan sonra çağırır. Sağlayıcı kullanım bilgisi göndermediyse
+    (bazı stream yanıtları) prompt ve çıktı uzunluğundan tahmin edilir.
+    """
+    meter = _meter.get()
+    if meter is None or meter.task is not asyncio.current_task():
+        return
+    tokens = usage_tokens(usage)
+    if tokens:
+        prompt, completion, _ = tokens
+    else:
+        prompt = sum(estimate_tokens(m.get("content") or "") for m in messages or [])
+        completion = output_chars // 4 + 1 if output_chars else 0
+    meter.prompt += prompt
+    meter.completion += completion
+    meter.calls += 1
+
+
+def account_session(session: dict) -> dict:
+    """
+    Turun henüz yazılmamış token'larını session'daki toplamlara ekler (save_turn'de çağrılır).
+    calls sıfırlanmaz; tur sonunda kapasite modeli LLM çağrısı yapılıp yapılmadığına ona bakar.
+    """
+    totals = session.setdefault("tokens", {"prompt": 0, "completion": 0, "turns": 0})
+    meter = _meter.get()
+    if meter is not None and meter.calls > meter.accounted:
+        totals["prompt"] += meter.prompt
+        totals["completion"] += meter.completion
+        totals["turns"] += 1
+        meter.prompt = meter.completion = 0
+        meter.accounted = meter.calls
+    return totals
+
+
+def session_tokens(session: dict) -> int:
+    totals = session.get("tokens") or {}
+    return totals.get("prompt", 0) + totals.get("completion", 0)
+
+
+def budget_exhausted(session: dict) -> bool:
+    return SESSION_TOKEN_CEILING > 0 and session_tokens(session) >= SESSION_TOKEN_CEILING
@@ -0,0 +1,94 @@
+import os
+import gzip
+import json
+import time
+from datetime import datetime
+
+TRANSCRIPT_JOURNAL_FILE = "transcript.journal.jsonl"
+TRANSCRIPT_ARCHIVE_FILE = "transcript.jsonl.gz"
+# Eski sürümlerin yazdığı ve artık journal'dan üretilen görünüm
+TRANSCRIPT_VIEW = "interview_transcript"
+
+# Mülakat bitince journal sıkıştırılmış arşive taşınır (0 ile journal olduğu gibi kalır)
+TRANSCRIPT_COMPRESS = os.getenv("TRANSCRIPT_COMPRESS", "1") != "0"
+# 1 ile her tur diske fsync edilir (varsayılan: işletim sistemine bırakılır, süreç çökmesinde kayıp yok)
+TRANSCRIPT_FSYNC = os.getenv("TRANSCRIPT_FSYNC", "0") == "1"
+
+
+def message_record(stage: str, sender: str, text: str, seq: int = None) -> dict:
+    """
+    Journal satırı: tek mesaj. stage = mesajın ait olduğu konuşma (starting | interview | ending),
+    seq = session içindeki sıra numarası (eski journal'larda yok; geri yüklemede sıradan üretilir)
+    """
+    record = {"ts": round(time.time(), 3), "stage": stage, "sender": sender, "text": text}
+    if seq is not None:
+        record["seq"] = seq
+    return record
+
+
+def stage_record(stage: str) -> dict:
+    """Journal satırı: session'ın yeni aşaması (session geri yüklenirken kullanılır)"""
+    return {"ts": round(time.time(), 3), "event": "stage", "stage": stage}
+
+
+def encode_records(records: list) -> str:
+    return "".join(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n" for record in records)
+
+
+def decode_lines(lines) -> list:
+    """JSONL satırlarını çözer; çökme anında yarım yazılmış son satır atlanır"""
+    records = []
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return records
+
+
+def read_archive(data: bytes) -> list:
+    return decode_lines(gzip.decompress(data).splitlines())
+
+
+def build_archive(records: list) -> bytes:
+    return gzip.compress(encode_records(records).encode("utf-8"), mtime=0)
+
+
+def _messages(records: list):
+    return [r for r in records if "sender" in r]
+
+
+def materialise(session_id: str, records: list) -> dict:
+    """Journal kayıtlarından interview_transcript.json formatındaki görünümü üretir"""
+    messages = _messages(records)
+    last_ts = records[-1]["ts"] if records else time.time()
+    return {
+        "session_id": session_id,
+        "timestamp": datetime.fromtimestamp(last_ts).isoformat(),
+        "starting_conversation": [{"sender": m["sender"], "text": m["text"]} for m in messages if m["stage"] == "starting"],
+        "ending_conversation": [{"sender": m["sender"], "text": m["text"]} for m in messages if m["stage"] == "ending"],
+        "full_conversation": [{"sender": m["sender"], "text": m["text"]} for m in messages]
+    }
+
+
+def restore_session(session: dict, records: list) -> dict:
+    """Yeniden başlatma sonrası session'ın aşamasını, konuşmalarını ve mesaj sıra numaralarını journal'dan kurar"""
+    session["starting_conversation"] = []
+    session["ending_conversation"] = []
+    session["full_conversation"] = []
+    seq = 0
+    for record in records:
+        if record.get("event") == "stage":
+            session["stage"] = record["stage"]
+        elif "sender" in record:
+            seq = record.get("seq", seq + 1)
+            message = {"sender": record["sender"], "text": record["text"], "seq": seq}
+            if record["stage"] in ("starting", "ending"):
+                session[f"{record['stage']}_conversation"].append(message)
+            session["full_conversation"].append(message)
+    session["seq"] = seq
+    return session
@@ -0,0 +1,370 @@
+"""
+Uçtan uca yük testi: simüle edilmiş adayları mülakat akışının tamamından geçirir.
+
+Akış (aday başına):
+    bekleme odası (/api/admission) -> karşılama -> ısınma sohbeti -> "hazırım" -> INTERVIEW_STARTED -> /api/agents/quiz
+    -> /api/save-quiz-results -> QUIZ_COMPLETED -> Q&A sorusu -> kapanış -> /api/save-transcript
+
+Varsayılan olarak sahte Groq sunucusunu (mock_groq.py) ve uygulamayı ayrı süreçlerde başlatır,
+test verisini geçici bir DATA_PATH'e hazırlar ve sonunda uç nokta başına p50/p95/p99,
+throughput ve uygulama sürecinin bellek artışını raporlar.
+
+Örnekler:
+    python load_test.py --candidates 2000 --concurrency 200
+    python load_test.py --candidates 500 --stream --mock-args "--latency-ms 800 --rate-limit-rate 0.05"
+    python load_test.py --target http://localhost:5001 --data-path ../../GENAR --server-pid 12345
+"""
+import os
+import sys
+import json
+import time
+import shlex
+import shutil
+import asyncio
+import argparse
+import tempfile
+import subprocess
+
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+API_DIR = os.path.join(os.path.dirname(BENCH_DIR), "api")
+GENAR_DIR = os.path.join(os.path.dirname(os.path.dirname(BENCH_DIR)), "GENAR")
+
+WARMUP_MESSAGES = [
+    "Merhaba, ben de sizinle tanıştığıma memnun oldum.",
+    "Son iki yılda dijital kampanyaların performans analizini yaptım, en çok veriyle çalışmaktan keyif alıyorum.",
+]
+ENDING_QUESTION = "Ekip yapısı ve birlikte çalışacağım kişiler hakkında biraz bilgi verebilir misiniz?"
+
+
+# ---------------- Ölçüm ----------------
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Sıralı listede nearest-rank yüzdelik"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class Recorder:
+    """Etiket başına gecikme ve hata kayıtları"""
+
+    def __init__(self):
+        self.latencies = {}  # label -> [saniye]
+        self.errors = {}     # label -> adet
+        self.flows_completed = 0
+        self.flows_failed = 0
+
+    def add(self, label: str, seconds: float, ok: bool):
+        self.latencies.setdefault(label, []).append(seconds)
+        if not ok:
+            self.errors[label] = self.errors.get(label, 0) + 1
+
+    def summary(self) -> dict:
+        result = {}
+        for label, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            result[label] = {
+                "count": len(values),
+                "errors": self.errors.get(label, 0),
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p95_ms": round(percentile(values, 95) * 1000, 1),
+                "p99_ms": round(percentile(values, 99) * 1000, 1),
+                "max_ms": round(values[-1] * 1000, 1),
+            }
+        return result
+
+
+def read_rss_kb(pid: int):
+    """Sürecin RSS'i (KB, sadece Linux /proc); okunamazsa None"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+async def sample_memory(pid: int, samples: list, interval: float = 0.5):
+    while True:
+        rss = read_rss_kb(pid)
+        if rss is not None:
+            samples.append(rss)
+        await asyncio.sleep(interval)
+
+
+# ---------------- Veri ve süreçler ----------------
+
+def prepare_data(data_path: str, job_id: str, seed_candidate: str, count: int) -> list:
+    """
+    Kaynak GENAR'dan ilan dosyalarını kopyalar ve seed adayın CV'siyle `count` sentetik aday oluşturur.
+    Oluşturulan aday ID'lerini döndürür.
+    """
+    src_job = os.path.join(GENAR_DIR, job_id)
+    dst_job = os.path.join(data_path, job_id)
+    os.makedirs(dst_job, exist_ok=True)
+    for name in os.listdir(src_job):
+        if os.path.isfile(os.path.join(src_job, name)):
+            shutil.copy(os.path.join(src_job, name), dst_job)
+
+    seed_cv = os.path.join(src_job, seed_candidate, "cv_extraction.json")
+    candidate_ids = []
+    for i in range(count):
+        candidate_id = f"{job_id}-B{i:06d}"
+        os.makedirs(os.path.join(dst_job, candidate_id), exist_ok=True)
+        shutil.copy(seed_cv, os.path.join(dst_job, candidate_id, "cv_extraction.json"))
+        candidate_ids.append(candidate_id)
+    return candidate_ids
+
+
+def spawn(args: list, env: dict, cwd: str, log_path: str) -> subprocess.Popen:
+    log = open(log_path, "w")
+    return subprocess.Popen(args, cwd=cwd, env={**os.environ, **env}, stdout=log, stderr=subprocess.STDOUT)
+
+
+async def wait_until_up(url: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} {timeout} sn içinde ayağa kalkmadı")
+
+
+# ---------------- Aday akışı ----------------
+
+class CandidateFlow:
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, candidate_id: str, stream: bool):
+        self.client = client
+        self.recorder = recorder
+        self.candidate_id = candidate_id
+        self.stream = stream
+
+    async def _post(self, label: str, path: str, body: dict, report_path: str = None) -> dict:
+        start = time.perf_counter()
+        ok = False
+        try:
+            response = await self.client.post(path, json=body)
+            ok = response.status_code == 200
+            return response.json() if ok else {}
+        except (httpx.HTTPError, ValueError):
+            return {}
+        finally:
+            self.recorder.add(f"{report_path or path} [{label}]", time.perf_counter() - start, ok)
+
+    async def _stream_chat(self, label: str, message: str) -> dict:
+        """/api/chat/stream: ilk token süresi ve toplam süre ayrı kaydedilir"""
+        path = "/api/chat/stream"
+        start = time.perf_counter()
+        first_token = None
+        result = {}
+        try:
+            async with self.client.stream("POST", path, json={"sessionId": self.candidate_id, "userMessage": message}) as response:
+                event = None
+                async for line in response.aiter_lines():
+                    if line.startswith("event: "):
+                        event = line[7:]
+                    elif line.startswith("data: "):
+                        if event == "token" and first_token is None:
+                            first_token = time.perf_counter() - start
+                        elif event == "done":
+                            result = json.loads(line[6:])
+        except (httpx.HTTPError, ValueError):
+            result = {}
+        elapsed = time.perf_counter() - start
+        self.recorder.add(f"{path} [{label}]", elapsed, bool(result))
+        if first_token is not None:
+            self.recorder.add(f"{path} [{label} ilk token]", first_token, True)
+        return result
+
+    async def chat(self, label: str, message: str) -> dict:
+        if self.stream and message and message not in ("INTERVIEW_STARTED", "QUIZ_COMPLETED"):
+            return await self._stream_chat(label, message)
+        return await self._post(label, "/api/chat", {"sessionId": self.candidate_id, "userMessage": message})
+
+    async def wait_room(self) -> bool:
+        """Bekleme odası: kabul edilene kadar sorgulanır; kabule kadar geçen süre ayrıca kaydedilir"""
+        start = time.perf_counter()
+        while True:
+            status = await self._post("bekleme odası", f"/api/admission/{self.candidate_id}", {}, report_path="/api/admission")
+            if not status:
+                return False
+            if status.get("admitted"):
+                self.recorder.add("/api/admission [kabule kadar]", time.perf_counter() - start, True)
+                return True
+            await asyncio.sleep(status.get("poll_seconds", 3))
+
+    async def run(self) -> bool:
+        sid = self.candidate_id
+        if not await self.wait_room():
+            return False
+        await self.chat("karşılama", "")
+        for message in WARMUP_MESSAGES:
+            await self.chat("ısınma", message)
+        if (await self.chat("ısınma", "hazırım")).get("action") != "START_INTERVIEW":
+            return False
+        if (await self.chat("mülakat", "INTERVIEW_STARTED")).get("action") != "START_QUIZ":
+            return False
+
+        quiz = await self._post("quiz", "/api/agents/quiz", {"sessionId": sid, "userMessage": ""})
+        if not isinstance(quiz, list) or not quiz:
+            return False
+        await self._post("quiz", "/api/save-quiz-results", {
+            "sessionId": sid, "score": 7, "totalQuestions": len(quiz),
+            "results": [{"question": q.get("question"), "selectedIndex": 0, "correct": True} for q in quiz]
+        })
+
+        await self.chat("kapanış", "QUIZ_COMPLETED")
+        await self.chat("kapanış", ENDING_QUESTION)
+        if (await self.chat("kapanış", "yok teşekkürler")).get("action") != "FINISH_INTERVIEW":
+            return False
+        saved = await self._post("transcript", "/api/save-transcript", {"sessionId": sid, "userMessage": ""})
+        return saved.get("status") == "success"
+
+
+async def drive(target: str, candidate_ids: list, concurrency: int, ramp_up: float, stream: bool, recorder: Recorder):
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=target, timeout=120, limits=limits) as client:
+        async def one(index: int, candidate_id: str):
+            if ramp_up:
+                await asyncio.sleep(ramp_up * index / len(candidate_ids))
+            async with semaphore:
+                try:
+                    ok = await CandidateFlow(client, recorder, candidate_id, stream).run()
+                except Exception as e:
+                    print(f"❌ {candidate_id}: {e}")
+                    ok = False
+                if ok:
+                    recorder.flows_completed += 1
+                else:
+                    recorder.flows_failed += 1
+
+        await asyncio.gather(*(one(i, cid) for i, cid in enumerate(candidate_ids)))
+
+
+# ---------------- Rapor ----------------
+
+def print_report(report: dict):
+    print()
+    print(f"{'Uç nokta [aşama]':<52}{'adet':>7}{'hata':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for label, row in report["endpoints"].items():
+        print(f"{label:<52}{row['count']:>7}{row['errors']:>6}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}{row['max_ms']:>10}")
+    print()
+    print(f"⏱️  Süre: {report['duration_s']} sn, {report['requests']} istek, {report['throughput_rps']} istek/sn")
+    print(f"👥 Akış: {report['flows_completed']} tamamlandı, {report['flows_failed']} başarısız ({report['flows_per_s']} aday/sn)")
+    memory = report.get("memory")
+    if memory:
+        print(f"🧠 RSS: başlangıç {memory['start_mb']} MB, tepe {memory['peak_mb']} MB, "
+              f"son {memory['end_mb']} MB (artış {memory['growth_mb']} MB)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Mülakat akışı yük testi")
+    parser.add_argument("--candidates", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--ramp-up", type=float, default=0, help="Adayların başlangıcının yayılacağı süre (sn)")
+    parser.add_argument("--stream", action="store_true", help="Sohbet turlarında /api/chat/stream kullan")
+    parser.add_argument("--job-id", default="Genar-00001")
+    parser.add_argument("--seed-candidate", default="Genar-00001-00001")
+    parser.add_argument("--target", help="Çalışan bir uygulamanın adresi; verilmezse mock + uygulama başlatılır")
+    parser.add_argument("--data-path", help="Sentetik adayların yazılacağı DATA_PATH (varsayılan: geçici klasör)")
+    parser.add_argument("--server-pid", type=int, help="--target ile bellek ölçümü için uygulama süreci PID'i")
+    parser.add_argument("--app-port", type=int, default=5101)
+    parser.add_argument("--mock-port", type=int, default=8100)
+    parser.add_argument("--mock-args", default="", help="mock_groq.py'ye geçirilecek argümanlar")
+    parser.add_argument("--app-env", action="append", default=[], help="Uygulamaya ek ortam değişkeni (KEY=VALUE)")
+    parser.add_argument("--json", help="Raporun yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    data_path = args.data_path or tempfile.mkdtemp(prefix="genar-bench-")
+    candidate_ids = prepare_data(data_path, args.job_id, args.seed_candidate, args.candidates)
+    print(f"📁 {len(candidate_ids)} sentetik aday hazırlandı: {data_path}")
+
+    processes = []
+    target = args.target
+    server_pid = args.server_pid
+    try:
+        if not target:
+            mock_url = f"http://127.0.0.1:{args.mock_port}"
+            processes.append(spawn(
+                [sys.executable, os.path.join(BENCH_DIR, "mock_groq.py"), "--port", str(args.mock_port)] + shlex.split(args.mock_args),
+                {}, BENCH_DIR, os.path.join(data_path, "mock.log")
+            ))
+            app_env = {
+                "DATA_PATH": data_path,
+                "GROQ_BASE_URL": mock_url,
+                "GROQ_API_KEY": "bench",
+                "GREETING_PREWARM": "0",
+                "MAX_SESSIONS": str(max(args.candidates * 2, 10000)),
+            }
+            app_env.update(kv.split("=", 1) for kv in args.app_env)
+            app_process = spawn(
+                [sys.executable, "-m", "uvicorn", "app:app", "--port", str(args.app_port), "--log-level", "warning"],
+                app_env, API_DIR, os.path.join(data_path, "app.log")
+            )
+            processes.append(app_process)
+            server_pid = app_process.pid
+            target = f"http://127.0.0.1:{args.app_port}"
+            await wait_until_up(f"{mock_url}/stats")
+        await wait_until_up(f"{target}/api/health")
+
+        recorder = Recorder()
+        memory_samples = []
+        sampler = asyncio.create_task(sample_memory(server_pid, memory_samples)) if server_pid else None
+        await asyncio.sleep(0.6)  # başlangıç RSS örneği
+
+        start = time.perf_counter()
+        await drive(target, candidate_ids, args.concurrency, args.ramp_up, args.stream, recorder)
+        duration = time.perf_counter() - start
+
+        await asyncio.sleep(0.6)
+        if sampler:
+            sampler.cancel()
+
+        endpoints = recorder.summary()
+        requests = sum(row["count"] for label, row in endpoints.items() if not label.endswith("ilk token]"))
+        report = {
+            "candidates": args.candidates,
+            "concurrency": args.concurrency,
+            "stream": args.stream,
+            "duration_s": round(duration, 2),
+            "requests": requests,
+            "throughput_rps": round(requests / duration, 1) if duration else 0,
+            "flows_completed": recorder.flows_completed,
+            "flows_failed": recorder.flows_failed,
+            "flows_per_s": round(recorder.flows_completed / duration, 2) if duration else 0,
+            "endpoints": endpoints,
+        }
+        if memory_samples:
+            report["memory"] = {
+                "start_mb": round(memory_samples[0] / 1024, 1),
+                "peak_mb": round(max(memory_samples) / 1024, 1),
+                "end_mb": round(memory_samples[-1] / 1024, 1),
+                "growth_mb": round((memory_samples[-1] - memory_samples[0]) / 1024, 1),
+            }
+        print_report(report)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if not args.data_path:
+            shutil.rmtree(data_path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
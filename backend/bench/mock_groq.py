@@ -0,0 +1,151 @@
+"""
+Yük testleri için yerel, OpenAI/Groq uyumlu sahte chat completion sunucusu.
+
+Gecikme, token hızı ve hata oranları ayarlanabilir; app.py'yi buraya yönlendirmek için:
+    GROQ_BASE_URL=http://127.0.0.1:8100 GROQ_API_KEY=bench python app.py
+
+Çalıştırma:
+    python mock_groq.py --port 8100 --latency-ms 400 --tokens-per-sec 250 --error-rate 0.01 --rate-limit-rate 0.02
+"""
+import os
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# Ayarlar ortam değişkenlerinden okunur (komut satırı argümanları bunları doldurur)
+LATENCY_MS = float(os.getenv("MOCK_LATENCY_MS", "400"))
+JITTER_MS = float(os.getenv("MOCK_JITTER_MS", "100"))
+TOKENS_PER_SEC = float(os.getenv("MOCK_TOKENS_PER_SEC", "250"))
+COMPLETION_TOKENS = int(os.getenv("MOCK_COMPLETION_TOKENS", "60"))
+ERROR_RATE = float(os.getenv("MOCK_ERROR_RATE", "0"))
+RATE_LIMIT_RATE = float(os.getenv("MOCK_RATE_LIMIT_RATE", "0"))
+RETRY_AFTER_SECONDS = float(os.getenv("MOCK_RETRY_AFTER_SECONDS", "1"))
+
+WORDS = ("Bu", "pozisyonda", "ekip", "çalışması", "çok", "önemli", "ve", "sizin", "deneyiminizi",
+         "merak", "ediyorum", "projelerinizden", "biraz", "bahseder", "misiniz")
+
+app = FastAPI()
+stats = {"requests": 0, "streams": 0, "errors": 0, "rate_limited": 0}
+
+
+def _reply_text(messages: list) -> str:
+    """Prompt'a göre agent'ın beklediği biçimde yanıt üretir"""
+    system = messages[0].get("content", "") if messages else ""
+    if "personality quiz" in system:
+        return json.dumps({"questions": [
+            {
+                "question": f"Soru {i + 1}: Yoğun bir dönemde önceliklerinizi nasıl belirlersiniz?",
+                "options": ["Plan yaparım", "Ekibe danışırım", "Acil olana odaklanırım", "Hepsini aynı anda yaparım"],
+                "correct_answer": "ABCD"[i % 4],
+                "time": 60
+            } for i in range(10)
+        ]}, ensure_ascii=False)
+    return " ".join(random.choice(WORDS) for _ in range(COMPLETION_TOKENS)) + "?"
+
+
+def _usage(messages: list, text: str) -> dict:
+    """Gerçek sunucu gibi prompt maliyetini de raporlar (tokenizer yerine ~4 karakter = 1 token)"""
+    prompt = sum(len(m.get("content") or "") // 4 + 1 for m in messages)
+    completion = len(text.split())
+    return {"prompt_tokens": prompt, "completion_tokens": completion, "total_tokens": prompt + completion}
+
+
+def _completion(text: str, model: str, usage: dict) -> dict:
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+        "usage": usage
+    }
+
+
+def _chunk(chunk_id: str, model: str, content=None, finish_reason=None, usage: dict = None) -> str:
+    delta = {"content": content} if content is not None else {}
+    body = {
+        "id": chunk_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+    }
+    if usage:
+        # Groq stream kullanımını son parçada x_groq.usage içinde gönderir
+        body["x_groq"] = {"id": chunk_id, "usage": usage}
+    return f"data: {json.dumps(body, ensure_ascii=False)}\n\n"
+
+
+@app.post("/openai/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    stats["requests"] += 1
+
+    # Hata enjeksiyonu: önce 429 (retry-after ile), sonra 500
+    roll = random.random()
+    if roll < RATE_LIMIT_RATE:
+        stats["rate_limited"] += 1
+        return JSONResponse(
+            {"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}},
+            status_code=429,
+            headers={"retry-after": str(RETRY_AFTER_SECONDS), "x-ratelimit-reset-requests": f"{RETRY_AFTER_SECONDS}s"}
+        )
+    if roll < RATE_LIMIT_RATE + ERROR_RATE:
+        stats["errors"] += 1
+        return JSONResponse({"error": {"message": "Internal server error", "type": "server_error"}}, status_code=500)
+
+    # İlk token gecikmesi
+    await asyncio.sleep(max(LATENCY_MS + random.uniform(-JITTER_MS, JITTER_MS), 0) / 1000)
+
+    model = body.get("model", "mock")
+    messages = body.get("messages", [])
+    text = _reply_text(messages)
+    usage = _usage(messages, text)
+    if not body.get("stream"):
+        await asyncio.sleep(len(text.split()) / TOKENS_PER_SEC)
+        return _completion(text, model, usage)
+
+    stats["streams"] += 1
+    chunk_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+
+    async def events():
+        for word in text.split(" "):
+            yield _chunk(chunk_id, model, word + " ")
+            await asyncio.sleep(1 / TOKENS_PER_SEC)
+        yield _chunk(chunk_id, model, finish_reason="stop", usage=usage)
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.get("/stats")
+async def mock_stats():
+    return stats
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Sahte Groq/OpenAI chat completion sunucusu")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=LATENCY_MS, help="İlk token gecikmesi")
+    parser.add_argument("--jitter-ms", type=float, default=JITTER_MS)
+    parser.add_argument("--tokens-per-sec", type=float, default=TOKENS_PER_SEC)
+    parser.add_argument("--completion-tokens", type=int, default=COMPLETION_TOKENS)
+    parser.add_argument("--error-rate", type=float, default=ERROR_RATE, help="500 dönen istek oranı (0-1)")
+    parser.add_argument("--rate-limit-rate", type=float, default=RATE_LIMIT_RATE, help="429 dönen istek oranı (0-1)")
+    parser.add_argument("--retry-after", type=float, default=RETRY_AFTER_SECONDS)
+    args = parser.parse_args()
+
+    LATENCY_MS, JITTER_MS = args.latency_ms, args.jitter_ms
+    TOKENS_PER_SEC, COMPLETION_TOKENS = args.tokens_per_sec, args.completion_tokens
+    ERROR_RATE, RATE_LIMIT_RATE, RETRY_AFTER_SECONDS = args.error_rate, args.rate_limit_rate, args.retry_after
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
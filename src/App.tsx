@@ -33,6 +33,7 @@ const App: React.FC = () => {
     const [quizScore, setQuizScore] = useState(0);
     const [isQuizDone, setIsQuizDone] = useState(false);
     const [quizPreloaded, setQuizPreloaded] = useState(false);
+    const [startNow, setStartNow] = useState(false);
 
     useEffect(() => {
         // Prevent flash of content before styles are loaded, especially with CDN
@@ -56,9 +57,11 @@ const App: React.FC = () => {
             // 5 dakika kala quiz'i oluştur
             if (timeUntilInterview <= 300000 && timeUntilInterview > 0 && !quizPreloaded) {
                 console.log('🟢 5 dakika kaldı, quiz oluşturuluyor...');
+                // Backend aynı session'a aynı quiz'i döndürür, Quiz.tsx'in isteği anında yanıtlanır
                 fetch('http://localhost:5001/api/agents/quiz', {
                     method: 'POST',
-                    headers: { 'Content-Type': 'application/json' }
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ sessionId: sessionIdRef.current, userMessage: '' })
                 })
                 .then(response => response.json())
                 .then(data => {
@@ -92,9 +95,9 @@ const App: React.FC = () => {
     const renderPage = () => {
         switch (page) {
             case 'scheduling':
-                return <Scheduling onStart={() => setPage('chatbot')} onScheduleLater={() => setPage('waiting')} />;
+                return <Scheduling onStart={() => { setStartNow(true); setPage('waiting'); }} onScheduleLater={() => { setStartNow(false); setPage('waiting'); }} />;
             case 'waiting':
-                return <WaitingRoom onCountdownFinish={() => setPage('chatbot')} />;
+                return <WaitingRoom sessionId={sessionIdRef.current} immediate={startNow} onCountdownFinish={() => setPage('chatbot')} />;
             case 'chatbot':
                 // Mülakat öncesi sohbetten sonra doğrudan quiz'e geçiş yapılıyor.
                 return <Chatbot sessionId={sessionIdRef.current!} mode="pre-interview" onStartInterview={() => setPage('interview')} onStartQuiz={() => setPage('quiz')} />;
@@ -107,7 +110,7 @@ const App: React.FC = () => {
             case 'completion':
                 return <Completion score={quizScore} totalQuestions={10} sessionId={sessionIdRef.current!} onRestart={handleRestart} />;
             default:
-                return <Scheduling onStart={() => setPage('chatbot')} onScheduleLater={() => setPage('waiting')} />;
+                return <Scheduling onStart={() => { setStartNow(true); setPage('waiting'); }} onScheduleLater={() => { setStartNow(false); setPage('waiting'); }} />;
         }
     };
 
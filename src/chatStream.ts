@@ -0,0 +1,162 @@
+import type { ChatMessage, QuizQuestion } from './types';
+
+export interface ChatResult {
+    response: string;
+    action: string | null;
+    seq: number;
+    // lastSeq'ten sonra eklenen mesajlar (sadece yeniler; tüm geçmiş her turda tekrar gönderilmez)
+    messages: ChatMessage[];
+}
+
+// SSE yanıtını okur; her olay için onEvent(olay adı, JSON gövde) çağrılır
+const readEvents = async (
+    url: string,
+    body: unknown,
+    onEvent: (eventName: string, payload: any) => void
+): Promise<void> => {
+    const response = await fetch(url, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(body),
+    });
+    if (!response.ok || !response.body) throw new Error(`HTTP ${response.status}`);
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary = buffer.indexOf('\n\n');
+        while (boundary !== -1) {
+            const rawEvent = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            boundary = buffer.indexOf('\n\n');
+
+            // SSE alanları: "alan: değer" (değerden önceki tek boşluk atılır); birden fazla data satırı \n ile birleşir
+            let eventName = 'message';
+            const dataLines: string[] = [];
+            for (const line of rawEvent.split('\n')) {
+                if (line.startsWith(':')) continue;
+                const colon = line.indexOf(':');
+                const field = colon === -1 ? line : line.slice(0, colon);
+                let value = colon === -1 ? '' : line.slice(colon + 1);
+                if (value.startsWith(' ')) value = value.slice(1);
+                if (field === 'event') eventName = value;
+                else if (field === 'data') dataLines.push(value);
+            }
+            if (!dataLines.length) continue;
+
+            onEvent(eventName, JSON.parse(dataLines.join('\n')));
+        }
+    }
+};
+
+// /api/chat/stream SSE yanıtını okur: her "token" olayında onToken çağrılır, "done" olayının gövdesi döner, "error" olayı fırlatılır
+export const streamChat = async (
+    sessionId: string,
+    userMessage: string,
+    lastSeq: number,
+    onToken: (text: string) => void
+): Promise<ChatResult> => {
+    let result: ChatResult | null = null;
+    let error: string | null = null;
+    await readEvents('http://localhost:5001/api/chat/stream', { sessionId, userMessage, lastSeq }, (eventName, payload) => {
+        if (eventName === 'token') onToken(payload.text);
+        else if (eventName === 'done') result = payload;
+        else if (eventName === 'error') error = payload.detail;
+    });
+
+    if (error) throw new Error(error);
+    if (!result) throw new Error('Stream tamamlanmadan kapandı');
+    return result;
+};
+
+// Sohbet kanalı: turlar mülakat boyunca açık kalan WebSocket üzerinden gider; bağlantı kurulamazsa
+// /api/chat/stream POST'larına düşülür. Sunucu her turda sadece lastSeq'ten sonraki mesajları gönderir,
+// onaylı geçmiş (history) burada sıra numarasıyla birleştirilir.
+export class ChatChannel {
+    history: ChatMessage[] = [];
+    lastSeq = 0;
+    private socket: WebSocket | null = null;
+    private connecting: Promise<WebSocket | null> | null = null;
+    private socketDisabled = false;
+
+    constructor(private sessionId: string) {}
+
+    private connect(): Promise<WebSocket | null> {
+        if (this.socketDisabled) return Promise.resolve(null);
+        if (this.socket?.readyState === WebSocket.OPEN) return Promise.resolve(this.socket);
+        if (!this.connecting) {
+            this.connecting = new Promise(resolve => {
+                const socket = new WebSocket(`ws://localhost:5001/api/chat/ws/${encodeURIComponent(this.sessionId)}`);
+                socket.onopen = () => {
+                    this.socket = socket;
+                    this.connecting = null;
+                    resolve(socket);
+                };
+                socket.onclose = () => {
+                    // Hiç açılamadıysa bu kanal SSE ile devam eder
+                    if (this.connecting) this.socketDisabled = true;
+                    this.connecting = null;
+                    this.socket = null;
+                    resolve(null);
+                };
+            });
+        }
+        return this.connecting;
+    }
+
+    private sendOverSocket(socket: WebSocket, userMessage: string, onToken: (text: string) => void): Promise<ChatResult> {
+        return new Promise((resolve, reject) => {
+            socket.onmessage = (event) => {
+                const { event: eventName, ...payload } = JSON.parse(event.data);
+                if (eventName === 'token') onToken(payload.text);
+                else if (eventName === 'done') resolve(payload as ChatResult);
+                else if (eventName === 'error') reject(new Error(payload.detail));
+            };
+            socket.onclose = () => {
+                this.socket = null;
+                reject(new Error('Bağlantı tur tamamlanmadan kapandı'));
+            };
+            socket.send(JSON.stringify({ userMessage, lastSeq: this.lastSeq }));
+        });
+    }
+
+    async send(userMessage: string, onToken: (text: string) => void = () => {}): Promise<ChatResult> {
+        const socket = await this.connect();
+        const result = socket
+            ? await this.sendOverSocket(socket, userMessage, onToken)
+            : await streamChat(this.sessionId, userMessage, this.lastSeq, onToken);
+        this.history = [...this.history, ...result.messages.filter(m => (m.seq ?? 0) > this.lastSeq)];
+        this.lastSeq = result.seq;
+        return result;
+    }
+
+    close() {
+        const socket = this.socket;
+        this.socket = null;
+        socket?.close();
+    }
+}
+
+// /api/agents/quiz/stream SSE yanıtını okur: her "question" olayında onQuestion çağrılır, toplam soru sayısı döner
+export const streamQuiz = async (
+    sessionId: string,
+    onQuestion: (question: QuizQuestion, index: number) => void
+): Promise<number> => {
+    let total: number | null = null;
+    let error: string | null = null;
+    await readEvents('http://localhost:5001/api/agents/quiz/stream', { sessionId, userMessage: '' }, (eventName, payload) => {
+        if (eventName === 'question') onQuestion(payload.question, payload.index);
+        else if (eventName === 'done') total = payload.total;
+        else if (eventName === 'error') error = payload.detail;
+    });
+
+    if (error) throw new Error(error);
+    if (total === null) throw new Error('Stream tamamlanmadan kapandı');
+    return total;
+};
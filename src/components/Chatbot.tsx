@@ -1,9 +1,6 @@
 import React, { useState, useEffect, useRef } from 'react';
-
-interface ChatMessage {
-    sender: 'user' | 'assistant';
-    text: string;
-}
+import { ChatChannel } from '../chatStream';
+import type { ChatMessage } from '../types';
 
 interface ChatbotProps {
     sessionId: string;
@@ -51,6 +48,7 @@ const Chatbot: React.FC<ChatbotProps> = ({ sessionId, mode, onStartInterview, on
     const [messages, setMessages] = useState<ChatMessage[]>([]);
     const [inputValue, setInputValue] = useState('');
     const [isLoading, setIsLoading] = useState(true);
+    const [isStreaming, setIsStreaming] = useState(false);
     const [isRecording, setIsRecording] = useState(false);
     const [isSpeaking, setIsSpeaking] = useState(false);
 
@@ -58,6 +56,8 @@ const Chatbot: React.FC<ChatbotProps> = ({ sessionId, mode, onStartInterview, on
     const audioChunksRef = useRef<Blob[]>([]);
     const chatContainerRef = useRef<HTMLDivElement>(null);
     const hasLoadedRef = useRef(false);
+    const channelRef = useRef<ChatChannel | null>(null);
+    if (!channelRef.current) channelRef.current = new ChatChannel(sessionId);
 
     // ---------------- TTS ----------------
     const handlePlayAudio = (text: string) => {
@@ -115,19 +115,12 @@ const Chatbot: React.FC<ChatbotProps> = ({ sessionId, mode, onStartInterview, on
         const fetchInitialMessage = async () => {
             setIsLoading(true);
             try {
-                const response = await fetch('http://localhost:5001/api/chat', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({
-                        sessionId,
-                        userMessage: mode === 'post-quiz' ? 'QUIZ_COMPLETED' : ''
-                    }),
-                });
-                if (!response.ok) throw new Error(`HTTP ${response.status}`);
-                const data = await response.json();
+                // lastSeq=0: ilk çağrıda görünümdeki tüm mesajlar gelir, sonraki turlarda sadece yeniler
+                const channel = channelRef.current!;
+                const data = await channel.send(mode === 'post-quiz' ? 'QUIZ_COMPLETED' : '');
 
-                if (data.conversation_history?.length) {
-                    setMessages(data.conversation_history);
+                if (channel.history.length) {
+                    setMessages(channel.history);
                 } else if (data.response?.trim()) {
                     setMessages([{ sender: 'assistant', text: data.response }]);
                 } else {
@@ -146,6 +139,7 @@ const Chatbot: React.FC<ChatbotProps> = ({ sessionId, mode, onStartInterview, on
         fetchInitialMessage();
 
         return () => {
+            channelRef.current?.close();
             window.speechSynthesis.cancel();
             if (mediaRecorderRef.current && isRecording) {
                 mediaRecorderRef.current.stream.getTracks().forEach(track => track.stop());
@@ -170,15 +164,21 @@ const Chatbot: React.FC<ChatbotProps> = ({ sessionId, mode, onStartInterview, on
         setIsLoading(true);
 
         try {
-            const response = await fetch('http://localhost:5001/api/chat', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ sessionId, userMessage: userMessage.text }),
+            let streamed = '';
+            const channel = channelRef.current!;
+            const data = await channel.send(userMessage.text, (text) => {
+                const next = streamed + text;
+                if (!streamed) {
+                    setIsStreaming(true);
+                    setMessages(prev => [...prev, { sender: 'assistant', text: next }]);
+                } else {
+                    setMessages(prev => [...prev.slice(0, -1), { sender: 'assistant', text: next }]);
+                }
+                streamed = next;
             });
-            if (!response.ok) throw new Error('API error');
-            const data = await response.json();
 
-            if (data.response?.trim()) setMessages(prev => [...prev, { sender: 'assistant', text: data.response }]);
+            // Geçici (stream edilen) mesajlar sunucunun onayladığı yeni mesajlarla değiştirilir
+            setMessages(channel.history);
 
             if (data.action === 'START_INTERVIEW') setTimeout(() => onStartInterview?.(), 1000);
             else if (data.action === 'START_QUIZ') setTimeout(() => onStartQuiz?.(), 1000);
@@ -189,6 +189,7 @@ const Chatbot: React.FC<ChatbotProps> = ({ sessionId, mode, onStartInterview, on
             setMessages(prev => [...prev, { sender: 'assistant', text: 'Üzgünüm, bir hata oluştu. Lütfen tekrar deneyin.' }]);
         } finally {
             setIsLoading(false);
+            setIsStreaming(false);
         }
     };
 
@@ -226,7 +227,7 @@ const Chatbot: React.FC<ChatbotProps> = ({ sessionId, mode, onStartInterview, on
                     </div>
                 ))}
 
-                {isLoading && (
+                {isLoading && !isStreaming && (
                     <div className="flex items-start gap-4">
                         <AssistantAvatar />
                         <div className="rounded-2xl p-4 bg-gray-100">
@@ -1,9 +1,6 @@
 import React, { useState, useEffect, useRef } from 'react';
-
-interface ChatMessage {
-    sender: 'user' | 'assistant';
-    text: string;
-}
+import { ChatChannel } from '../chatStream';
+import type { ChatMessage } from '../types';
 
 interface QnAProps {
     sessionId: string;
@@ -34,12 +31,15 @@ const QnA: React.FC<QnAProps> = ({ sessionId, onComplete }) => {
     const [messages, setMessages] = useState<ChatMessage[]>([]);
     const [inputValue, setInputValue] = useState('');
     const [isLoading, setIsLoading] = useState(true);
+    const [isStreaming, setIsStreaming] = useState(false);
     const [isRecording, setIsRecording] = useState(false);
     const [isSpeaking, setIsSpeaking] = useState(false);
     const mediaRecorderRef = useRef<MediaRecorder | null>(null);
     const audioChunksRef = useRef<Blob[]>([]);
     const chatContainerRef = useRef<HTMLDivElement>(null);
     const initializedRef = useRef(false); // React Strict Mode için
+    const channelRef = useRef<ChatChannel | null>(null);
+    if (!channelRef.current) channelRef.current = new ChatChannel(sessionId);
     
     const handlePlayAudio = (text: string) => {
         if (isSpeaking || !text?.trim()) return;
@@ -103,29 +103,17 @@ const QnA: React.FC<QnAProps> = ({ sessionId, onComplete }) => {
             try {
                 // Ending agent'ı başlat
                 console.log('🔴 QnA: QUIZ_COMPLETED sinyali gönderiliyor...');
-                const response = await fetch('http://localhost:5001/api/chat', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({
-                        sessionId: sessionId,
-                        userMessage: 'QUIZ_COMPLETED'
-                    })
-                });
+                const channel = channelRef.current!;
+                const data = await channel.send('QUIZ_COMPLETED');
+                console.log('🔴 QnA: Backend data:', data);
+                console.log('🔴 QnA: Conversation history length:', channel.history.length);
 
-                if (response.ok) {
-                    const data = await response.json();
-                    console.log('🔴 QnA: Backend data:', data);
-                    console.log('🔴 QnA: Conversation history length:', data.conversation_history?.length);
-                    console.log('🔴 QnA: Response text:', data.response);
-                    
-                    if (data.conversation_history && data.conversation_history.length > 0) {
-                        setMessages(data.conversation_history);
-                        console.log('🔴 QnA: Conversation history güncellendi:', data.conversation_history);
-                    } else if (data.response) {
-                        // Eğer history boşsa ama response varsa, sadece response'u ekle
-                        setMessages([{ sender: 'assistant', text: data.response }]);
-                        console.log('🔴 QnA: Sadece response eklendi');
-                    }
+                if (channel.history.length > 0) {
+                    setMessages(channel.history);
+                } else if (data.response) {
+                    // Eğer history boşsa ama response varsa, sadece response'u ekle
+                    setMessages([{ sender: 'assistant', text: data.response }]);
+                    console.log('🔴 QnA: Sadece response eklendi');
                 }
             } catch (error) {
                 console.error('Ending agent başlatma hatası:', error);
@@ -139,6 +127,7 @@ const QnA: React.FC<QnAProps> = ({ sessionId, onComplete }) => {
         };
 
         initializeEndingAgent();
+        return () => channelRef.current?.close();
     }, []);
 
     useEffect(() => {
@@ -159,25 +148,24 @@ const QnA: React.FC<QnAProps> = ({ sessionId, onComplete }) => {
         setIsLoading(true);
         
         try {
-            const response = await fetch('http://localhost:5001/api/chat', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    sessionId: sessionId,
-                    userMessage: userMessage.text,
-                }),
-            });
-            
-            if (response.ok) {
-                const data = await response.json();
-                if (data.response) {
-                    const agentMessage: ChatMessage = { sender: 'assistant', text: data.response };
-                    setMessages(prev => [...prev, agentMessage]);
+            let streamed = '';
+            const channel = channelRef.current!;
+            const data = await channel.send(userMessage.text, (text) => {
+                const next = streamed + text;
+                if (!streamed) {
+                    setIsStreaming(true);
+                    setMessages(prev => [...prev, { sender: 'assistant', text: next }]);
+                } else {
+                    setMessages(prev => [...prev.slice(0, -1), { sender: 'assistant', text: next }]);
                 }
+                streamed = next;
+            });
 
-                if (data.action === 'FINISH_INTERVIEW') {
-                    setTimeout(() => onComplete(), 2000);
-                }
+            // Geçici (stream edilen) mesajlar sunucunun onayladığı yeni mesajlarla değiştirilir
+            setMessages(channel.history);
+
+            if (data.action === 'FINISH_INTERVIEW') {
+                setTimeout(() => onComplete(), 2000);
             }
         } catch (error) {
             console.error('Chat error:', error);
@@ -187,6 +175,7 @@ const QnA: React.FC<QnAProps> = ({ sessionId, onComplete }) => {
             }]);
         } finally {
             setIsLoading(false);
+            setIsStreaming(false);
         }
     };
 
@@ -222,7 +211,7 @@ const QnA: React.FC<QnAProps> = ({ sessionId, onComplete }) => {
                     </div>
                 ))}
                 
-                {isLoading && (
+                {isLoading && !isStreaming && (
                     <div className="flex items-start gap-4">
                         <AssistantAvatar />
                         <div className="rounded-2xl p-4 bg-gray-100">
@@ -1,6 +1,10 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import type { QuizQuestion } from '../types';
 import { VideoOffIcon } from './Icons';
+import { streamQuiz } from '../chatStream';
+
+// Backend'in ürettiği soru sayısı; stream sürerken ilerleme göstergesinde kullanılır
+const EXPECTED_QUESTIONS = 10;
 
 interface QuizProps {
     onComplete: (score: number) => void;
@@ -16,6 +20,13 @@ const Quiz: React.FC<QuizProps> = ({ onComplete, sessionId }) => {
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
     const [timeLeft, setTimeLeft] = useState(60);
+    // Sorular stream ile geldiği için quiz, tüm sorular gelmeden başlayabilir
+    const [streamDone, setStreamDone] = useState(false);
+    // Her sorunun seçilen şıkkı (-1: boş); sonuçlarda soru bazında doğru/yanlış için
+    const answersRef = useRef<number[]>([]);
+
+    // Timer her render'daki güncel handleNext'i çağırır; yeni soru gelmesi süreyi sıfırlamaz
+    const handleNextRef = useRef<() => void>(() => {});
 
     // Timer effect
     useEffect(() => {
@@ -27,7 +38,7 @@ const Quiz: React.FC<QuizProps> = ({ onComplete, sessionId }) => {
             setTimeLeft(prev => {
                 if (prev <= 1) {
                     // Süre doldu, otomatik geç
-                    handleNext();
+                    handleNextRef.current();
                     return 60;
                 }
                 return prev - 1;
@@ -35,7 +46,7 @@ const Quiz: React.FC<QuizProps> = ({ onComplete, sessionId }) => {
         }, 1000);
         
         return () => clearInterval(timer);
-    }, [currentQuestion, loading, quizData.length]);
+    }, [currentQuestion, loading, quizData.length > 0]);
 
     useEffect(() => {
         let isMounted = true;
@@ -59,28 +70,29 @@ const Quiz: React.FC<QuizProps> = ({ onComplete, sessionId }) => {
             console.log('🔍 Quiz yükleniyor - SessionId:', finalSessionId);
             
             // Eğer preloaded quiz yoksa, yeni oluştur
+            let received = 0;
             try {
                 if (isMounted) setLoading(true);
                 
-                // SessionId zaten yukarıda alındı
-                const response = await fetch('http://localhost:5001/api/agents/quiz', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({ sessionId: finalSessionId, userMessage: '' })
+                // Her soru hazır olur olmaz eklenir; ilk soru gelince quiz başlar
+                const total = await streamQuiz(finalSessionId, (question, index) => {
+                    if (!isMounted) return;
+                    if (index === 0) console.log('📝 Oluşturulan quiz:', question.question);
+                    received += 1;
+                    setQuizData(prev => [...prev, question]);
+                    setLoading(false);
                 });
-                if (!response.ok) throw new Error('Quiz API request failed');
-
-                const questions = await response.json();
-                
-                // Debug: Quiz içeriğini logla
-                console.log('📝 Oluşturulan quiz:', questions[0]?.question);
                 
                 if (isMounted) {
-                    setQuizData(questions);
+                    console.log('✅ Quiz tamamlandı:', total, 'soru');
+                    setStreamDone(true);
                     setError(null);
                 }
             } catch (err) {
-                if (isMounted) {
+                if (isMounted && received > 0) {
+                    // Gelen sorularla devam edilir
+                    setStreamDone(true);
+                } else if (isMounted) {
                     setError('Quiz yüklenemedi: ' + err.message);
                     // Fallback quiz
                     setQuizData([
@@ -90,6 +102,7 @@ const Quiz: React.FC<QuizProps> = ({ onComplete, sessionId }) => {
                             correctAnswerIndex: 1
                         }
                     ]);
+                    setStreamDone(true);
                 }
             } finally {
                 if (isMounted) setLoading(false);
@@ -105,8 +118,11 @@ const Quiz: React.FC<QuizProps> = ({ onComplete, sessionId }) => {
 
     const handleNext = async () => {
         if (quizData.length === 0) return;
+        // Son gelen sorudayız ama stream sürüyor: sonraki soru gelene kadar beklenir
+        if (currentQuestion >= quizData.length - 1 && !streamDone) return;
         
         const isCorrect = selectedOption === quizData[currentQuestion].correctAnswerIndex;
+        answersRef.current[currentQuestion] = selectedOption ?? -1;
 
         if (currentQuestion < quizData.length - 1) {
             if (isCorrect) {
@@ -116,13 +132,16 @@ const Quiz: React.FC<QuizProps> = ({ onComplete, sessionId }) => {
             setCurrentQuestion(prev => prev + 1);
         } else {
             const finalScore = score + (isCorrect ? 1 : 0);
-            const quizResults = quizData.map((q, index) => ({
-                question: q.question,
-                options: q.options,
-                selectedAnswer: index === currentQuestion ? selectedOption : -1,
-                correctAnswer: q.correctAnswerIndex,
-                isCorrect: index === currentQuestion ? isCorrect : false
-            }));
+            const quizResults = quizData.map((q, index) => {
+                const selectedAnswer = answersRef.current[index] ?? -1;
+                return {
+                    question: q.question,
+                    options: q.options,
+                    selectedAnswer,
+                    correctAnswer: q.correctAnswerIndex,
+                    isCorrect: selectedAnswer === q.correctAnswerIndex
+                };
+            });
             
             // Backend'e quiz sonuçlarını kaydet
             try {
@@ -143,6 +162,9 @@ const Quiz: React.FC<QuizProps> = ({ onComplete, sessionId }) => {
             onComplete(finalScore);
         }
     };
+    handleNextRef.current = handleNext;
+
+    const waitingForQuestion = currentQuestion >= quizData.length - 1 && !streamDone;
 
     if (loading) {
         return (
@@ -230,7 +252,7 @@ const Quiz: React.FC<QuizProps> = ({ onComplete, sessionId }) => {
                     {timeLeft}s
                 </div>
                 <div className="mb-6">
-                    <p className="text-sm font-semibold text-[#58b0b8]">Kişilik Değerlendirmesi - Soru {currentQuestion + 1}/{quizData.length}</p>
+                    <p className="text-sm font-semibold text-[#58b0b8]">Kişilik Değerlendirmesi - Soru {currentQuestion + 1}/{streamDone ? quizData.length : Math.max(quizData.length, EXPECTED_QUESTIONS)}</p>
                     <h2 className="text-lg font-bold text-gray-800 mt-2">{quizData[currentQuestion]?.question}</h2>
                 </div>
                 <div className="flex-grow space-y-4">
@@ -255,10 +277,10 @@ const Quiz: React.FC<QuizProps> = ({ onComplete, sessionId }) => {
                 <div className="mt-8 flex items-center gap-4">
                     <button
                         onClick={handleNext}
-                        disabled={selectedOption === null}
+                        disabled={selectedOption === null || waitingForQuestion}
                         className="w-full bg-[#58b0b8] text-white font-bold py-3 px-4 rounded-lg hover:bg-opacity-90 transition-opacity disabled:bg-gray-300 disabled:cursor-not-allowed"
                     >
-                        {currentQuestion === quizData.length - 1 ? "Tamamla" : "Sonraki"}
+                        {waitingForQuestion ? "Sonraki soru hazırlanıyor..." : currentQuestion === quizData.length - 1 ? "Tamamla" : "Sonraki"}
                     </button>
                 </div>
             </div>
@@ -1,15 +1,30 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { SpinnerIcon, ClockIcon } from './Icons';
 
 interface WaitingRoomProps {
+    sessionId: string | null;
+    // Hemen başla: randevu beklenmeden doğrudan giriş sırasına girilir
+    immediate?: boolean;
     onCountdownFinish: () => void;
 }
 
-const WaitingRoom: React.FC<WaitingRoomProps> = ({ onCountdownFinish }) => {
+// /api/admission yanıtı: kabul edilmediyse kuyruktaki sıra ve tahmini bekleme
+interface AdmissionStatus {
+    admitted: boolean;
+    position: number;
+    eta_seconds: number;
+    queued: number;
+    poll_seconds: number;
+}
+
+const WaitingRoom: React.FC<WaitingRoomProps> = ({ sessionId, immediate = false, onCountdownFinish }) => {
     const [scheduledDateTime, setScheduledDateTime] = useState<Date | null>(null);
     const [currentTime, setCurrentTime] = useState(new Date());
-    const [isConfirming, setIsConfirming] = useState(true);
-    const [chatStarted, setChatStarted] = useState(false);
+    const [isConfirming, setIsConfirming] = useState(!immediate);
+    const [chatStarted, setChatStarted] = useState(immediate);
+    const [admission, setAdmission] = useState<AdmissionStatus | null>(null);
+    const onFinishRef = useRef(onCountdownFinish);
+    onFinishRef.current = onCountdownFinish;
     
     useEffect(() => {
         // localStorage'dan zamanlanmış mülakat bilgisini al
@@ -43,13 +58,70 @@ const WaitingRoom: React.FC<WaitingRoomProps> = ({ onCountdownFinish }) => {
         const scheduled = scheduledDateTime.getTime();
         const timeUntilInterview = scheduled - now;
         
-        // Mülakat saatinden 1 dakika önce chatbot'u başlat
-        if (timeUntilInterview <= 60000 && timeUntilInterview > 0 && !chatStarted) {
-            console.log('🟢 1 dakika kaldı, chatbot başlatılıyor...');
+        // Mülakat saatinden 1 dakika önce (ya da saat geçmişse hemen) giriş sırasına gir
+        if (timeUntilInterview <= 60000 && !chatStarted) {
+            console.log('🟢 1 dakika kaldı, giriş sırası alınıyor...');
             setChatStarted(true);
-            onCountdownFinish();
         }
-    }, [currentTime, scheduledDateTime, chatStarted, onCountdownFinish]);
+    }, [currentTime, scheduledDateTime, chatStarted]);
+
+    useEffect(() => {
+        // Sunucu kapasitesi doluysa sıra gelene kadar bekleme odası durumu sorgulanır
+        if (!chatStarted) return;
+        let cancelled = false;
+        let timer: ReturnType<typeof setTimeout>;
+
+        const poll = async () => {
+            let delay = 3000;
+            try {
+                const response = await fetch(`http://localhost:5001/api/admission/${encodeURIComponent(sessionId ?? '')}`, { method: 'POST' });
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                const status: AdmissionStatus = await response.json();
+                if (cancelled) return;
+                if (status.admitted) {
+                    console.log('🟢 Giriş onaylandı, chatbot başlatılıyor...');
+                    onFinishRef.current();
+                    return;
+                }
+                setAdmission(status);
+                delay = (status.poll_seconds || 3) * 1000;
+            } catch (error) {
+                console.error('❌ Bekleme odası durumu alınamadı:', error);
+            }
+            if (!cancelled) timer = setTimeout(poll, delay);
+        };
+
+        poll();
+        return () => {
+            cancelled = true;
+            clearTimeout(timer);
+        };
+    }, [chatStarted, sessionId]);
+
+    // Sırada bekleniyorsa sıra ve tahmini süre gösterilir
+    if (chatStarted) {
+        if (!admission) {
+            return (
+                <div className="bg-white rounded-2xl shadow-xl p-12 max-w-lg w-full text-center flex flex-col items-center">
+                    <SpinnerIcon className="w-12 h-12 text-[#58b0b8]" />
+                    <h2 className="text-2xl font-bold text-gray-800 mt-6">Mülakat Odasına Bağlanılıyor</h2>
+                    <p className="text-gray-600 mt-2">Lütfen bekleyiniz...</p>
+                </div>
+            );
+        }
+        const etaMinutes = Math.max(1, Math.ceil(admission.eta_seconds / 60));
+        return (
+            <div className="bg-white rounded-2xl shadow-xl p-12 max-w-lg w-full text-center flex flex-col items-center">
+                <ClockIcon className="w-12 h-12 text-[#58b0b8]" />
+                <h2 className="text-2xl font-bold text-gray-800 mt-6">Sıranız Bekleniyor</h2>
+                <p className="text-gray-600 mt-4">Şu anda çok sayıda aday mülakata başlıyor. Sıranız geldiğinde mülakat otomatik olarak başlayacak.</p>
+                <p className="text-gray-500 mt-4">Sıradaki konumunuz:</p>
+                <p className="text-7xl font-bold text-[#58b0b8] my-4">{admission.position}</p>
+                <p className="text-gray-600">Tahmini bekleme: ~{etaMinutes} dakika</p>
+                <p className="text-gray-500 text-sm mt-4">Lütfen bu sayfayı kapatmayın.</p>
+            </div>
+        );
+    }
     
     // 5 dakikadan az kaldıysa geri sayımı göster, değilse bekle
     if (!scheduledDateTime) {
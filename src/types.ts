@@ -3,6 +3,7 @@ export type Page = 'scheduling' | 'chatbot' | 'interview' | 'quiz' | 'qna' | 'wa
 export interface ChatMessage {
   sender: 'user' | 'assistant';
   text: string;
+  seq?: number;
 }
 
 export interface QuizQuestion {